@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: classified bodies stored as base64 Fernet text vs binary BLOB envelopes.
+
+Both layouts hold the same encrypted bodies in an in-memory table. Reads
+select every row and decrypt it the way each layout is read: the text
+token is encoded back to bytes for Fernet, the envelope goes to
+ContentCipher.open as stored.
+
+Usage: python benchmarks/bench_ciphertext.py [--logs N] [--size BYTES]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.fernet import Fernet
+
+from core.crypto import ContentCipher
+
+
+def fill(conn, table, values):
+    conn.execute(f'CREATE TABLE {table} (id INTEGER PRIMARY KEY, content)')
+    conn.executemany(f'INSERT INTO {table} (content) VALUES (?)', ((value,) for value in values))
+
+
+def timed_read(conn, table, decrypt):
+    start = time.perf_counter()
+    for (content,) in conn.execute(f'SELECT content FROM {table}'):
+        decrypt(content)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--logs', type=int, default=50000)
+    parser.add_argument('--size', type=int, default=400, help="plaintext bytes per body")
+    args = parser.parse_args()
+
+    key = Fernet.generate_key()
+    fernet = Fernet(key)
+    cipher = ContentCipher(key)
+    bodies = [os.urandom(args.size // 2).hex().encode() for _ in range(args.logs)]
+
+    conn = sqlite3.connect(':memory:')
+    start = time.perf_counter()
+    fill(conn, 'text_tokens', [fernet.encrypt(body).decode() for body in bodies])
+    text_write = time.perf_counter() - start
+    start = time.perf_counter()
+    fill(conn, 'envelopes', [cipher.seal(body) for body in bodies])
+    blob_write = time.perf_counter() - start
+
+    text_size = conn.execute('SELECT SUM(LENGTH(CAST(content AS BLOB))) FROM text_tokens').fetchone()[0]
+    blob_size = conn.execute('SELECT SUM(LENGTH(content)) FROM envelopes').fetchone()[0]
+    text_read = timed_read(conn, 'text_tokens', lambda content: fernet.decrypt(content.encode()))
+    blob_read = timed_read(conn, 'envelopes', cipher.open)
+
+    print(f"{args.logs:,} bodies of {args.size} bytes")
+    print(f"{'layout':<16}{'stored (MB)':>13}{'write (s)':>11}{'read (s)':>10}")
+    print(f"{'base64 text':<16}{text_size / 1e6:>13.1f}{text_write:>11.2f}{text_read:>10.2f}")
+    print(f"{'BLOB envelope':<16}{blob_size / 1e6:>13.1f}{blob_write:>11.2f}{blob_read:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: database size, backup time and body reads with and without content compression.
+
+Each codec gets a fresh database filled with the same logs: bodies
+written from the log templates plus a few sentences, a quarter of them
+classified. Sizes are measured after a checkpoint and VACUUM. The
+search index keeps its own uncompressed copy of every indexed title and
+body: "index text" is that copy, "index terms" the rest of the index.
+
+Usage: python benchmarks/bench_compression.py [--logs N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.backup import backup_database
+from core.compression import available_codecs
+from core.database import LogDatabase
+from core.templates import LOG_TEMPLATES
+
+SENTENCES = [
+    "Long-range scanners picked up an ion storm near the jump point.",
+    "Quantum drive calibration completed within tolerances.",
+    "Crew morale is steady after the shore leave on ArcCorp.",
+    "Cargo manifest verified against the Port Olisar records.",
+    "Shield emitter three reports intermittent power fluctuations.",
+    "Recommend rerouting through Stanton to avoid pirate activity.",
+    "Medical bay restocked with medpens and anti-radiation doses.",
+    "Diplomatic envoy requests an escort to the Banu trade summit.",
+]
+
+
+def generate_entries(count):
+    rng = random.Random(42)
+    log_types = list(LOG_TEMPLATES)
+    for i in range(count):
+        log_type = log_types[i % len(log_types)]
+        body = LOG_TEMPLATES[log_type] + " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 8)))
+        yield {
+            'stardate': f"2955.{i % 12 + 1:02d}.{i % 28 + 1:02d}.{i % 24:02d}.{i % 60:02d}",
+            'earth_date': "2025-06-01 12:00:00",
+            'log_type': log_type,
+            'priority': i % 5 + 1,
+            'classification': 'CLASSIFIED' if i % 4 == 0 else 'UNCLASSIFIED',
+            'title': f"{log_type.replace('_', ' ').title()} {i}",
+            'content': body
+        }
+
+
+def run_codec(codec, count):
+    db = LogDatabase(f'{codec}.db')
+    db.set_content_compression(codec)
+    db.create_log_entries(generate_entries(count))
+    conn = db.pool.get_connection()
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conn.execute('VACUUM')
+    size = os.path.getsize(f'{codec}.db')
+    content_bytes = conn.execute('SELECT SUM(LENGTH(content)) FROM logs').fetchone()[0]
+    index_text, index_terms = conn.execute('''
+        SELECT TOTAL(CASE WHEN name = 'logs_fts_content' THEN pgsize END),
+               TOTAL(CASE WHEN name != 'logs_fts_content' THEN pgsize END)
+        FROM dbstat WHERE name LIKE 'logs_fts%'
+    ''').fetchone()
+
+    start = time.perf_counter()
+    backup_database(db, f'backups-{codec}')
+    backup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in db.iter_logs(chunk_size=1000):
+        pass
+    read_time = time.perf_counter() - start
+
+    db.close()
+    return size, content_bytes, index_text, index_terms, backup_time, read_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--logs', type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # encryption.key is created in the CWD
+        print(f"{args.logs:,} logs")
+        print(f"{'codec':<8}{'file (MB)':>11}{'bodies (MB)':>13}{'index text (MB)':>17}"
+              f"{'index terms (MB)':>18}{'backup (s)':>12}{'read all (s)':>14}")
+        for codec in ['none'] + available_codecs()[::-1]:
+            size, content_bytes, index_text, index_terms, backup_time, read_time = run_codec(codec, args.logs)
+            print(f"{codec:<8}{size / 1e6:>11.1f}{content_bytes / 1e6:>13.1f}{index_text / 1e6:>17.1f}"
+                  f"{index_terms / 1e6:>18.1f}{backup_time:>12.2f}{read_time:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
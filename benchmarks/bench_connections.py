@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call latency of connect-per-call vs pooled connections.
+
+Usage: python benchmarks/bench_connections.py [--rows N] [--calls N]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import LogDatabase
+
+
+def connect_per_call_log_types(db_path):
+    """The pre-pool access pattern: open, query, close"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT name, description, color FROM log_types ORDER BY name')
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def connect_per_call_latest(db_path):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, title FROM logs ORDER BY stardate DESC LIMIT 1')
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def time_calls(func, calls):
+    """Return mean per-call latency in microseconds"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # encryption.key is created in the CWD
+        db_path = os.path.join(workdir, 'bench.db')
+        db = LogDatabase(db_path)
+        for i in range(args.rows):
+            db.create_log_entry(f"2955.06.{i % 28 + 1:02d}.12.00", "2025-06-01 12:00:00",
+                                'MISSION_REPORT', f"Entry {i}", "Benchmark body " * 8)
+
+        cases = [
+            ("get_log_types", lambda: connect_per_call_log_types(db_path), db.get_log_types),
+            ("latest log", lambda: connect_per_call_latest(db_path), lambda: db.get_logs(limit=1)),
+        ]
+
+        print(f"{'query':<16}{'connect/call (us)':>20}{'pooled (us)':>14}{'speedup':>10}")
+        for name, before, after in cases:
+            before_us = time_calls(before, args.calls)
+            after_us = time_calls(after, args.calls)
+            print(f"{name:<16}{before_us:>20.1f}{after_us:>14.1f}{before_us / after_us:>9.1f}x")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: list and dashboard queries on the original schema vs the tuned one.
+
+The baseline database has the original logs table only (no secondary
+indexes, rollback journal, default pragmas). The tuned one is created by
+LogDatabase (WAL, connection pragmas, packed stardate_num column and its
+composite indexes). Both hold the same rows; list queries order by the
+text stardate on the baseline and by stardate_num on the tuned schema,
+as the application did before and does now.
+
+Usage: python benchmarks/bench_indexes.py [--sizes 10000 100000 1000000] [--repeat N]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import LogDatabase, SUMMARY_COLUMNS
+from core.stardate import StardateCalculator
+
+
+LOG_TYPES = ['MISSION_REPORT', 'PERSONAL_LOG', 'SYSTEM_STATUS', 'DIPLOMATIC_LOG',
+             'SCIENTIFIC_LOG', 'SECURITY_ALERT', 'MEDICAL_LOG']
+
+BASELINE_SCHEMA = '''
+    CREATE TABLE logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        stardate TEXT NOT NULL,
+        earth_date TEXT NOT NULL,
+        log_type TEXT NOT NULL,
+        priority INTEGER DEFAULT 1,
+        classification TEXT DEFAULT 'UNCLASSIFIED',
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        is_encrypted INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+BASELINE_COLUMNS = (SUMMARY_COLUMNS.replace(' logs.stardate_num,', '').replace(' logs.content_codec,', '')
+                    .replace(', logs.version', ''))
+
+# (name, baseline SQL, tuned SQL, parameters)
+QUERIES = [
+    ("newest page",
+     f'SELECT {BASELINE_COLUMNS} FROM logs ORDER BY stardate DESC, id DESC LIMIT 100',
+     f'SELECT {SUMMARY_COLUMNS} FROM logs ORDER BY stardate_num DESC, id DESC LIMIT 100', ()),
+    ("type page",
+     f'SELECT {BASELINE_COLUMNS} FROM logs WHERE log_type = ? ORDER BY stardate DESC, id DESC LIMIT 100',
+     f'SELECT {SUMMARY_COLUMNS} FROM logs WHERE log_type = ? ORDER BY stardate_num DESC, id DESC LIMIT 100',
+     ('SECURITY_ALERT',)),
+    ("priority page",
+     f'SELECT {BASELINE_COLUMNS} FROM logs WHERE priority = ? ORDER BY stardate DESC, id DESC LIMIT 100',
+     f'SELECT {SUMMARY_COLUMNS} FROM logs WHERE priority = ? ORDER BY stardate_num DESC, id DESC LIMIT 100',
+     (5,)),
+    ("SET month range",
+     "SELECT COUNT(*) FROM logs WHERE stardate LIKE '2952.03.%'",
+     'SELECT COUNT(*) FROM logs WHERE stardate_num BETWEEN 295203000000 AND 295203999999', ()),
+    ("counts by type",
+     'SELECT log_type, COUNT(*) FROM logs GROUP BY log_type',
+     'SELECT log_type, COUNT(*) FROM logs GROUP BY log_type', ()),
+    ("counts by priority",
+     'SELECT priority, COUNT(*) FROM logs GROUP BY priority',
+     'SELECT priority, COUNT(*) FROM logs GROUP BY priority', ()),
+]
+
+
+def generate_rows(count):
+    for i in range(count):
+        stardate = f"{2950 + i % 6}.{i % 12 + 1:02d}.{i % 28 + 1:02d}.{i % 24:02d}.{i % 60:02d}"
+        yield (stardate, StardateCalculator.stardate_to_number(stardate), "2025-06-01 12:00:00",
+               LOG_TYPES[i % len(LOG_TYPES)], i % 5 + 1, 'UNCLASSIFIED', f"Entry {i}",
+               "Benchmark body " * 8)
+
+
+def fill(conn, count, with_number):
+    rows = generate_rows(count)
+    if not with_number:
+        rows = (row[:1] + row[2:] for row in rows)
+    number_column = ' stardate_num,' if with_number else ''
+    placeholders = ', '.join('?' * (8 if with_number else 7))
+    with conn:
+        conn.executemany(f'''
+            INSERT INTO logs (stardate,{number_column} earth_date, log_type, priority,
+                              classification, title, content)
+            VALUES ({placeholders})
+        ''', rows)
+
+
+def time_query(conn, sql, params, repeat):
+    """Median latency in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_size(workdir, count, repeat):
+    baseline_path = os.path.join(workdir, f'baseline-{count}.db')
+    baseline = sqlite3.connect(baseline_path)
+    baseline.execute(BASELINE_SCHEMA)
+    fill(baseline, count, with_number=False)
+
+    db = LogDatabase(os.path.join(workdir, f'tuned-{count}.db'))
+    tuned = db.pool.get_connection()
+    fill(tuned, count, with_number=True)
+    tuned.execute('ANALYZE')
+
+    print(f"\n{count:,} rows")
+    print(f"{'query':<20}{'baseline (ms)':>15}{'tuned (ms)':>12}{'speedup':>10}")
+    for name, baseline_sql, tuned_sql, params in QUERIES:
+        before = time_query(baseline, baseline_sql, params, repeat)
+        after = time_query(tuned, tuned_sql, params, repeat)
+        print(f"{name:<20}{before:>15.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+    baseline.close()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # encryption.key is created in the CWD
+        for count in args.sizes:
+            run_size(workdir, count, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-value stardate conversion vs the batch converters.
+
+The batch converters use NumPy array arithmetic when it is installed and
+a plain loop otherwise; the output says which one ran.
+
+Usage: python benchmarks/bench_stardate.py [--values N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import stardate
+from core.stardate import StardateCalculator
+
+
+def time_call(func):
+    """Return wall time in milliseconds"""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--values', type=int, default=200000)
+    args = parser.parse_args()
+
+    start = datetime(2024, 1, 1)
+    earth_dates = [start + timedelta(minutes=37 * i) for i in range(args.values)]
+    set_times = [StardateCalculator.earth_date_to_stardate(d) for d in earth_dates]
+    np = stardate._numpy()
+    if np is not None:
+        earth_input = np.array(earth_dates, dtype='datetime64[m]')
+        print(f"NumPy {np.__version__}: batch converters are vectorized")
+    else:
+        earth_input = earth_dates
+        print("NumPy not installed: batch converters use the plain loop")
+
+    cases = [
+        ("SET -> number",
+         lambda: [StardateCalculator.stardate_to_number(s) for s in set_times],
+         lambda: StardateCalculator.stardates_to_numbers(set_times)),
+        ("SET -> earth date",
+         lambda: [StardateCalculator.parse_stardate(s) for s in set_times],
+         lambda: StardateCalculator.stardates_to_earth_dates(set_times,
+                                                             as_datetime64=np is not None)),
+        ("earth date -> SET",
+         lambda: [StardateCalculator.earth_date_to_stardate(d) for d in earth_dates],
+         lambda: StardateCalculator.earth_dates_to_stardates(earth_input)),
+    ]
+
+    print(f"\n{args.values:,} values")
+    print(f"{'conversion':<20}{'per value (ms)':>16}{'batch (ms)':>12}{'speedup':>10}")
+    for name, scalar, batch in cases:
+        before = time_call(scalar)
+        after = time_call(batch)
+        print(f"{name:<20}{before:>16.1f}{after:>12.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
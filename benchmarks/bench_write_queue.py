@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sustained log inserts, one commit per entry vs the group-commit WriteQueue.
+
+Each durability level is run on a fresh database. The direct case calls
+create_log_entry in a loop on a connection with the same PRAGMA
+synchronous; the queued case submits every entry to a WriteQueue and
+waits for all the ids. Run it on the disk the application uses, fsync
+costs differ a lot between devices.
+
+Usage: python benchmarks/bench_write_queue.py [--entries N] [--threads N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import LogDatabase
+from core.write_queue import DURABILITY_LEVELS, WriteQueue
+
+
+def entry(i):
+    return {
+        'stardate': f"2955.06.{i % 28 + 1:02d}.{i % 24:02d}.{i % 60:02d}",
+        'earth_date': "2025-06-01 12:00:00",
+        'log_type': 'SYSTEM_STATUS',
+        'title': f"Automated status report {i}",
+        'content': "All systems nominal. " * 4
+    }
+
+
+def run_direct(db, durability, count):
+    conn = db.pool.get_connection()
+    conn.execute(f'PRAGMA synchronous = {DURABILITY_LEVELS[durability]}')
+    start = time.perf_counter()
+    for i in range(count):
+        db.create_log_entry(**entry(i))
+    return time.perf_counter() - start
+
+
+def run_queued(db, durability, count, threads):
+    write_queue = WriteQueue(db, durability=durability)
+    per_thread = count // threads
+
+    def submit_all(offset):
+        futures = [write_queue.submit(**entry(offset + i)) for i in range(per_thread)]
+        for future in futures:
+            future.result()
+
+    workers = [threading.Thread(target=submit_all, args=(n * per_thread,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    write_queue.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=4, help="submitting threads for the queue")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # encryption.key is created in the CWD
+        print(f"{args.entries:,} entries, {args.threads} submitting threads")
+        print(f"{'durability':<12}{'direct (/s)':>14}{'queued (/s)':>14}{'speedup':>10}")
+        for durability in DURABILITY_LEVELS:
+            direct_db = LogDatabase(f'direct-{durability}.db')
+            direct = run_direct(direct_db, durability, args.entries)
+            direct_db.close()
+
+            queued_db = LogDatabase(f'queued-{durability}.db')
+            queued = run_queued(queued_db, durability, args.entries, args.threads)
+            queued_db.close()
+
+            print(f"{durability:<12}{args.entries / direct:>14,.0f}{args.entries / queued:>14,.0f}"
+                  f"{direct / queued:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Online backups of the log database.
+
+Backups are copied with the SQLite backup API a few pages at a time, so
+the application keeps reading and writing while a large archive is
+copied. Each backup gets a JSON manifest with its row counts and the
+fingerprint of the encryption key it needs; the key itself is never
+written next to the backup.
+"""
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from core.crypto import ContentCipher, DecryptionError
+from core.database import LogDatabase
+
+
+BACKUP_PREFIX = 'captains_log-'
+BACKUP_PAGES = 1024  # Pages copied per step, writes can commit in between
+VERIFY_DECRYPT_SAMPLES = 5
+
+# Backup options, kept in the database's app_settings table
+DEFAULT_BACKUP_SETTINGS = {
+    'backup_dir': 'backups',
+    'backup_compress': '0',
+    'backup_keep': '7',
+    'backup_interval_hours': '0',  # 0 turns scheduled backups off
+    'backup_last_at': ''
+}
+
+
+class BackupCancelled(Exception):
+    """Raised when a backup is cancelled before it finishes"""
+
+
+class BackupVerificationError(Exception):
+    """Raised when a backup fails verification"""
+
+
+def load_backup_settings(db: LogDatabase) -> Dict:
+    """Read the backup options of a database"""
+    values = {key: db.get_setting(key, default) for key, default in DEFAULT_BACKUP_SETTINGS.items()}
+    return {
+        'dir': values['backup_dir'],
+        'compress': values['backup_compress'] == '1',
+        'keep': int(values['backup_keep']),
+        'interval_hours': int(values['backup_interval_hours']),
+        'last_at': values['backup_last_at']
+    }
+
+
+def save_backup_settings(db: LogDatabase, settings: Dict):
+    """Store the backup options of a database"""
+    db.set_setting('backup_dir', settings['dir'])
+    db.set_setting('backup_compress', '1' if settings['compress'] else '0')
+    db.set_setting('backup_keep', str(settings['keep']))
+    db.set_setting('backup_interval_hours', str(settings['interval_hours']))
+
+
+def backup_due(settings: Dict, now: Optional[datetime] = None) -> bool:
+    """Whether a scheduled backup should run now"""
+    if settings['interval_hours'] <= 0:
+        return False
+    if not settings['last_at']:
+        return True
+    elapsed = (now or datetime.now()) - datetime.fromisoformat(settings['last_at'])
+    return elapsed.total_seconds() >= settings['interval_hours'] * 3600
+
+
+def key_fingerprint(key: bytes) -> str:
+    """Identify an encryption key without revealing it"""
+    return hashlib.sha256(key.strip()).hexdigest()
+
+
+def manifest_path(backup_path: str) -> str:
+    """Path of the manifest written next to a backup"""
+    return backup_path + '.json'
+
+
+def list_backups(backup_dir: str) -> List[str]:
+    """Backups in a directory, newest first"""
+    paths = glob.glob(os.path.join(backup_dir, BACKUP_PREFIX + '*.db'))
+    paths += glob.glob(os.path.join(backup_dir, BACKUP_PREFIX + '*.db.gz'))
+    return sorted(paths, reverse=True)
+
+
+def rotate_backups(backup_dir: str, keep: int) -> List[str]:
+    """Delete all but the newest keep backups; returns the deleted paths"""
+    removed = list_backups(backup_dir)[keep:]
+    for path in removed:
+        os.remove(path)
+        if os.path.exists(manifest_path(path)):
+            os.remove(manifest_path(path))
+    return removed
+
+
+def _table_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Row counts of the tables a restore must bring back"""
+    return {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('logs', 'log_types')}
+
+
+def backup_database(db: LogDatabase, backup_dir: str, compress: bool = False,
+                    keep: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None,
+                    cancelled: Optional[Callable[[], bool]] = None) -> str:
+    """
+    Back up a live database into backup_dir and verify the copy.
+    progress(done_pages, total_pages) is called after each step; when
+    cancelled() returns True the partial copy is removed and
+    BackupCancelled is raised. With keep set, older backups beyond that
+    many are deleted afterwards. Returns the backup's path.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    # Microseconds keep backups made in the same second apart (and the
+    # names still sort by age)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    path = os.path.join(backup_dir, f'{BACKUP_PREFIX}{stamp}.db')
+    partial_path = path + '.part'
+    final_path = path + '.gz' if compress else path
+    if os.path.exists(final_path) or os.path.exists(partial_path):
+        raise FileExistsError(f"Backup {final_path} already exists")
+
+    def on_step(status, remaining, total):
+        if cancelled is not None and cancelled():
+            raise BackupCancelled()
+        if progress is not None:
+            progress(total - remaining, total)
+
+    try:
+        target = sqlite3.connect(partial_path)
+        try:
+            # Counted from the source, in the snapshot being copied, so
+            # verify_backup compares the copy against the original
+            counts = db.backup_to(target, BACKUP_PAGES, on_step, snapshot=_table_counts)
+            # Keep the copy a single self-contained file, not a WAL database
+            target.execute('PRAGMA journal_mode = DELETE')
+            page_count = target.execute('PRAGMA page_count').fetchone()[0]
+        finally:
+            target.close()
+
+        if compress:
+            with open(partial_path, 'rb') as src, gzip.open(partial_path + '.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.remove(partial_path)
+            partial_path += '.gz'
+            path += '.gz'
+        if os.path.exists(path):
+            raise FileExistsError(f"Backup {path} already exists")
+        os.replace(partial_path, path)
+    except BaseException:
+        for leftover in (partial_path, partial_path + '.gz'):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+
+    manifest = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'source': os.path.abspath(db.db_path),
+        'compressed': compress,
+        'page_count': page_count,
+        'row_counts': counts,
+        'key_fingerprint': key_fingerprint(db.encryption_key)
+    }
+    with open(manifest_path(path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    verify_backup(path, db.encryption_key)
+    db.set_setting('backup_last_at', manifest['created_at'])
+
+    if keep:
+        rotate_backups(backup_dir, keep)
+    return path
+
+
+def verify_backup(path: str, key: bytes) -> Dict:
+    """
+    Check that a backup can be restored and read with an encryption key.
+    Runs integrity_check, compares row counts with the manifest, checks
+    the key fingerprint and decrypts a sample of classified logs.
+    Raises BackupVerificationError on the first problem, otherwise
+    returns the findings.
+    """
+    try:
+        with open(manifest_path(path), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BackupVerificationError(f"Backup manifest is missing or unreadable: {e}")
+
+    if manifest.get('key_fingerprint') != key_fingerprint(key):
+        raise BackupVerificationError("Backup was made with a different encryption key")
+
+    temp_path = None
+    db_path = path
+    try:
+        if path.endswith('.gz'):
+            fd, temp_path = tempfile.mkstemp(suffix='.db')
+            try:
+                with os.fdopen(fd, 'wb') as dst, gzip.open(path, 'rb') as src:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            except (OSError, EOFError, zlib.error) as e:
+                raise BackupVerificationError(f"Backup cannot be decompressed: {e}")
+            db_path = temp_path
+
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        try:
+            integrity = conn.execute('PRAGMA integrity_check').fetchone()[0]
+            if integrity != 'ok':
+                raise BackupVerificationError(f"Integrity check failed: {integrity}")
+
+            counts = _table_counts(conn)
+            if counts != manifest.get('row_counts'):
+                raise BackupVerificationError(
+                    f"Row counts {counts} do not match the manifest {manifest.get('row_counts')}"
+                )
+
+            cipher = ContentCipher.for_key(key)
+            samples = conn.execute(
+                'SELECT id, content FROM logs WHERE is_encrypted = 1 ORDER BY id DESC LIMIT ?',
+                (VERIFY_DECRYPT_SAMPLES,)
+            ).fetchall()
+            for log_id, content in samples:
+                try:
+                    cipher.open(content)
+                except DecryptionError:
+                    raise BackupVerificationError(f"Log {log_id} cannot be decrypted with this key")
+        except sqlite3.DatabaseError as e:
+            raise BackupVerificationError(f"Backup is not a readable database: {e}")
+        finally:
+            conn.close()
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+
+    return {
+        'integrity': 'ok',
+        'row_counts': counts,
+        'decrypted_samples': len(samples)
+    }
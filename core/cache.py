@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class ContentCache:
+    """
+    Size-bounded LRU cache of decrypted log bodies.
+    Entries are keyed by (log id, modified_at), so an edited log can never
+    be served from its old entry. Bodies are held in bytearrays that are
+    overwritten with zeros when evicted, and entries left unread for
+    idle_timeout seconds are dropped by expire_idle().
+    """
+
+    DEFAULT_MAX_ENTRIES = 256
+    DEFAULT_IDLE_TIMEOUT = 300  # Seconds
+
+    _caches: Dict[str, 'ContentCache'] = {}
+    _caches_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT):
+        self.max_entries = max_entries
+        self.idle_timeout = idle_timeout
+        self._entries: 'OrderedDict[Tuple[int, str], Tuple[bytearray, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def for_path(cls, db_path: str) -> 'ContentCache':
+        """Get the cache shared by every LogDatabase on a database file"""
+        key = os.path.abspath(db_path)
+        with cls._caches_lock:
+            cache = cls._caches.get(key)
+            if cache is None:
+                cache = cls()
+                cls._caches[key] = cache
+            return cache
+
+    def get(self, log_id: int, modified_at: str) -> Optional[str]:
+        """Get a cached body, or None on a miss"""
+        key = (log_id, modified_at)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries[key] = (entry[0], time.monotonic())
+            self._entries.move_to_end(key)
+            return entry[0].decode()
+
+    def put(self, log_id: int, modified_at: str, content: str):
+        """Cache a decrypted body, evicting the least recently used entries"""
+        if self.max_entries <= 0:
+            return
+
+        key = (log_id, modified_at)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._wipe(old[0])
+            self._entries[key] = (bytearray(content.encode()), time.monotonic())
+
+            while len(self._entries) > self.max_entries:
+                _, (buffer, _) = self._entries.popitem(last=False)
+                self._wipe(buffer)
+                self.evictions += 1
+
+    def invalidate(self, log_id: int):
+        """Drop every cached version of a log (after an update or delete)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == log_id]:
+                self._wipe(self._entries.pop(key)[0])
+
+    def expire_idle(self, now: Optional[float] = None) -> int:
+        """Evict entries not read within idle_timeout; returns how many"""
+        if self.idle_timeout is None:
+            return 0
+
+        cutoff = (time.monotonic() if now is None else now) - self.idle_timeout
+        expired = 0
+        with self._lock:
+            # Oldest access first, so stop at the first fresh entry
+            while self._entries:
+                key, (buffer, last_access) = next(iter(self._entries.items()))
+                if last_access > cutoff:
+                    break
+                del self._entries[key]
+                self._wipe(buffer)
+                expired += 1
+            self.evictions += expired
+        return expired
+
+    def clear(self):
+        """Evict and wipe every entry"""
+        with self._lock:
+            for buffer, _ in self._entries.values():
+                self._wipe(buffer)
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+    @staticmethod
+    def _wipe(buffer: bytearray):
+        """Overwrite a cached plaintext buffer before dropping it"""
+        buffer[:] = bytes(len(buffer))
@@ -0,0 +1,152 @@
+"""
+Compression of log bodies at rest.
+
+Bodies are compressed before they are encrypted (so classified rows
+shrink too) and stored with a codec marker in logs.content_codec:
+
+    ''          stored as written (short bodies, or compression off)
+    'zlib'      zlib stream
+    'zlib:N'    zlib stream primed with stored dictionary N
+    'zstd'      zstandard frame (requires the optional zstandard package)
+    'zstd:N'    zstandard frame using stored dictionary N
+
+Dictionaries live in the content_dictionaries table of the database, so a
+backup carries what it needs to be read. Dictionary 1 is built from the
+log templates (see core.templates), which many bodies start from. A
+stored dictionary must never be changed; add a new id instead.
+"""
+
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:  # Optional; zlib from the standard library is always there
+    zstandard = None
+
+from core.templates import EMERGENCY_TEMPLATE, LOG_TEMPLATES
+
+
+CODEC_NONE = ''
+DEFAULT_CODEC = 'zlib'
+MIN_COMPRESS_SIZE = 64  # Bytes; shorter bodies rarely shrink
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 9
+
+_DECOMPRESS_ERRORS = (zlib.error, ValueError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+class CompressionError(Exception):
+    """Raised when a stored body cannot be decompressed"""
+
+
+def available_codecs():
+    """Codecs usable for new rows, best first"""
+    return ['zstd', 'zlib'] if zstandard is not None else ['zlib']
+
+
+def template_dictionary() -> bytes:
+    """Dictionary data for the template bodies"""
+    # Least useful first: deflate reaches the end of a dictionary cheapest
+    return (EMERGENCY_TEMPLATE + ''.join(LOG_TEMPLATES.values())).encode()
+
+
+def compress_content(text: str, codec: str,
+                     dictionary: Optional[Tuple[int, bytes]] = None) -> Tuple[Union[str, bytes], str]:
+    """
+    Compress a body with codec, priming it with dictionary (id, data) if
+    given. Returns (stored value, marker); bodies that don't get smaller
+    are returned unchanged with CODEC_NONE.
+    """
+    raw = text.encode()
+    if codec == CODEC_NONE or len(raw) < MIN_COMPRESS_SIZE:
+        return text, CODEC_NONE
+
+    if codec == 'zlib':
+        if dictionary is not None:
+            compressor = zlib.compressobj(ZLIB_LEVEL, zdict=dictionary[1])
+            data = compressor.compress(raw) + compressor.flush()
+        else:
+            data = zlib.compress(raw, ZLIB_LEVEL)
+    elif codec == 'zstd':
+        if zstandard is None:
+            raise CompressionError("zstd compression requires the zstandard package")
+        dict_data = None
+        if dictionary is not None:
+            dict_data = zstandard.ZstdCompressionDict(dictionary[1],
+                                                      dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data).compress(raw)
+    else:
+        raise CompressionError(f"Unknown codec: {codec}")
+
+    if len(data) >= len(raw):
+        return text, CODEC_NONE
+    marker = codec if dictionary is None else f'{codec}:{dictionary[0]}'
+    return data, marker
+
+
+def decompress_content(data: bytes, marker: str, dictionaries: Dict[int, bytes]) -> str:
+    """Reverse compress_content for a stored value and its marker"""
+    codec, _, dict_id = marker.partition(':')
+    dictionary = None
+    if dict_id:
+        dictionary = dictionaries.get(int(dict_id))
+        if dictionary is None:
+            raise CompressionError(f"Compression dictionary {dict_id} is missing")
+
+    try:
+        if codec == 'zlib':
+            if dictionary is not None:
+                decompressor = zlib.decompressobj(zdict=dictionary)
+                raw = decompressor.decompress(data) + decompressor.flush()
+            else:
+                raw = zlib.decompress(data)
+        elif codec == 'zstd':
+            if zstandard is None:
+                raise CompressionError("Reading zstd-compressed logs requires the zstandard package")
+            dict_data = None
+            if dictionary is not None:
+                dict_data = zstandard.ZstdCompressionDict(dictionary,
+                                                          dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            raw = zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+        else:
+            raise CompressionError(f"Unknown codec: {codec}")
+    except _DECOMPRESS_ERRORS as e:
+        raise CompressionError(f"Corrupt {codec} data: {e}")
+    return raw.decode()
+
+
+def decompress_stream(chunks: Iterable[bytes], marker: str, dictionaries: Dict[int, bytes]) -> Iterator[bytes]:
+    """decompress_content for a stored value read in pieces, yielding raw bytes"""
+    codec, _, dict_id = marker.partition(':')
+    dictionary = None
+    if dict_id:
+        dictionary = dictionaries.get(int(dict_id))
+        if dictionary is None:
+            raise CompressionError(f"Compression dictionary {dict_id} is missing")
+
+    try:
+        if codec == 'zlib':
+            if dictionary is not None:
+                decompressor = zlib.decompressobj(zdict=dictionary)
+            else:
+                decompressor = zlib.decompressobj()
+            for chunk in chunks:
+                yield decompressor.decompress(chunk)
+            yield decompressor.flush()
+            if not decompressor.eof:
+                raise CompressionError("Corrupt zlib data: stream is truncated")
+        elif codec == 'zstd':
+            if zstandard is None:
+                raise CompressionError("Reading zstd-compressed logs requires the zstandard package")
+            dict_data = None
+            if dictionary is not None:
+                dict_data = zstandard.ZstdCompressionDict(dictionary,
+                                                          dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            decompressor = zstandard.ZstdDecompressor(dict_data=dict_data).decompressobj()
+            for chunk in chunks:
+                yield decompressor.decompress(chunk)
+        else:
+            raise CompressionError(f"Unknown codec: {codec}")
+    except _DECOMPRESS_ERRORS as e:
+        raise CompressionError(f"Corrupt {codec} data: {e}")
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+# Called as listener(action, log_ids) after a committed write. Actions are
+# 'insert', 'update' and 'delete' with the affected log ids, 'settings'
+# for app_settings, index maintenance and re-encryption (nothing a reader
+# sees changes), and 'external' (no ids) when another process changed
+# the file.
+ChangeListener = Callable[[str, List[int]], None]
+
+
+# Applied to every new connection. synchronous=NORMAL is durable against
+# application crashes in WAL mode and only risks the last commits on power
+# loss, in exchange for not syncing on every commit.
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -16000',  # KiB, so about 16 MB of page cache
+    'PRAGMA mmap_size = 268435456',  # Read up to 256 MB through the page map
+    'PRAGMA temp_store = MEMORY'
+)
+
+
+class ConnectionPool:
+    """
+    Shared SQLite connection manager.
+    Keeps one long-lived connection per thread for each database file, so
+    every LogDatabase pointing at the same file reuses the same connections
+    instead of paying connect/teardown on each call.
+    """
+
+    _pools: Dict[str, 'ConnectionPool'] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        # The thread each connection belongs to, so connections left behind
+        # by finished threads (e.g. executor workers) can be closed
+        self._owners: Dict[int, threading.Thread] = {}
+        self._lock = threading.Lock()
+        # Bumped after every committed write so cached reads can tell
+        # whether they are stale, whichever LogDatabase did the write
+        self.generation = 0
+        self._listeners: List[ChangeListener] = []
+        # Connection used only to read PRAGMA data_version, which changes
+        # whenever any other connection commits. Re-read after each local
+        # write, so a difference on the next check means another process.
+        self._watch_conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+
+    @classmethod
+    def for_path(cls, db_path: str) -> 'ConnectionPool':
+        """Get the shared pool for a database file, creating it on first use"""
+        key = os.path.abspath(db_path)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(db_path)
+                cls._pools[key] = pool
+            return pool
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Get the connection owned by the calling thread"""
+        thread_id = threading.get_ident()
+        conn = self._connections.get(thread_id)
+        if conn is not None and self._owners.get(thread_id) is threading.current_thread():
+            return conn
+
+        # New thread, or a finished thread's id reused: drop what is left over
+        self.close_finished_threads()
+        # check_same_thread is off only so close() can run from the
+        # shutdown thread; each connection is still used by one thread
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self._connections[thread_id] = conn
+            self._owners[thread_id] = threading.current_thread()
+        return conn
+
+    def close_finished_threads(self):
+        """Close the connections of threads that have exited"""
+        with self._lock:
+            finished = [thread_id for thread_id, thread in self._owners.items()
+                        if not thread.is_alive()]
+            connections = [self._connections.pop(thread_id) for thread_id in finished]
+            for thread_id in finished:
+                del self._owners[thread_id]
+        for conn in connections:
+            conn.close()
+
+    def add_listener(self, listener: ChangeListener):
+        """Call listener(action, log_ids) after every write to this database"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: ChangeListener):
+        """Stop calling a listener added with add_listener"""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _read_data_version(self) -> int:
+        """PRAGMA data_version on the watch connection (caller holds the lock)"""
+        if self._watch_conn is None:
+            self._watch_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._watch_conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def mark_changed(self, action: str = 'settings', log_ids: Sequence[int] = ()):
+        """
+        Record that the database contents changed and tell the listeners.
+        Listeners run on the writing thread, after the commit.
+        """
+        with self._lock:
+            self.generation += 1
+            if self._data_version is not None:
+                self._data_version = self._read_data_version()
+            listeners = list(self._listeners)
+        log_ids = list(log_ids)
+        for listener in listeners:
+            listener(action, log_ids)
+
+    def check_external_change(self) -> bool:
+        """
+        Whether another process committed since the last check; if so the
+        listeners get an 'external' event. The first call only records the
+        current state. Cheap enough to poll: no table is read.
+        """
+        with self._lock:
+            version = self._read_data_version()
+            changed = self._data_version is not None and version != self._data_version
+            self._data_version = version
+            if changed:
+                self.generation += 1
+            listeners = list(self._listeners) if changed else []
+        for listener in listeners:
+            listener('external', [])
+        return changed
+
+    def interrupt_thread(self, thread_id: int):
+        """Abort the statement running on another thread's connection"""
+        conn = self._connections.get(thread_id)
+        if conn is not None:
+            conn.interrupt()
+
+    @classmethod
+    def interrupt_thread_all(cls, thread_id: int):
+        """Abort whatever a thread is running, on any database"""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+        for pool in pools:
+            pool.interrupt_thread(thread_id)
+
+    def close_thread_connection(self):
+        """Close the calling thread's connection (e.g. when a worker exits)"""
+        with self._lock:
+            conn = self._connections.pop(threading.get_ident(), None)
+            self._owners.pop(threading.get_ident(), None)
+        if conn is not None:
+            conn.close()
+
+    @classmethod
+    def close_thread_connection_all(cls):
+        """Close the calling thread's connections on every database"""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+        for pool in pools:
+            pool.close_thread_connection()
+
+    def close(self):
+        """Close every connection in this pool"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+            self._owners.clear()
+            if self._watch_conn is not None:
+                connections.append(self._watch_conn)
+                self._watch_conn = None
+                self._data_version = None
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    @classmethod
+    def close_all(cls):
+        """Close every pooled connection (called on application shutdown)"""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+        for pool in pools:
+            pool.close()
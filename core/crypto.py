@@ -0,0 +1,260 @@
+"""
+Encryption of classified log bodies.
+
+Encrypted bodies are stored as BLOB envelopes:
+
+    byte 0      envelope version (ENVELOPE_VERSION)
+    byte 1      scheme id
+    bytes 2-    scheme payload
+
+Scheme 1 is Fernet, with the token cryptography's Fernet produces kept
+in its binary form instead of base64 text. Rows written before envelopes
+existed hold the base64 token as TEXT; they are still read, and
+migration 8 converts them without needing the key.
+
+Schemes 2 (AES-256-GCM) and 3 (ChaCha20-Poly1305) encrypt every body
+with a data key of its own. The data key is wrapped with AES-256-GCM
+under a key derived (HKDF) from the master key in encryption.key:
+
+    bytes 2-13      wrapping nonce
+    bytes 14-61     wrapped data key and its tag
+    bytes 62-68     nonce prefix
+    bytes 69-       segments
+
+The body is cut into SEGMENT_SIZE pieces, each sealed with the nonce
+prefix + segment counter + last-segment flag and carrying its own tag,
+so large bodies are encrypted and decrypted a segment at a time (see
+seal_stream and open_stream) and a truncated or reordered body fails
+to open. Reads work whichever scheme a row uses; new rows use the one
+chosen with LogDatabase.set_encryption_scheme.
+"""
+
+import base64
+import binascii
+import os
+import threading
+from typing import Callable, Dict, Iterable, Iterator, Union
+
+from cryptography.exceptions import InvalidTag, UnsupportedAlgorithm
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+
+ENVELOPE_VERSION = 1
+SCHEME_FERNET = 1
+SCHEME_AES_GCM = 2
+SCHEME_CHACHA20 = 3
+
+# Setting values for LogDatabase.set_encryption_scheme, preferred first
+SCHEMES = {
+    'aes-gcm': SCHEME_AES_GCM,
+    # Faster than AES-GCM on CPUs without AES instructions
+    'chacha20-poly1305': SCHEME_CHACHA20,
+    'fernet': SCHEME_FERNET
+}
+
+DEFAULT_SCHEME = 'aes-gcm'
+
+FERNET_VERSION = 0x80
+FERNET_HMAC_SIZE = 32
+FERNET_MIN_SIZE = 1 + 8 + 16 + 16 + FERNET_HMAC_SIZE  # version, timestamp, IV, one block, HMAC
+
+AEAD_CLASSES = {SCHEME_AES_GCM: AESGCM, SCHEME_CHACHA20: ChaCha20Poly1305}
+DATA_KEY_SIZE = 32
+WRAP_NONCE_SIZE = 12
+TAG_SIZE = 16
+WRAPPED_KEY_SIZE = WRAP_NONCE_SIZE + DATA_KEY_SIZE + TAG_SIZE
+NONCE_PREFIX_SIZE = 7
+SEGMENT_SIZE = 64 * 1024  # Plaintext bytes per segment
+
+KEY_WRAP_INFO = b"captains-log data key wrapping"
+
+
+class DecryptionError(Exception):
+    """Raised when a stored body cannot be decrypted with the key"""
+
+
+def available_schemes():
+    """Scheme names usable for new rows, preferred first"""
+    schemes = []
+    for name, scheme in SCHEMES.items():
+        aead_class = AEAD_CLASSES.get(scheme)
+        if aead_class is not None:
+            try:
+                aead_class(bytes(DATA_KEY_SIZE))
+            except UnsupportedAlgorithm:  # e.g. ChaCha20 on some OpenSSL builds
+                continue
+        schemes.append(name)
+    return schemes
+
+
+def envelope_header(scheme: str) -> bytes:
+    """The leading bytes of envelopes sealed with a scheme"""
+    return bytes((ENVELOPE_VERSION, SCHEMES[scheme]))
+
+
+def token_to_envelope(token: Union[str, bytes]) -> bytes:
+    """Wrap a base64 Fernet token (a pre-envelope row) without decrypting it"""
+    try:
+        raw = base64.urlsafe_b64decode(token)
+    except (binascii.Error, ValueError) as e:
+        raise DecryptionError(f"Not a Fernet token: {e}")
+    if len(raw) < FERNET_MIN_SIZE or raw[0] != FERNET_VERSION:
+        raise DecryptionError("Not a Fernet token")
+    return bytes((ENVELOPE_VERSION, SCHEME_FERNET)) + raw
+
+
+def _reader(source) -> Callable[[int], bytes]:
+    """read(size) for a file-like object (e.g. a sqlite3.Blob) or a bytes-like value"""
+    if hasattr(source, 'read'):
+        return source.read
+    view = memoryview(source)
+    position = 0
+
+    def read(size):
+        nonlocal position
+        chunk = view[position:] if size < 0 else view[position:position + size]
+        position += len(chunk)
+        return chunk
+
+    return read
+
+
+def _segment_nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    return prefix + counter.to_bytes(4, 'big') + (b'\x01' if last else b'\x00')
+
+
+class ContentCipher:
+    """
+    Seals and opens body envelopes with one master key. Get instances
+    with for_key(), which shares them (and their derived keys) across
+    every database using the same key.
+    """
+
+    _ciphers: Dict[bytes, 'ContentCipher'] = {}
+    _ciphers_lock = threading.Lock()
+
+    def __init__(self, key: bytes):
+        self.key = key
+        raw_key = base64.urlsafe_b64decode(key)
+        # Derived once per key: wrapping with AES-GCM costs a fraction
+        # of an RFC 3394 key wrap, which cryptography runs in Python
+        self.key_wrapper = AESGCM(HKDF(algorithm=hashes.SHA256(), length=32, salt=None,
+                                       info=KEY_WRAP_INFO).derive(raw_key))
+        self.fernet = Fernet(key)
+
+    @classmethod
+    def for_key(cls, key: bytes) -> 'ContentCipher':
+        """The shared cipher for a master key"""
+        with cls._ciphers_lock:
+            cipher = cls._ciphers.get(key)
+            if cipher is None:
+                cipher = cls._ciphers[key] = cls(key)
+            return cipher
+
+    def seal(self, data: bytes, scheme: str = DEFAULT_SCHEME) -> bytes:
+        """Encrypt data into an envelope"""
+        if SCHEMES[scheme] == SCHEME_FERNET:
+            return self._seal_fernet(data)
+        return b''.join(self.seal_stream((data,), scheme))
+
+    def seal_stream(self, chunks: Iterable[bytes], scheme: str = DEFAULT_SCHEME) -> Iterator[bytes]:
+        """
+        Encrypt data arriving in chunks, yielding the envelope in pieces
+        (the header first, then a segment at a time).
+        """
+        scheme_id = SCHEMES[scheme]
+        if scheme_id == SCHEME_FERNET:
+            yield self._seal_fernet(b''.join(chunks))
+            return
+
+        data_key = os.urandom(DATA_KEY_SIZE)
+        prefix = os.urandom(NONCE_PREFIX_SIZE)
+        header = bytes((ENVELOPE_VERSION, scheme_id))
+        wrap_nonce = os.urandom(WRAP_NONCE_SIZE)
+        key_header = header + wrap_nonce + self.key_wrapper.encrypt(wrap_nonce, data_key, header)
+        yield key_header + prefix
+
+        aead = AEAD_CLASSES[scheme_id](data_key)
+        counter = 0
+        pending = b''
+        for chunk in chunks:
+            pending = pending + chunk if pending else chunk
+            view = memoryview(pending)
+            start = 0
+            # Hold back the final piece: only the last segment is flagged
+            while len(view) - start > SEGMENT_SIZE:
+                yield aead.encrypt(_segment_nonce(prefix, counter, False),
+                                   view[start:start + SEGMENT_SIZE], key_header)
+                counter += 1
+                start += SEGMENT_SIZE
+            if start:
+                pending = bytes(view[start:])
+        yield aead.encrypt(_segment_nonce(prefix, counter, True), pending, key_header)
+
+    def open(self, stored: Union[bytes, memoryview, str]) -> bytes:
+        """Decrypt an envelope, or a pre-envelope base64 token"""
+        if isinstance(stored, str):
+            try:
+                return self.fernet.decrypt(stored.encode())
+            except InvalidToken:
+                raise DecryptionError("Log cannot be decrypted with this key")
+        return b''.join(self.open_stream(stored))
+
+    def open_stream(self, source) -> Iterator[bytes]:
+        """
+        Decrypt an envelope a segment at a time. source is the stored
+        value or a file-like object to read it from, such as a sqlite3.Blob.
+        """
+        read = _reader(source)
+        header = read(2)
+        if len(header) < 2 or header[0] != ENVELOPE_VERSION:
+            raise DecryptionError("Unknown envelope version")
+        scheme_id = header[1]
+
+        if scheme_id == SCHEME_FERNET:
+            yield self._open_fernet(memoryview(read(-1)))
+            return
+
+        aead_class = AEAD_CLASSES.get(scheme_id)
+        if aead_class is None:
+            raise DecryptionError(f"Unknown encryption scheme {scheme_id}")
+        rest = read(WRAPPED_KEY_SIZE + NONCE_PREFIX_SIZE)
+        if len(rest) < WRAPPED_KEY_SIZE + NONCE_PREFIX_SIZE:
+            raise DecryptionError("Truncated envelope")
+        header = bytes(header)
+        key_header = header + bytes(rest[:WRAPPED_KEY_SIZE])
+        prefix = bytes(rest[WRAPPED_KEY_SIZE:])
+        try:
+            aead = aead_class(self.key_wrapper.decrypt(key_header[2:2 + WRAP_NONCE_SIZE],
+                                                       key_header[2 + WRAP_NONCE_SIZE:], header))
+        except InvalidTag:
+            raise DecryptionError("Log cannot be decrypted with this key")
+
+        counter = 0
+        segment = read(SEGMENT_SIZE + TAG_SIZE)
+        while True:
+            # A short segment is the last; a full one is the last only if nothing follows
+            following = read(SEGMENT_SIZE + TAG_SIZE) if len(segment) == SEGMENT_SIZE + TAG_SIZE else b''
+            last = not following
+            try:
+                yield aead.decrypt(_segment_nonce(prefix, counter, last), segment, key_header)
+            except InvalidTag:
+                raise DecryptionError("Log cannot be decrypted with this key, or is damaged")
+            if last:
+                return
+            segment = following
+            counter += 1
+
+    def _seal_fernet(self, data: bytes) -> bytes:
+        # Fernet's own token, kept in its binary form
+        token = self.fernet.encrypt(data)
+        return bytes((ENVELOPE_VERSION, SCHEME_FERNET)) + base64.urlsafe_b64decode(token)
+
+    def _open_fernet(self, token: memoryview) -> bytes:
+        try:
+            return self.fernet.decrypt(base64.urlsafe_b64encode(token))
+        except InvalidToken:
+            raise DecryptionError("Log cannot be decrypted with this key")
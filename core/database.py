@@ -1,17 +1,72 @@
+import codecs
 import sqlite3
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
-from cryptography.fernet import Fernet
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 import json
+from core.cache import ContentCache
+from core.compression import (CODEC_NONE, DEFAULT_CODEC, CompressionError, available_codecs,
+                              compress_content, decompress_content, decompress_stream)
+from core.connection import ConnectionPool
+from core.migrations import apply_migrations, stardate_number
+from core.query import LogQuery, build_fts_query
+from core.stardate import StardateCalculator
+
+
+# Qualified so they stay unambiguous when joined with logs_fts
+LOG_COLUMNS = '''logs.id, logs.stardate, logs.stardate_num, logs.earth_date, logs.log_type, logs.priority,
+                   logs.classification, logs.title, logs.content, logs.content_codec, logs.is_encrypted,
+                   logs.created_at, logs.modified_at, logs.version'''
+
+# Everything but the body, for list views that never show it
+SUMMARY_COLUMNS = LOG_COLUMNS.replace(' logs.content,', '')
+
+# The text a row is searchable by, as held in the search index
+SEARCH_TEXT_COLUMN = "logs_fts.title || ' ' || logs_fts.content AS search_text"
+
+# Classified rows not sealed with a given envelope header (see core.crypto)
+STALE_CIPHERTEXT = "is_encrypted = 1 AND (typeof(content) = 'text' OR substr(content, 1, 2) != ?)"
+
+# Bytes read at a time by iter_log_content
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Columns update_log may change
+EDITABLE_FIELDS = ('stardate', 'earth_date', 'log_type', 'priority',
+                   'classification', 'title', 'content')
+
+
+class LogConflictError(Exception):
+    """Raised when a log changed or was deleted since the caller read it"""
+
+
+def unreadable_placeholder(error: Exception) -> str:
+    """Text shown in place of a body that failed to decode"""
+    if isinstance(error, CompressionError):
+        return f'[CONTENT UNAVAILABLE - {error}]'
+    return '[CLASSIFIED - DECRYPTION FAILED]'
 
 
 class LogDatabase:
-    def __init__(self, db_path: str = "captains_log.db"):
+    def __init__(self, db_path: str = "captains_log.db",
+                 migration_progress: Optional[Callable[[str, int, int], None]] = None):
         self.db_path = db_path
+        self.pool = ConnectionPool.for_path(db_path)
+        self.content_cache = ContentCache.for_path(db_path)
         self.encryption_key = self._get_or_create_key()
-        self.cipher = Fernet(self.encryption_key)
-        self.init_database()
+        self._cipher = None
+        self._cipher_lock = threading.Lock()
+        self.encryption_scheme = None
+        self.fts_enabled = False
+        self.index_classified = False
+        self.compression = CODEC_NONE
+        self.dictionaries = {}
+        self.vacuum_pending = False
+        self._stats_cache = None
+        self._stats_generation = -1
+        self.init_database(migration_progress)
     
     def _get_or_create_key(self) -> bytes:
         """Get or create encryption key for classified logs"""
@@ -20,97 +75,498 @@ class LogDatabase:
             with open(key_file, 'rb') as f:
                 return f.read()
         else:
+            from cryptography.fernet import Fernet
             key = Fernet.generate_key()
             with open(key_file, 'wb') as f:
                 f.write(key)
             return key
     
-    def init_database(self):
-        """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create logs table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                stardate TEXT NOT NULL,
-                earth_date TEXT NOT NULL,
-                log_type TEXT NOT NULL,
-                priority INTEGER DEFAULT 1,
-                classification TEXT DEFAULT 'UNCLASSIFIED',
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                is_encrypted INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create log types table for predefined categories
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS log_types (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                description TEXT,
-                color TEXT DEFAULT '#00FF00'
-            )
-        ''')
-        
-        # Insert default log types
-        default_types = [
-            ('MISSION_REPORT', 'Mission status and objectives', '#00FF00'),
-            ('PERSONAL_LOG', 'Personal observations and thoughts', '#0080FF'),
-            ('SYSTEM_STATUS', 'Ship systems and technical reports', '#FFD700'),
-            ('DIPLOMATIC_LOG', 'First contact and diplomatic encounters', '#FF8000'),
-            ('SCIENTIFIC_LOG', 'Research findings and discoveries', '#FF00FF'),
-            ('SECURITY_ALERT', 'Security concerns and incidents', '#FF0000'),
-            ('MEDICAL_LOG', 'Medical reports and crew health', '#00FFFF')
-        ]
-        
-        cursor.executemany('''
-            INSERT OR IGNORE INTO log_types (name, description, color) 
-            VALUES (?, ?, ?)
-        ''', default_types)
-        
-        conn.commit()
-        conn.close()
-    
-    def create_log_entry(self, stardate: str, earth_date: str, log_type: str, 
-                        title: str, content: str, priority: int = 1, 
+    @property
+    def cipher(self):
+        """Cipher for classified bodies (see core.crypto), created on first use"""
+        # Imported here because cryptography is slow to load and most
+        # sessions start without touching a classified body
+        if self._cipher is None:
+            with self._cipher_lock:
+                if self._cipher is None:
+                    from core.crypto import DEFAULT_SCHEME, ContentCipher, available_schemes
+                    if self.encryption_scheme is None:
+                        scheme = self.get_setting('encryption_scheme', DEFAULT_SCHEME)
+                        self.encryption_scheme = scheme if scheme in available_schemes() else DEFAULT_SCHEME
+                    self._cipher = ContentCipher.for_key(self.encryption_key)
+        return self._cipher
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get the pooled connection for the calling thread"""
+        return self.pool.get_connection()
+    
+    def close(self):
+        """Close the pooled connections for this database file"""
+        self.pool.close()
+    
+    def backup_to(self, target: sqlite3.Connection, pages: int = -1,
+                  progress: Optional[Callable[[int, int, int], None]] = None,
+                  snapshot: Optional[Callable[[sqlite3.Connection], object]] = None):
+        """
+        Copy the live database into another connection with the SQLite
+        backup API. The source is read in one transaction, so the copy is
+        a single snapshot however many steps it takes; snapshot(conn), if
+        given, runs first in that transaction and its result is returned.
+        """
+        conn = self._connection()
+        conn.execute('BEGIN')
+        try:
+            result = snapshot(conn) if snapshot is not None else None
+            conn.backup(target, pages=pages, progress=progress)
+        finally:
+            conn.rollback()
+        return result
+    
+    def init_database(self, progress: Optional[Callable[[str, int, int], None]] = None):
+        """Bring the database schema up to date (see core.migrations)"""
+        conn = self._connection()
+        
+        # Write-ahead logging lets readers keep going while a write commits;
+        # the mode is stored in the database file
+        conn.execute('PRAGMA journal_mode = WAL')
+        
+        apply_migrations(self, conn, progress)
+        
+        self.index_classified = self.get_setting('index_classified') == '1'
+        self.fts_enabled = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logs_fts'"
+        ).fetchone() is not None
+        self.load_compression()
+        
+        if self.vacuum_pending:
+            if progress is not None:
+                progress("Compacting database file", 0, 0)
+            conn.execute('VACUUM')
+            self.vacuum_pending = False
+    
+    def load_compression(self):
+        """Pick the codec for new bodies and load the stored dictionaries"""
+        self.dictionaries = dict(self._connection().execute('SELECT id, data FROM content_dictionaries'))
+        codec = self.get_setting('content_compression', DEFAULT_CODEC)
+        if codec not in available_codecs():
+            codec = CODEC_NONE if codec == 'none' else DEFAULT_CODEC
+        # Searches fall back to LIKE scans without FTS5, which can't see
+        # into compressed bodies
+        self.compression = codec if self.fts_enabled else CODEC_NONE
+    
+    def set_content_compression(self, codec: str):
+        """
+        Choose how new and edited bodies are compressed: 'zlib', 'zstd'
+        (with the zstandard package) or 'none'. Stored rows keep their codec.
+        """
+        if codec != 'none' and codec not in available_codecs():
+            raise ValueError(f"Unsupported compression: {codec}")
+        self.set_setting('content_compression', codec)
+        self.load_compression()
+    
+    def set_encryption_scheme(self, scheme: str):
+        """
+        Choose how new and edited classified bodies are encrypted: 'aes-gcm',
+        'chacha20-poly1305' or 'fernet'. Stored rows keep their scheme until
+        reencrypt_logs() runs.
+        """
+        from core.crypto import available_schemes
+        if scheme not in available_schemes():
+            raise ValueError(f"Unsupported encryption scheme: {scheme}")
+        self.set_setting('encryption_scheme', scheme)
+        self.encryption_scheme = scheme
+    
+    def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Read a per-database setting"""
+        row = self._connection().execute(
+            'SELECT value FROM app_settings WHERE key = ?', (key,)
+        ).fetchone()
+        return row[0] if row else default
+    
+    def set_setting(self, key: str, value: str):
+        """Store a per-database setting"""
+        conn = self._connection()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO app_settings (key, value) VALUES (?, ?)',
+                         (key, value))
+        self.pool.mark_changed('settings')
+    
+    def set_classified_search(self, enabled: bool):
+        """
+        Opt in or out of indexing decrypted CLASSIFIED/TOP_SECRET bodies.
+        When enabled the search index holds their plaintext, so it is off by
+        default and encrypted rows are then only searchable by title.
+        """
+        self.set_setting('index_classified', '1' if enabled else '0')
+        self.index_classified = enabled
+        self.rebuild_search_index()
+    
+    def encode_content(self, plaintext: str, is_encrypted: int) -> Tuple[object, str]:
+        """
+        Turn a body into its stored form and codec marker: compressed
+        first, then sealed in a BLOB envelope for classified rows.
+        """
+        dictionary = max(self.dictionaries.items()) if self.dictionaries else None
+        data, codec = compress_content(plaintext, self.compression, dictionary)
+        if is_encrypted:
+            raw = data if codec != CODEC_NONE else plaintext.encode()
+            cipher = self.cipher
+            return cipher.seal(raw, self.encryption_scheme), codec
+        return data, codec
+    
+    def decode_content(self, content, is_encrypted: int, codec: str, strict: bool = False) -> str:
+        """
+        Recover a body from its stored form. Unless strict, failures give
+        a placeholder text instead of raising.
+        """
+        try:
+            # Envelopes go to the cipher as stored; older rows hold a base64 token
+            raw = self.cipher.open(content) if is_encrypted else content
+            if codec != CODEC_NONE:
+                return decompress_content(raw, codec, self.dictionaries)
+            return raw.decode() if is_encrypted else raw
+        except Exception as e:
+            if strict:
+                raise
+            return unreadable_placeholder(e)
+    
+    def _index_log(self, conn: sqlite3.Connection, log_id: int, title: str,
+                   content: str, is_encrypted: int):
+        """Add or replace a log in the search index (content is plaintext)"""
+        if not self.fts_enabled:
+            return
+        if is_encrypted and not self.index_classified:
+            content = ''
+        conn.execute('DELETE FROM logs_fts WHERE rowid = ?', (log_id,))
+        conn.execute('INSERT INTO logs_fts (rowid, title, content) VALUES (?, ?, ?)',
+                     (log_id, title, content))
+    
+    def _unindex_log(self, conn: sqlite3.Connection, log_id: int):
+        """Remove a log from the search index"""
+        if self.fts_enabled:
+            conn.execute('DELETE FROM logs_fts WHERE rowid = ?', (log_id,))
+    
+    def rebuild_search_index(self):
+        """Rebuild the search index from the logs table"""
+        if not self.fts_enabled:
+            return
+        
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM logs_fts')
+            self.fill_search_index(conn)
+        self.pool.mark_changed('settings')
+    
+    def fill_search_index(self, conn: sqlite3.Connection, batch_size: int = 1000,
+                          progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Add every log to an empty search index in batches.
+        Runs in the caller's transaction; progress(done, total) is called
+        after each batch.
+        """
+        total = conn.execute('SELECT COUNT(*) FROM logs').fetchone()[0]
+        done = 0
+        # Also called by the migration that adds the index, before
+        # logs.content_codec exists
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(logs)')}
+        codec_column = 'content_codec' if 'content_codec' in columns else "''"
+        cursor = conn.execute(f'SELECT id, title, content, is_encrypted, {codec_column} FROM logs')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            entries = []
+            for log_id, title, content, is_encrypted, codec in rows:
+                if is_encrypted and not self.index_classified:
+                    content = ''
+                elif is_encrypted or codec != CODEC_NONE:
+                    content = self.decode_content(content, is_encrypted, codec)
+                entries.append((log_id, title, content))
+            conn.executemany('INSERT INTO logs_fts (rowid, title, content) VALUES (?, ?, ?)',
+                             entries)
+            done += len(rows)
+            if progress is not None:
+                progress(done, total)
+    
+    def create_log_entry(self, stardate: str, earth_date: str, log_type: str,
+                        title: str, content: str, priority: int = 1,
                         classification: str = 'UNCLASSIFIED') -> int:
         """Create a new log entry"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Encrypt content if classified
-        is_encrypted = 0
-        if classification in ['CLASSIFIED', 'TOP_SECRET']:
-            content = self.cipher.encrypt(content.encode()).decode()
-            is_encrypted = 1
-        
-        cursor.execute('''
-            INSERT INTO logs (stardate, earth_date, log_type, priority, 
-                            classification, title, content, is_encrypted)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (stardate, earth_date, log_type, priority, classification, 
-              title, content, is_encrypted))
-        
-        log_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return log_id or 0
-    
-    def get_logs(self, limit: int = 50, offset: int = 0, 
-                filter_type: Optional[str] = None) -> List[Dict]:
+        plaintext = content
+        
+        # Compress, and encrypt content if classified
+        is_encrypted = 1 if classification in ['CLASSIFIED', 'TOP_SECRET'] else 0
+        content, codec = self.encode_content(content, is_encrypted)
+        
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute('''
+                INSERT INTO logs (stardate, stardate_num, earth_date, log_type, priority,
+                                classification, title, content, content_codec, is_encrypted)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (stardate, stardate_number(stardate), earth_date, log_type, priority,
+                  classification, title, content, codec, is_encrypted))
+            log_id = cursor.lastrowid or 0
+            self._index_log(conn, log_id, title, plaintext, is_encrypted)
+        self.pool.mark_changed('insert', [log_id])
+        
+        return log_id
+    
+    def create_log_entries(self, entries: Iterable[Dict], batch_size: int = 5000,
+                           progress: Optional[Callable[[int], None]] = None,
+                           workers: Optional[int] = None) -> int:
+        """
+        Bulk-insert log entries, returning how many were added.
+        Each entry is a dict with the create_log_entry arguments as keys.
+        Rows go in with executemany, one transaction per batch_size rows,
+        and classified bodies of each batch are encrypted on a thread pool.
+        progress(count) is called after every committed batch.
+        """
+        entries = iter(entries)
+        total = 0
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                batch = list(islice(entries, batch_size))
+                if not batch:
+                    break
+                
+                total += len(self.insert_log_batch(batch, executor.map))
+                if progress is not None:
+                    progress(total)
+        # In case a worker did open a connection
+        self.pool.close_finished_threads()
+        
+        return total
+    
+    def insert_log_batch(self, batch: List[Dict], map_func: Callable = map) -> List[int]:
+        """
+        Insert log entries in a single transaction, returning their ids.
+        Entries are dicts as for create_log_entries; map_func runs the
+        encryption of classified bodies (pass an executor's map to spread
+        it over threads).
+        """
+        # Malformed SETs sort oldest, as in the stardate_num backfill
+        numbers = StardateCalculator.stardates_to_numbers([entry['stardate'] for entry in batch])
+        
+        rows = []
+        encrypt_rows = []
+        for entry, number in zip(batch, numbers.values):
+            classification = entry.get('classification', 'UNCLASSIFIED')
+            is_encrypted = 1 if classification in ['CLASSIFIED', 'TOP_SECRET'] else 0
+            content, codec = entry['content'], CODEC_NONE
+            if is_encrypted:
+                encrypt_rows.append(len(rows))
+            else:
+                content, codec = self.encode_content(content, 0)
+            rows.append([entry['stardate'], int(number or 0),
+                         entry['earth_date'], entry['log_type'],
+                         entry.get('priority', 1), classification, entry['title'],
+                         content, codec, is_encrypted])
+        
+        if encrypt_rows:
+            # Settled here, so map_func's workers never touch the database
+            self.cipher
+        plaintexts = [rows[i][7] for i in encrypt_rows]
+        encoded = map_func(lambda content: self.encode_content(content, 1), plaintexts)
+        for i, (content, codec) in zip(encrypt_rows, encoded):
+            rows[i][7] = content
+            rows[i][8] = codec
+        
+        conn = self._connection()
+        with conn:
+            # Claim the next ids up front so the search index rows
+            # can be written without a lookup per insert
+            conn.execute('BEGIN IMMEDIATE')
+            next_id = conn.execute('''
+                SELECT MAX(COALESCE((SELECT MAX(id) FROM logs), 0),
+                           COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'logs'), 0)) + 1
+            ''').fetchone()[0]
+            ids = list(range(next_id, next_id + len(rows)))
+            conn.executemany('''
+                INSERT INTO logs (id, stardate, stardate_num, earth_date, log_type,
+                                priority, classification, title, content, content_codec,
+                                is_encrypted)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [[log_id] + row for log_id, row in zip(ids, rows)])
+            
+            if self.fts_enabled:
+                conn.executemany(
+                    'INSERT INTO logs_fts (rowid, title, content) VALUES (?, ?, ?)',
+                    [(log_id, entry['title'],
+                      '' if row[9] and not self.index_classified else entry['content'])
+                     for log_id, entry, row in zip(ids, batch, rows)]
+                )
+        self.pool.mark_changed('insert', ids)
+        
+        return ids
+    
+    def update_log(self, log_id: int, expected_version: Optional[int] = None, **changes) -> int:
+        """
+        Edit a log in place, returning its new version.
+        changes are EDITABLE_FIELDS keyword arguments. Only the columns whose
+        value actually differs are written, together with a bumped version
+        and modified_at; when nothing differs the row is left untouched.
+        The body is re-encrypted only if it or the need for encryption
+        changed. With expected_version set, LogConflictError is raised if
+        the log was updated (or deleted) since that version was read. A
+        stored body that has to be decoded but can't be (e.g. another key,
+        or a zstd row without zstandard) raises its decoding error and
+        nothing is written.
+        """
+        unknown = set(changes) - set(EDITABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot update {', '.join(sorted(unknown))}")
+        
+        conn = self._connection()
+        with conn:
+            # Take the write lock first so the version check and the update
+            # can't interleave with another writer
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.execute(f'SELECT {LOG_COLUMNS} FROM logs WHERE id = ?', (log_id,))
+            logs = self._fetch_logs(cursor, raw=True)
+            if not logs:
+                raise LogConflictError(f"Log {log_id} no longer exists")
+            current = logs[0]
+            if expected_version is not None and current['version'] != expected_version:
+                raise LogConflictError(
+                    f"Log {log_id} was changed elsewhere (now version {current['version']}, "
+                    f"edited from version {expected_version})"
+                )
+            
+            updates = {field: value for field, value in changes.items()
+                       if field != 'content' and value != current[field]}
+            
+            was_encrypted = bool(current['is_encrypted'])
+            classification = changes.get('classification', current['classification'])
+            is_encrypted = classification in ['CLASSIFIED', 'TOP_SECRET']
+            
+            # Decode the stored body only when it has to be compared,
+            # re-encoded or re-indexed, and never into a placeholder
+            plaintext = None
+            if ('content' in changes or is_encrypted != was_encrypted
+                    or ('title' in updates and (not was_encrypted or self.index_classified))):
+                plaintext = current['content']
+                if was_encrypted or current['content_codec'] != CODEC_NONE:
+                    plaintext = self.decode_content(plaintext, int(was_encrypted), current['content_codec'],
+                                                    strict=True)
+            
+            content_changed = 'content' in changes and changes['content'] != plaintext
+            if content_changed:
+                plaintext = changes['content']
+            if content_changed or is_encrypted != was_encrypted:
+                updates['content'], updates['content_codec'] = self.encode_content(plaintext, int(is_encrypted))
+                updates['is_encrypted'] = int(is_encrypted)
+            
+            if not updates:
+                return current['version']
+            if 'stardate' in updates:
+                updates['stardate_num'] = stardate_number(updates['stardate'])
+            
+            assignments = ', '.join(f'{column} = ?' for column in updates)
+            conn.execute(f'''
+                UPDATE logs SET {assignments}, version = version + 1,
+                                modified_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', [*updates.values(), log_id])
+            
+            if 'title' in updates or 'content' in updates:
+                self._index_log(conn, log_id, updates.get('title', current['title']),
+                                plaintext or '', int(is_encrypted))
+        
+        if 'content' in updates:
+            self.content_cache.invalidate(log_id)
+        self.pool.mark_changed('update', [log_id])
+        
+        return current['version'] + 1
+    
+    def reencrypt_logs(self, batch_size: int = 500,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Re-encrypt classified bodies stored with another scheme (or as
+        older base64 tokens) with the current one, returning how many were
+        rewritten. Each batch is a short transaction of its own, so logs can
+        still be written meanwhile and a cancelled run keeps the batches it
+        finished. Bodies stay compressed, and rows keep their version and
+        modified_at since their content is unchanged. progress(done, total)
+        is called after each batch; the job stops once cancelled() is True.
+        """
+        from core.crypto import DecryptionError, envelope_header
+        cipher = self.cipher  # Also settles encryption_scheme
+        scheme = self.encryption_scheme
+        header = envelope_header(scheme)
+        
+        conn = self._connection()
+        total = conn.execute(f'SELECT COUNT(*) FROM logs WHERE {STALE_CIPHERTEXT}', (header,)).fetchone()[0]
+        done = 0
+        rewritten = 0
+        last_id = 0
+        while not (cancelled is not None and cancelled()):
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                rows = conn.execute(f'''
+                    SELECT id, content FROM logs WHERE id > ? AND {STALE_CIPHERTEXT} ORDER BY id LIMIT ?
+                ''', (last_id, header, batch_size)).fetchall()
+                updates = []
+                for log_id, content in rows:
+                    try:
+                        updates.append((cipher.seal(cipher.open(content), scheme), log_id))
+                    except DecryptionError:
+                        continue  # Unreadable with this key; left as it is
+                conn.executemany('UPDATE logs SET content = ? WHERE id = ?', updates)
+            # Keeps the change watcher from taking the batch for another
+            # process's write and reloading every view
+            self.pool.mark_changed('settings')
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            done += len(rows)
+            rewritten += len(updates)
+            if progress is not None:
+                progress(done, max(total, done))
+        
+        return rewritten
+    
+    def reencryption_pending(self) -> int:
+        """How many classified logs are not encrypted with the current scheme"""
+        from core.crypto import envelope_header
+        self.cipher  # Also settles encryption_scheme
+        return self._connection().execute(
+            f'SELECT COUNT(*) FROM logs WHERE {STALE_CIPHERTEXT}', (envelope_header(self.encryption_scheme),)
+        ).fetchone()[0]
+    
+    def _columns(self, include_content: bool) -> str:
+        """Select list for full log rows or content-free summaries"""
+        return LOG_COLUMNS if include_content else SUMMARY_COLUMNS
+    
+    def _fetch_logs(self, cursor: sqlite3.Cursor, decrypt: bool = True, raw: bool = False) -> List[Dict]:
+        """
+        Convert a cursor's rows into log dicts, decrypting content if
+        selected. With raw, content is left exactly as stored.
+        """
+        columns = [description[0] for description in cursor.description]
+        logs = []
+        for row in cursor.fetchall():
+            log = dict(zip(columns, row))
+            
+            # Decompress content, and decrypt it if encrypted and selected
+            if 'content' in log and not raw and (decrypt or not log['is_encrypted']):
+                if log['is_encrypted'] or log['content_codec'] != CODEC_NONE:
+                    log['content'] = self.decode_content(log['content'], log['is_encrypted'],
+                                                         log['content_codec'])
+            
+            logs.append(log)
+        
+        return logs
+    
+    def get_logs(self, limit: int = 50, offset: int = 0,
+                filter_type: Optional[str] = None, include_content: bool = True) -> List[Dict]:
         """Retrieve log entries with optional filtering"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._connection().cursor()
         
-        query = '''
-            SELECT id, stardate, earth_date, log_type, priority, classification,
-                   title, content, is_encrypted, created_at, modified_at
+        query = f'''
+            SELECT {self._columns(include_content)}
             FROM logs
         '''
         params = []
@@ -119,105 +575,313 @@ class LogDatabase:
             query += ' WHERE log_type = ?'
             params.append(filter_type)
         
-        query += ' ORDER BY stardate DESC LIMIT ? OFFSET ?'
+        query += ' ORDER BY stardate_num DESC, id DESC LIMIT ? OFFSET ?'
         params.extend([limit, offset])
         
         cursor.execute(query, params)
-        rows = cursor.fetchall()
+        return self._fetch_logs(cursor)
+    
+    def get_log(self, log_id: int, include_content: bool = True) -> Optional[Dict]:
+        """Retrieve a single log entry by id"""
+        cursor = self._connection().execute(
+            f'SELECT {self._columns(include_content)} FROM logs WHERE id = ?', (log_id,)
+        )
+        logs = self._fetch_logs(cursor)
+        return logs[0] if logs else None
+    
+    def get_log_content(self, log_id: int, strict: bool = False) -> Optional[str]:
+        """
+        Fetch and, for classified logs, decrypt a single log's body.
+        A body that can't be read gives a placeholder text, or raises if
+        strict (callers that would write the text back must be strict).
+        """
+        row = self._connection().execute(
+            'SELECT content, is_encrypted, content_codec, modified_at FROM logs WHERE id = ?', (log_id,)
+        ).fetchone()
+        if row is None:
+            return None
         
-        logs = []
-        for row in rows:
-            log = {
-                'id': row[0],
-                'stardate': row[1],
-                'earth_date': row[2],
-                'log_type': row[3],
-                'priority': row[4],
-                'classification': row[5],
-                'title': row[6],
-                'content': row[7],
-                'is_encrypted': row[8],
-                'created_at': row[9],
-                'modified_at': row[10]
-            }
-            
-            # Decrypt content if encrypted
-            if log['is_encrypted']:
-                try:
-                    log['content'] = self.cipher.decrypt(log['content'].encode()).decode()
-                except:
-                    log['content'] = '[CLASSIFIED - DECRYPTION FAILED]'
-            
-            logs.append(log)
+        content, is_encrypted, codec, modified_at = row
+        if not is_encrypted and codec == CODEC_NONE:
+            return content
         
-        conn.close()
-        return logs
+        cached = self.content_cache.get(log_id, modified_at)
+        if cached is not None:
+            return cached
+        
+        try:
+            content = self.decode_content(content, is_encrypted, codec, strict=True)
+        except Exception as e:
+            if strict:
+                raise
+            return unreadable_placeholder(e)  # Not cached, so a strict read still fails
+        self.content_cache.put(log_id, modified_at, content)
+        return content
     
-    def search_logs(self, search_term: str) -> List[Dict]:
-        """Search logs by title or content"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def iter_log_content(self, log_id: int) -> Iterator[str]:
+        """
+        Yield a log's body in pieces, decrypting and decompressing it as it
+        is read, for bodies too large to hold in memory twice. Yields
+        nothing for a missing log; unreadable bodies raise instead of
+        giving a placeholder, as does a row changed while it is read.
+        """
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT is_encrypted, content_codec, typeof(content) FROM logs WHERE id = ?', (log_id,)
+        ).fetchone()
+        if row is None:
+            return
         
-        cursor.execute('''
-            SELECT id, stardate, earth_date, log_type, priority, classification,
-                   title, content, is_encrypted, created_at, modified_at
-            FROM logs
-            WHERE title LIKE ? OR content LIKE ?
-            ORDER BY stardate DESC
-        ''', (f'%{search_term}%', f'%{search_term}%'))
+        is_encrypted, codec, storage = row
+        if (is_encrypted and storage == 'text') or not hasattr(conn, 'blobopen'):
+            # Base64 tokens only decrypt whole, and incremental BLOB
+            # reads need Python 3.11
+            content = conn.execute('SELECT content FROM logs WHERE id = ?', (log_id,)).fetchone()[0]
+            yield self.decode_content(content, is_encrypted, codec, strict=True)
+            return
         
-        rows = cursor.fetchall()
-        logs = []
+        with conn.blobopen('logs', 'content', log_id, readonly=True) as blob:
+            if is_encrypted:
+                chunks = self.cipher.open_stream(blob)
+            else:
+                chunks = iter(lambda: blob.read(STREAM_CHUNK_SIZE), b'')
+            if codec != CODEC_NONE:
+                chunks = decompress_stream(chunks, codec, self.dictionaries)
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for chunk in chunks:
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            text = decoder.decode(b'', final=True)
+            if text:
+                yield text
+    
+    def get_logs_page(self, limit: int = 50, cursor: Optional[Tuple[int, int]] = None,
+                      filter_type: Optional[str] = None) -> Tuple[List[Dict], Optional[Tuple[int, int]]]:
+        """
+        Retrieve one page of logs, newest first, using keyset pagination.
+        Pass the returned cursor back in to get the following page; it is
+        None once the last page has been read. Unlike OFFSET, each page is
+        a seek on idx_logs_stardate_num_id no matter how deep it is.
+        Rows are summaries without 'content'; see get_log_content.
+        """
+        return self.query_logs(LogQuery(log_type=filter_type), limit, cursor)
+    
+    def query_logs(self, query: LogQuery, limit: int = 50, cursor=None,
+                   include_content: bool = False, include_search_text: bool = False,
+                   decrypt: bool = True) -> Tuple[List[Dict], Optional[object]]:
+        """
+        Retrieve one page of logs matching a LogQuery in a single statement.
+        Newest-first queries page with a (stardate_num, id) keyset cursor;
+        relevance-ranked searches page by offset through the search index.
+        Returns (logs, next_cursor), with next_cursor None after the last page.
+        Rows leave out 'content' unless include_content is set, so listing
+        classified logs costs no decryption. include_search_text adds each
+        row's indexed text as 'search_text' (when the search index exists),
+        for refining results in memory with core.query.matches_search.
+        With decrypt off, classified content is returned as stored.
+        """
+        include_search_text = include_search_text and self.fts_enabled
+        if query.ranked and self.fts_enabled:
+            return self._query_logs_ranked(query, limit, cursor or 0,
+                                           include_content, include_search_text, decrypt)
         
-        for row in rows:
-            log = {
-                'id': row[0],
-                'stardate': row[1],
-                'earth_date': row[2],
-                'log_type': row[3],
-                'priority': row[4],
-                'classification': row[5],
-                'title': row[6],
-                'content': row[7],
-                'is_encrypted': row[8],
-                'created_at': row[9],
-                'modified_at': row[10]
-            }
-            
-            # Decrypt content if encrypted
-            if log['is_encrypted']:
-                try:
-                    log['content'] = self.cipher.decrypt(log['content'].encode()).decode()
-                except:
-                    log['content'] = '[CLASSIFIED - DECRYPTION FAILED]'
-            
-            logs.append(log)
+        where, params = query.compile(self.fts_enabled)
+        conditions = [where] if where else []
         
-        conn.close()
-        return logs
+        if cursor is not None:
+            conditions.append('(logs.stardate_num, logs.id) < (?, ?)')
+            params.extend(cursor)
+        
+        sql = f'SELECT {self._columns(include_content)}'
+        if include_search_text:
+            sql += f', {SEARCH_TEXT_COLUMN} FROM logs LEFT JOIN logs_fts ON logs_fts.rowid = logs.id'
+        else:
+            sql += ' FROM logs'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY logs.stardate_num DESC, logs.id DESC LIMIT ?'
+        params.append(limit)
+        
+        logs = self._fetch_logs(self._connection().execute(sql, params), decrypt)
+        
+        next_cursor = None
+        if len(logs) == limit:
+            next_cursor = (logs[-1]['stardate_num'], logs[-1]['id'])
+        
+        return logs, next_cursor
+    
+    def _query_logs_ranked(self, query: LogQuery, limit: int, offset: int, include_content: bool,
+                           include_search_text: bool, decrypt: bool) -> Tuple[List[Dict], Optional[int]]:
+        """Run a LogQuery with a search term, best matches first"""
+        match = build_fts_query(query.search or '')
+        if not match:
+            return [], None
+        
+        where, params = query.compile(self.fts_enabled, include_search=False)
+        columns = self._columns(include_content)
+        if include_search_text:
+            columns += ', ' + SEARCH_TEXT_COLUMN
+        sql = f'''
+            SELECT {columns}
+            FROM logs_fts
+            JOIN logs ON logs.id = logs_fts.rowid
+            WHERE logs_fts MATCH ?
+        '''
+        if where:
+            sql += ' AND ' + where
+        sql += ' ORDER BY logs_fts.rank LIMIT ? OFFSET ?'
+        
+        cursor = self._connection().execute(sql, [match] + params + [limit, offset])
+        logs = self._fetch_logs(cursor, decrypt)
+        
+        next_offset = offset + len(logs) if len(logs) == limit else None
+        return logs, next_offset
+    
+    def iter_logs(self, query: Optional[LogQuery] = None, chunk_size: int = 500,
+                  decrypt: bool = True) -> Iterator[List[Dict]]:
+        """
+        Yield every log matching a query, newest first, in chunks of full rows.
+        Each chunk is a separate keyset-paged statement, so memory stays
+        bounded by chunk_size and no read is held open between chunks.
+        """
+        query = (query or LogQuery()).filter(order=LogQuery.ORDER_NEWEST)
+        cursor = None
+        while True:
+            logs, cursor = self.query_logs(query, chunk_size, cursor,
+                                           include_content=True, decrypt=decrypt)
+            if logs:
+                yield logs
+            if cursor is None:
+                break
+    
+    def count_logs(self, query: Optional[LogQuery] = None) -> int:
+        """Count the logs matching a query"""
+        where, params = (query or LogQuery()).compile(self.fts_enabled)
+        sql = 'SELECT COUNT(*) FROM logs'
+        if where:
+            sql += ' WHERE ' + where
+        return self._connection().execute(sql, params).fetchone()[0]
+    
+    # Packed-number divisor and SET fields kept, per period
+    TIMELINE_PERIODS = {
+        'year': (10 ** 8, 1),
+        'month': (10 ** 6, 2),
+        'day': (10 ** 4, 3)
+    }
+    
+    def get_timeline(self, period: str = 'month',
+                     query: Optional[LogQuery] = None) -> List[Tuple[str, int]]:
+        """
+        Count logs per SET year, month or day, oldest first, as
+        [('2955.03', 12), ...]. Grouping walks the stardate_num index.
+        Logs with a malformed SET (stardate_num 0) belong to no period
+        and are left out.
+        """
+        divisor, fields = self.TIMELINE_PERIODS[period]
+        where, params = (query or LogQuery()).compile(self.fts_enabled)
+        sql = f'SELECT stardate_num / {divisor} AS period, COUNT(*) FROM logs WHERE stardate_num > 0'
+        if where:
+            sql += ' AND ' + where
+        sql += ' GROUP BY period ORDER BY period'
+        
+        rows = self._connection().execute(sql, params).fetchall()
+        stardates = StardateCalculator.numbers_to_stardates([number * divisor for number, _ in rows])
+        return [('.'.join(stardate.split('.')[:fields]), count)
+                for stardate, (_, count) in zip(stardates, rows)]
+    
+    def search_logs(self, search_term: str, limit: int = 50, offset: int = 0,
+                    include_content: bool = True) -> List[Dict]:
+        """Search logs by title or content, best matches first"""
+        cursor = self._connection().cursor()
+        columns = self._columns(include_content)
+        
+        if not self.fts_enabled:
+            cursor.execute(f'''
+                SELECT {columns}
+                FROM logs
+                WHERE title LIKE ? OR content LIKE ?
+                ORDER BY stardate_num DESC LIMIT ? OFFSET ?
+            ''', (f'%{search_term}%', f'%{search_term}%', limit, offset))
+            return self._fetch_logs(cursor)
+        
+        match = build_fts_query(search_term)
+        if not match:
+            return []
+        
+        # Rank and page inside the index, then join only the hits
+        cursor.execute(f'''
+            SELECT {columns}
+            FROM (
+                SELECT rowid, rank FROM logs_fts
+                WHERE logs_fts MATCH ?
+                ORDER BY rank LIMIT ? OFFSET ?
+            ) AS hits
+            JOIN logs ON logs.id = hits.rowid
+            ORDER BY hits.rank
+        ''', (match, limit, offset))
+        return self._fetch_logs(cursor)
     
     def get_log_types(self) -> List[Dict]:
         """Get all available log types"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._connection().cursor()
         
         cursor.execute('SELECT name, description, color FROM log_types ORDER BY name')
         rows = cursor.fetchall()
         
         types = [{'name': row[0], 'description': row[1], 'color': row[2]} for row in rows]
         
-        conn.close()
         return types
     
     def delete_log(self, log_id: int) -> bool:
         """Delete a log entry"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute('DELETE FROM logs WHERE id = ?', (log_id,))
+            success = cursor.rowcount > 0
+            self._unindex_log(conn, log_id)
+        self.content_cache.invalidate(log_id)
+        if success:
+            self.pool.mark_changed('delete', [log_id])
+        
+        return success
+    
+    def statistics_cached(self) -> bool:
+        """Whether get_log_statistics can answer without querying"""
+        return self._stats_cache is not None and self._stats_generation == self.pool.generation
+    
+    def get_log_statistics(self) -> Dict:
+        """
+        Get log counts by type, priority and classification.
+        Results are cached until the next write to this database file, so
+        callers can poll this cheaply.
+        """
+        generation = self.pool.generation
+        if self._stats_cache is not None and self._stats_generation == generation:
+            return self._stats_cache
         
-        cursor.execute('DELETE FROM logs WHERE id = ?', (log_id,))
-        success = cursor.rowcount > 0
+        cursor = self._connection().cursor()
         
-        conn.commit()
-        conn.close()
+        # Each GROUP BY is answered from its index without touching the table
+        cursor.execute('SELECT log_type, COUNT(*) FROM logs GROUP BY log_type')
+        by_type = dict(cursor.fetchall())
         
-        return success
+        cursor.execute('SELECT priority, COUNT(*) FROM logs GROUP BY priority')
+        by_priority = dict(cursor.fetchall())
+        
+        cursor.execute('SELECT classification, COUNT(*) FROM logs GROUP BY classification')
+        by_classification = dict(cursor.fetchall())
+        
+        cursor.execute('SELECT stardate FROM logs ORDER BY stardate_num DESC, id DESC LIMIT 1')
+        row = cursor.fetchone()
+        latest_stardate = row[0] if row else None
+        
+        self._stats_cache = {
+            'total': sum(by_type.values()),
+            'by_type': by_type,
+            'by_priority': by_priority,
+            'by_classification': by_classification,
+            'latest_stardate': latest_stardate
+        }
+        self._stats_generation = generation
+        return self._stats_cache
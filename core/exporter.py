@@ -0,0 +1,143 @@
+import csv
+import html
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, TextIO
+
+from core.database import LogDatabase
+from core.query import LogQuery
+
+
+EXPORT_FIELDS = ['id', 'stardate', 'earth_date', 'log_type', 'priority',
+                 'classification', 'title', 'content', 'created_at', 'modified_at']
+
+# Written in place of classified bodies when decryption is not requested
+REDACTED_CONTENT = '[CLASSIFIED - CONTENT NOT EXPORTED]'
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled before it finishes"""
+
+
+class ExportWriter(ABC):
+    """Writes exported logs to a text file one at a time"""
+
+    def __init__(self, f: TextIO):
+        self.f = f
+
+    def begin(self):
+        pass
+
+    @abstractmethod
+    def write(self, log: Dict):
+        """Write one log"""
+
+    def end(self):
+        pass
+
+
+class JsonLinesWriter(ExportWriter):
+    """One JSON object per line, readable by core.importer"""
+
+    def write(self, log: Dict):
+        self.f.write(json.dumps({field: log.get(field) for field in EXPORT_FIELDS},
+                                ensure_ascii=False))
+        self.f.write('\n')
+
+
+class CsvWriter(ExportWriter):
+    """CSV with a header row, readable by core.importer"""
+
+    def begin(self):
+        self.writer = csv.DictWriter(self.f, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, log: Dict):
+        self.writer.writerow(log)
+
+
+class MarkdownWriter(ExportWriter):
+    """Readable Markdown report, one section per log"""
+
+    def begin(self):
+        self.f.write("# Captain's Log Export\n\n")
+
+    def write(self, log: Dict):
+        self.f.write(f"## SET {log['stardate']} - {log['title']}\n\n")
+        self.f.write(f"- **Type:** {log['log_type']}\n")
+        self.f.write(f"- **Priority:** {log['priority']}\n")
+        self.f.write(f"- **Classification:** {log['classification']}\n")
+        self.f.write(f"- **Earth Date:** {log['earth_date']}\n\n")
+        self.f.write(f"{log['content']}\n\n---\n\n")
+
+
+class HtmlWriter(ExportWriter):
+    """Standalone HTML report, one article per log"""
+
+    def begin(self):
+        self.f.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                     "<title>Captain's Log Export</title>\n"
+                     '<style>body { font-family: sans-serif; max-width: 60em; margin: auto; } '
+                     '.meta { color: #666; } .content { white-space: pre-wrap; }</style>\n'
+                     "</head>\n<body>\n<h1>Captain's Log Export</h1>\n")
+
+    def write(self, log: Dict):
+        e = html.escape
+        self.f.write(f"<article>\n<h2>SET {e(log['stardate'])} - {e(log['title'])}</h2>\n")
+        self.f.write(f"<p class=\"meta\">{e(log['log_type'])} | Priority {log['priority']} | "
+                     f"{e(log['classification'])} | Earth Date: {e(log['earth_date'])}</p>\n")
+        self.f.write(f"<div class=\"content\">{e(log['content'])}</div>\n</article>\n<hr>\n")
+
+    def end(self):
+        self.f.write('</body>\n</html>\n')
+
+
+EXPORT_FORMATS = {
+    'jsonl': JsonLinesWriter,
+    'csv': CsvWriter,
+    'markdown': MarkdownWriter,
+    'html': HtmlWriter
+}
+
+
+def export_logs(db: LogDatabase, path: str, file_format: str, query: Optional[LogQuery] = None,
+                decrypt: bool = False, chunk_size: int = 500,
+                progress: Optional[Callable[[int, int], None]] = None,
+                cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Stream the logs matching a query to a file, returning how many were written.
+    Rows are read and written chunk_size at a time, so memory use does not
+    grow with the archive. Classified bodies are only decrypted when
+    decrypt is set, otherwise they are redacted. progress(done, total) is
+    called after each chunk; when cancelled() returns True the partial
+    file is removed and ExportCancelled is raised.
+    """
+    writer_class = EXPORT_FORMATS[file_format]
+    total = db.count_logs(query)
+    written = 0
+
+    # Write beside the target and move it into place only when complete
+    partial_path = path + '.part'
+    try:
+        with open(partial_path, 'w', encoding='utf-8', newline='') as f:
+            writer = writer_class(f)
+            writer.begin()
+            for logs in db.iter_logs(query, chunk_size, decrypt):
+                if cancelled is not None and cancelled():
+                    raise ExportCancelled()
+                for log in logs:
+                    if log['is_encrypted'] and not decrypt:
+                        log['content'] = REDACTED_CONTENT
+                    writer.write(log)
+                written += len(logs)
+                if progress is not None:
+                    progress(written, max(total, written))
+            writer.end()
+        os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    return written
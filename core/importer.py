@@ -0,0 +1,172 @@
+"""
+Bulk importer for historical log entries.
+
+Reads JSON Lines or CSV files and feeds them to
+LogDatabase.create_log_entries in large batches. Run it from the
+application directory so the database and encryption key are found:
+
+    python -m core.importer old_logs.jsonl
+    python -m core.importer old_logs.csv --db captains_log.db
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.database import LogDatabase
+from core.stardate import StardateCalculator
+
+
+REQUIRED_FIELDS = ('stardate', 'log_type', 'title', 'content')
+CLASSIFICATIONS = ('UNCLASSIFIED', 'CLASSIFIED', 'TOP_SECRET')
+PRIORITIES = range(1, 6)
+
+
+def normalize_record(record: Dict, line: int, log_types: Optional[Collection[str]] = None) -> Dict:
+    """
+    Check an imported record's fields other than its stardate (see
+    normalize_records) and fill in defaults. The classification is
+    matched case-insensitively, so 'classified' rows are still
+    encrypted. With log_types given, log_type must be one.
+    """
+    missing = [field for field in REQUIRED_FIELDS if not record.get(field)]
+    if missing:
+        raise ValueError(f"Line {line}: missing {', '.join(missing)}")
+
+    try:
+        priority = record.get('priority')
+        priority = 1 if priority in (None, '') else int(priority)
+    except (TypeError, ValueError):
+        raise ValueError(f"Line {line}: priority must be a number")
+    if priority not in PRIORITIES:
+        raise ValueError(f"Line {line}: priority must be 1 to 5, not {priority}")
+
+    classification = str(record.get('classification') or 'UNCLASSIFIED').strip().upper()
+    if classification not in CLASSIFICATIONS:
+        raise ValueError(f"Line {line}: unknown classification {record['classification']!r}")
+
+    log_type = str(record['log_type']).strip()
+    if log_types is not None and log_type not in log_types:
+        raise ValueError(f"Line {line}: unknown log type {log_type!r}")
+
+    return {
+        'log_type': log_type,
+        'priority': priority,
+        'classification': classification,
+        'title': str(record['title']),
+        'content': str(record['content'])
+    }
+
+
+def normalize_records(records: List[Tuple[int, Dict]],
+                      log_types: Optional[Collection[str]] = None) -> List[Dict]:
+    """
+    Check a batch of (line, record) pairs and fill in defaults.
+    Stardates must be valid SETs; they are converted for the whole batch
+    at once, and a missing earth_date is derived from them. The first
+    problem raises ValueError naming its line.
+    """
+    stardates = [str(record.get('stardate') or '').strip() for _, record in records]
+    earth_dates = StardateCalculator.stardates_to_earth_date_texts(stardates)
+    normalized = []
+    for i, (line, record) in enumerate(records):
+        entry = normalize_record(record, line, log_types)
+        if i in earth_dates.errors:
+            raise ValueError(f"Line {line}: {earth_dates.errors[i]}")
+        entry['stardate'] = stardates[i]
+        entry['earth_date'] = str(record.get('earth_date') or earth_dates.values[i])
+        normalized.append(entry)
+    return normalized
+
+
+def normalize_all(records: Iterable[Tuple[int, Dict]], log_types: Optional[Collection[str]] = None,
+                  batch_size: int = 5000) -> Iterator[Dict]:
+    """Yield normalized records, checking them batch_size at a time"""
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            return
+        yield from normalize_records(batch, log_types)
+
+
+def read_jsonl(path: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line, record) pairs from a JSON Lines file"""
+    with open(path, encoding='utf-8') as f:
+        for line, text in enumerate(f, 1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line}: invalid JSON ({e.msg})")
+            yield line, record
+
+
+def read_csv(path: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line, record) pairs from a CSV file with a header row"""
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            yield reader.line_num, record
+
+
+READERS = {
+    'jsonl': read_jsonl,
+    'csv': read_csv
+}
+
+
+def detect_format(path: str) -> str:
+    """Guess the input format from the file extension"""
+    if path.lower().endswith('.csv'):
+        return 'csv'
+    return 'jsonl'
+
+
+def import_logs(db: LogDatabase, path: str, file_format: Optional[str] = None,
+                batch_size: int = 5000, workers: Optional[int] = None,
+                progress=None) -> int:
+    """Import every record of a file, returning how many logs were added"""
+    reader = READERS[file_format or detect_format(path)]
+    log_types = {log_type['name'] for log_type in db.get_log_types()}
+    return db.create_log_entries(normalize_all(reader(path), log_types, batch_size),
+                                 batch_size=batch_size, progress=progress, workers=workers)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import log entries from JSON Lines or CSV")
+    parser.add_argument('path', help="file to import")
+    parser.add_argument('--db', default="captains_log.db", help="database file (default: %(default)s)")
+    parser.add_argument('--format', choices=sorted(READERS), help="input format (default: from extension)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="rows per transaction (default: %(default)s)")
+    parser.add_argument('--workers', type=int, help="encryption threads (default: CPU based)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    def report(count):
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed > 0 else 0
+        print(f"\rImported {count} logs ({rate:,.0f}/s)", end='', file=sys.stderr, flush=True)
+
+    db = LogDatabase(args.db)
+    try:
+        count = import_logs(db, args.path, args.format, args.batch_size, args.workers, report)
+    except (OSError, ValueError) as e:
+        # Batches before the failing record stay committed
+        print(f"\nImport stopped: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    print(f"\nImported {count} logs in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
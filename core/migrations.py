@@ -0,0 +1,328 @@
+"""
+Schema migrations for the logs database.
+
+The schema version is kept in PRAGMA user_version. Each migration moves
+the database up one version inside its own transaction, together with
+the version bump, so an interrupted upgrade leaves the database at the
+last fully applied version. Databases created before versioning start at
+version 0; the early migrations are written to be safe on those.
+
+To change the schema, append a Migration with the next version number.
+Never edit a migration that has been released.
+"""
+
+import sqlite3
+from typing import Callable, Optional
+
+from core.compression import CODEC_NONE, template_dictionary
+from core.stardate import StardateCalculator
+
+
+SEARCH_INDEX_BATCH = 1000
+BACKFILL_BATCH = 5000
+
+
+class MigrationError(Exception):
+    """Raised when a database cannot be migrated"""
+
+
+class Migration:
+    """
+    One schema step. apply(db, conn, progress) runs inside the migration's
+    transaction; long migrations call progress(done, total) as they go.
+    """
+
+    def __init__(self, version: int, description: str, apply):
+        self.version = version
+        self.description = description
+        self.apply = apply
+
+
+def create_tables(db, conn: sqlite3.Connection, progress):
+    """The logs, log types and settings tables, with the default log types"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            stardate TEXT NOT NULL,
+            earth_date TEXT NOT NULL,
+            log_type TEXT NOT NULL,
+            priority INTEGER DEFAULT 1,
+            classification TEXT DEFAULT 'UNCLASSIFIED',
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            is_encrypted INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Predefined log categories
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS log_types (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            description TEXT,
+            color TEXT DEFAULT '#00FF00'
+        )
+    ''')
+
+    # Per-database options
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS app_settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+    default_types = [
+        ('MISSION_REPORT', 'Mission status and objectives', '#00FF00'),
+        ('PERSONAL_LOG', 'Personal observations and thoughts', '#0080FF'),
+        ('SYSTEM_STATUS', 'Ship systems and technical reports', '#FFD700'),
+        ('DIPLOMATIC_LOG', 'First contact and diplomatic encounters', '#FF8000'),
+        ('SCIENTIFIC_LOG', 'Research findings and discoveries', '#FF00FF'),
+        ('SECURITY_ALERT', 'Security concerns and incidents', '#FF0000'),
+        ('MEDICAL_LOG', 'Medical reports and crew health', '#00FFFF')
+    ]
+    conn.executemany('''
+        INSERT OR IGNORE INTO log_types (name, description, color)
+        VALUES (?, ?, ?)
+    ''', default_types)
+
+
+def create_list_indexes(db, conn: sqlite3.Connection, progress):
+    """Indexes behind the log list and the dashboard counts"""
+    statements = [
+        # Keyset pagination in (stardate, id) order
+        'CREATE INDEX IF NOT EXISTS idx_logs_stardate_id ON logs (stardate DESC, id DESC)',
+        # Type and priority filters seek straight to their rows already in
+        # list order, and the dashboard's GROUP BY counts are answered from
+        # these indexes alone. They replace the older single-column ones.
+        'DROP INDEX IF EXISTS idx_logs_log_type',
+        'DROP INDEX IF EXISTS idx_logs_priority',
+        'CREATE INDEX IF NOT EXISTS idx_logs_type_stardate ON logs (log_type, stardate DESC, id DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_logs_priority_stardate ON logs (priority, stardate DESC, id DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_logs_classification ON logs (classification)'
+    ]
+    for done, statement in enumerate(statements):
+        progress(done, len(statements))
+        conn.execute(statement)
+    progress(len(statements), len(statements))
+
+
+def create_search_index(db, conn: sqlite3.Connection, progress):
+    """The FTS5 search index, filled from the existing logs"""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'logs_fts'").fetchone():
+        return
+
+    try:
+        # Standalone index keyed by logs.id; classified bodies can't come
+        # from logs.content because that column holds ciphertext
+        conn.execute('''
+            CREATE VIRTUAL TABLE logs_fts USING fts5(
+                title, content, tokenize = 'unicode61 remove_diacritics 2'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5 - searches fall back to LIKE scans
+        return
+
+    # Weight title matches above body matches in the rank column
+    conn.execute("INSERT INTO logs_fts(logs_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    db.index_classified = db.get_setting('index_classified') == '1'
+    db.fill_search_index(conn, SEARCH_INDEX_BATCH, progress)
+
+
+def stardate_number(stardate: str) -> int:
+    """Packed sort value for a stored SET; malformed ones sort oldest"""
+    try:
+        return StardateCalculator.stardate_to_number(stardate)
+    except ValueError:
+        return 0
+
+
+def add_stardate_number(db, conn: sqlite3.Connection, progress):
+    """Packed integer stardate column, backfilled, and the indexes re-keyed on it"""
+    conn.execute('ALTER TABLE logs ADD COLUMN stardate_num INTEGER NOT NULL DEFAULT 0')
+
+    total = conn.execute('SELECT COUNT(*) FROM logs').fetchone()[0]
+    done = 0
+    last_id = 0
+    while True:
+        rows = conn.execute('SELECT id, stardate FROM logs WHERE id > ? ORDER BY id LIMIT ?',
+                            (last_id, BACKFILL_BATCH)).fetchall()
+        if not rows:
+            break
+        conn.executemany('UPDATE logs SET stardate_num = ? WHERE id = ?',
+                         [(stardate_number(stardate), log_id) for log_id, stardate in rows])
+        last_id = rows[-1][0]
+        done += len(rows)
+        progress(done, total)
+
+    for statement in [
+        'DROP INDEX IF EXISTS idx_logs_stardate_id',
+        'DROP INDEX IF EXISTS idx_logs_type_stardate',
+        'DROP INDEX IF EXISTS idx_logs_priority_stardate',
+        'CREATE INDEX idx_logs_stardate_num_id ON logs (stardate_num DESC, id DESC)',
+        'CREATE INDEX idx_logs_type_stardate_num ON logs (log_type, stardate_num DESC, id DESC)',
+        'CREATE INDEX idx_logs_priority_stardate_num ON logs (priority, stardate_num DESC, id DESC)'
+    ]:
+        conn.execute(statement)
+
+
+def add_row_version(db, conn: sqlite3.Connection, progress):
+    """Per-row version counter, bumped by every update_log, for detecting conflicting edits"""
+    conn.execute('ALTER TABLE logs ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+
+
+def add_content_compression(db, conn: sqlite3.Connection, progress):
+    """Per-row codec marker and the stored compression dictionaries (see core.compression)"""
+    conn.execute("ALTER TABLE logs ADD COLUMN content_codec TEXT NOT NULL DEFAULT ''")
+    conn.execute('''
+        CREATE TABLE content_dictionaries (
+            id INTEGER PRIMARY KEY,
+            description TEXT,
+            data BLOB NOT NULL
+        )
+    ''')
+    conn.execute('INSERT INTO content_dictionaries (id, description, data) VALUES (1, ?, ?)',
+                 ('Log templates', template_dictionary()))
+
+
+def compact_log_content(db, conn: sqlite3.Connection, progress):
+    """Compress the bodies stored before compression existed"""
+    db.fts_enabled = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'logs_fts'").fetchone() is not None
+    db.load_compression()
+    if db.compression == CODEC_NONE:
+        return
+
+    total = conn.execute("SELECT COUNT(*) FROM logs WHERE content_codec = ''").fetchone()[0]
+    done = 0
+    last_id = 0
+    while True:
+        rows = conn.execute('''
+            SELECT id, content, is_encrypted FROM logs
+            WHERE id > ? AND content_codec = '' ORDER BY id LIMIT ?
+        ''', (last_id, BACKFILL_BATCH)).fetchall()
+        if not rows:
+            break
+        updates = []
+        for log_id, content, is_encrypted in rows:
+            try:
+                plaintext = db.decode_content(content, is_encrypted, CODEC_NONE, strict=True)
+            except Exception:
+                continue  # Unreadable bodies (e.g. another key) are left as they are
+            stored, codec = db.encode_content(plaintext, is_encrypted)
+            if codec != CODEC_NONE:
+                updates.append((stored, codec, log_id))
+        conn.executemany('UPDATE logs SET content = ?, content_codec = ? WHERE id = ?', updates)
+        last_id = rows[-1][0]
+        done += len(rows)
+        progress(done, total)
+
+    # The freed pages are only returned to the file system by a VACUUM,
+    # which can't run inside this transaction
+    db.vacuum_pending = True
+
+
+def store_ciphertext_as_blobs(db, conn: sqlite3.Connection, progress):
+    """Move classified bodies from base64 TEXT tokens to binary envelopes (see core.crypto)"""
+    total = conn.execute(
+        "SELECT COUNT(*) FROM logs WHERE is_encrypted = 1 AND typeof(content) = 'text'"
+    ).fetchone()[0]
+    if not total:
+        return
+
+    # Only the encoding changes, so this needs no key and decrypts nothing.
+    # Imported here because cryptography is slow to load.
+    from core.crypto import DecryptionError, token_to_envelope
+
+    done = 0
+    last_id = 0
+    while True:
+        rows = conn.execute('''
+            SELECT id, content FROM logs
+            WHERE id > ? AND is_encrypted = 1 AND typeof(content) = 'text' ORDER BY id LIMIT ?
+        ''', (last_id, BACKFILL_BATCH)).fetchall()
+        if not rows:
+            break
+        updates = []
+        for log_id, content in rows:
+            try:
+                updates.append((token_to_envelope(content), log_id))
+            except DecryptionError:
+                continue  # Not a token; left for decode_content to report
+        conn.executemany('UPDATE logs SET content = ? WHERE id = ?', updates)
+        last_id = rows[-1][0]
+        done += len(rows)
+        progress(done, total)
+
+    db.vacuum_pending = True
+
+
+def clear_invalid_stardate_numbers(db, conn: sqlite3.Connection, progress):
+    """Treat stored SETs with out-of-range fields as malformed, as stardate_number now does"""
+    conn.execute('''
+        UPDATE logs SET stardate_num = 0
+        WHERE stardate_num / 1000000 % 100 > 12 OR stardate_num / 10000 % 100 > 31
+           OR stardate_num / 100 % 100 > 23 OR stardate_num % 100 > 59
+    ''')
+
+
+MIGRATIONS = [
+    Migration(1, "Creating log tables", create_tables),
+    Migration(2, "Building list indexes", create_list_indexes),
+    Migration(3, "Building search index", create_search_index),
+    Migration(4, "Indexing stardates", add_stardate_number),
+    Migration(5, "Adding log versions", add_row_version),
+    Migration(6, "Adding content compression", add_content_compression),
+    Migration(7, "Compressing log content", compact_log_content),
+    Migration(8, "Storing encrypted content as binary", store_ciphertext_as_blobs),
+    Migration(9, "Checking stardates", clear_invalid_stardate_numbers),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """The schema version a database is at"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def apply_migrations(db, conn: sqlite3.Connection,
+                     progress: Optional[Callable[[str, int, int], None]] = None) -> int:
+    """
+    Bring a database up to LATEST_VERSION, returning how many migrations ran.
+    progress(description, done, total) reports on each running migration.
+    """
+    current = schema_version(conn)
+    if current > LATEST_VERSION:
+        raise MigrationError(
+            f"Database schema version {current} is newer than this version of "
+            f"Captain's Log supports ({LATEST_VERSION})"
+        )
+
+    applied = 0
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+
+        def report(done, total, description=migration.description):
+            if progress is not None:
+                progress(description, done, total)
+
+        report(0, 0)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another process may have upgraded while we waited for the lock
+            if schema_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+            migration.apply(db, conn, report)
+            conn.execute(f'PRAGMA user_version = {migration.version}')
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        applied += 1
+
+    return applied
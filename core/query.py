@@ -0,0 +1,179 @@
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from core.stardate import StardateCalculator
+
+
+def build_fts_query(search_term: str) -> str:
+    """
+    Translate a user search term into an FTS5 MATCH expression.
+    Bare words match as prefixes ("nav" finds "navigation"), "quoted
+    text" matches as an exact phrase, and all parts must match.
+    """
+    parts = []
+    for phrase, word in re.findall(r'"([^"]*)"?|(\S+)', search_term):
+        words = re.findall(r'\w+', phrase or word)
+        if not words:
+            continue
+        part = '"' + ' '.join(words) + '"'
+        parts.append(part if phrase else part + '*')
+    return ' '.join(parts)
+
+
+def _fold(text: str) -> str:
+    """Case- and accent-fold text like the index's unicode61 tokenizer"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def matches_search(search_term: str, text: str) -> bool:
+    """
+    Check text against a search term in memory, with the same prefix and
+    phrase rules as build_fts_query. Used to narrow an already loaded
+    result set without asking the search index again.
+    """
+    tokens = re.findall(r'\w+', _fold(text))
+    for phrase, word in re.findall(r'"([^"]*)"?|(\S+)', search_term):
+        words = re.findall(r'\w+', _fold(phrase or word))
+        if not words:
+            continue
+
+        last = len(words) - 1
+        found = False
+        for start in range(len(tokens) - last):
+            if all(tokens[start + i] == words[i] for i in range(last)):
+                candidate = tokens[start + last]
+                if candidate == words[last] or (not phrase and candidate.startswith(words[last])):
+                    found = True
+                    break
+        if not found:
+            return False
+    return True
+
+
+def is_search_refinement(previous_term: Optional[str], search_term: Optional[str]) -> bool:
+    """
+    Whether every match for search_term must also match previous_term,
+    so results for the new term can be filtered from the old ones.
+    Holds when the term only grew at the end and no quotes are involved.
+    """
+    if not previous_term or not search_term:
+        return False
+    if '"' in search_term:
+        return False
+    return search_term.startswith(previous_term)
+
+
+class LogQuery:
+    """
+    Composable filter for log list queries.
+    Criteria left as None are not applied. filter() returns a copy with
+    extra criteria, so a query can be narrowed step by step and then
+    compiled to a single WHERE clause by LogDatabase.query_logs.
+    """
+
+    ORDER_NEWEST = 'newest'
+    ORDER_RELEVANCE = 'relevance'
+
+    FIELDS = ('log_type', 'priority', 'min_priority', 'classification',
+              'start_stardate', 'end_stardate', 'search', 'order')
+
+    def __init__(self, log_type: Optional[str] = None, priority: Optional[int] = None,
+                 min_priority: Optional[int] = None, classification: Optional[str] = None,
+                 start_stardate: Optional[str] = None, end_stardate: Optional[str] = None,
+                 search: Optional[str] = None, order: str = ORDER_NEWEST):
+        self.log_type = log_type
+        self.priority = priority
+        self.min_priority = min_priority
+        self.classification = classification
+        self.start_stardate = start_stardate  # Inclusive, full or partial SET
+        self.end_stardate = end_stardate  # Inclusive, a partial SET covers its whole span
+        self.search = search.strip() if search and search.strip() else None
+        self.order = order
+
+    def filter(self, **criteria) -> 'LogQuery':
+        """Return a copy of this query with criteria added or replaced"""
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        for field in criteria:
+            if field not in self.FIELDS:
+                raise TypeError(f"Unknown log query field: {field}")
+        values.update(criteria)
+        return LogQuery(**values)
+
+    @property
+    def ranked(self) -> bool:
+        """Whether results come back by search relevance instead of newest first"""
+        return self.search is not None and self.order == self.ORDER_RELEVANCE
+
+    def compile(self, fts_enabled: bool = True, include_search: bool = True) -> Tuple[str, List]:
+        """
+        Compile the criteria to a WHERE clause body and its parameters.
+        Returns ('', []) when nothing is filtered.
+        """
+        conditions = []
+        params = []
+
+        if self.log_type:
+            conditions.append('log_type = ?')
+            params.append(self.log_type)
+
+        if self.priority is not None:
+            conditions.append('priority = ?')
+            params.append(self.priority)
+
+        if self.min_priority is not None:
+            conditions.append('priority >= ?')
+            params.append(self.min_priority)
+
+        if self.classification:
+            conditions.append('classification = ?')
+            params.append(self.classification)
+
+        # Ranges are index seeks on the packed stardate_num column
+        if self.start_stardate:
+            conditions.append('stardate_num >= ?')
+            params.append(StardateCalculator.stardate_bounds(self.start_stardate)[0])
+
+        if self.end_stardate:
+            conditions.append('stardate_num <= ?')
+            params.append(StardateCalculator.stardate_bounds(self.end_stardate)[1])
+
+        if self.search and include_search:
+            if fts_enabled:
+                match = build_fts_query(self.search)
+                if match:
+                    conditions.append('id IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)')
+                    params.append(match)
+                else:
+                    conditions.append('0')
+            else:
+                conditions.append('(title LIKE ? OR content LIKE ?)')
+                params.extend([f'%{self.search}%', f'%{self.search}%'])
+
+        return ' AND '.join(conditions), params
+
+    def same_filters(self, other: 'LogQuery') -> bool:
+        """Whether two queries differ in nothing but their search term"""
+        return all(getattr(self, field) == getattr(other, field)
+                   for field in self.FIELDS if field != 'search')
+
+    def matches(self, log: Dict) -> bool:
+        """
+        Check a log dict against every criterion except search.
+        Callers must re-run the query for searches, since matching those
+        needs the search index.
+        """
+        if self.log_type and log['log_type'] != self.log_type:
+            return False
+        if self.priority is not None and log['priority'] != self.priority:
+            return False
+        if self.min_priority is not None and log['priority'] < self.min_priority:
+            return False
+        if self.classification and log['classification'] != self.classification:
+            return False
+        if self.start_stardate and log['stardate_num'] < StardateCalculator.stardate_bounds(self.start_stardate)[0]:
+            return False
+        if self.end_stardate and log['stardate_num'] > StardateCalculator.stardate_bounds(self.end_stardate)[1]:
+            return False
+        return True
@@ -1,7 +1,48 @@
 from datetime import datetime, timedelta
 from dateutil import tz
 import math
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple
+
+np = None  # Set by _numpy() on the first batch conversion
+_numpy_checked = False
+
+
+def _numpy():
+    """
+    NumPy if it is installed, else None. Imported on first use rather than
+    with this module, which the application loads during startup.
+    """
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy as np
+        except ImportError:  # Optional; batch conversions fall back to plain Python
+            np = None
+        _numpy_checked = True
+    return np
+
+
+class ConversionResult:
+    """
+    Output of a batch stardate conversion.
+    values has one entry per input; entries that failed are None (NaT or
+    0 in NumPy output) and errors maps their index to the reason.
+    """
+    
+    def __init__(self, values, errors: Dict[int, str]):
+        self.values = values
+        self.errors = errors
+    
+    @property
+    def ok(self) -> bool:
+        """Whether every element converted"""
+        return not self.errors
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def __iter__(self):
+        return iter(self.values)
 
 
 class StardateCalculator:
@@ -14,6 +55,9 @@ class StardateCalculator:
     # Current game year is around 2954, but we'll use current real date + 930 years
     SC_YEAR_OFFSET = 930
     
+    # Allowed month, day, hour and minute values of a SET
+    FIELD_RANGES = [(1, 12), (1, 31), (0, 23), (0, 59)]
+    
     @classmethod
     def earth_date_to_stardate(cls, earth_date: Optional[datetime] = None) -> str:
         """
@@ -31,10 +75,28 @@ class StardateCalculator:
         
         return set_time
     
+    @classmethod
+    def parse_stardate(cls, set_time: str) -> datetime:
+        """
+        Convert a SET (YYYY.MM.DD with optional .HH.MM) to its Earth date.
+        Raises ValueError for malformed or impossible dates.
+        """
+        parts = set_time.strip().split('.') if isinstance(set_time, str) else []
+        if not 3 <= len(parts) <= 5 or not all(part.isdigit() for part in parts):
+            raise ValueError(f"Invalid SET: {set_time!r}")
+        
+        year, month, day, hour, minute = [int(part) for part in parts] + [0] * (5 - len(parts))
+        try:
+            return datetime(year - cls.SC_YEAR_OFFSET, month, day, hour, minute)
+        except ValueError as e:
+            raise ValueError(f"Invalid SET {set_time!r}: {e}") from None
+    
     @classmethod
     def stardate_to_earth_date(cls, set_time: str) -> datetime:
         """
         Convert Star Citizen SET back to Earth date.
+        Falls back to the current time for malformed input; use
+        parse_stardate or the batch converters to see errors instead.
         """
         try:
             parts = set_time.split('.')
@@ -51,6 +113,263 @@ class StardateCalculator:
         except:
             return datetime.now()
     
+    @classmethod
+    def stardate_to_number(cls, set_time: str) -> int:
+        """
+        Pack a SET into a sortable integer, YYYYMMDDHHMM.
+        Missing trailing parts count as zero, so '2955.03' packs to the
+        start of March 2955. Raises ValueError for malformed input or a
+        field out of range (the same ranges as the batch converters).
+        """
+        parts = set_time.strip().split('.') if isinstance(set_time, str) else []
+        if not 1 <= len(parts) <= 5 or not all(part.isdigit() for part in parts):
+            raise ValueError(f"Invalid SET: {set_time!r}")
+        
+        values = [int(part) for part in parts]
+        for value, (low, high) in zip(values[1:], cls.FIELD_RANGES):
+            if not low <= value <= high:
+                raise ValueError(f"Invalid SET: {set_time!r}")
+        
+        year, month, day, hour, minute = values + [0] * (5 - len(parts))
+        return (((year * 100 + month) * 100 + day) * 100 + hour) * 100 + minute
+    
+    @classmethod
+    def number_to_stardate(cls, number: int) -> str:
+        """Unpack a value from stardate_to_number back into YYYY.MM.DD.HH.MM"""
+        number, minute = divmod(number, 100)
+        number, hour = divmod(number, 100)
+        year, month, day = number // 10000, number // 100 % 100, number % 100
+        return f"{year}.{month:02d}.{day:02d}.{hour:02d}.{minute:02d}"
+    
+    @classmethod
+    def stardate_bounds(cls, set_time: str) -> Tuple[int, int]:
+        """
+        First and last packed values covered by a full or partial SET.
+        '2955.03' covers every minute of March 2955.
+        """
+        low = cls.stardate_to_number(set_time)
+        missing = 5 - len(set_time.strip().split('.'))
+        # Each missing two-digit field can run up to 99
+        return low, low + 10 ** (2 * missing) - 1
+    
+    # Batch conversions. These take whole sequences so import, export and
+    # timeline code don't convert row by row, and report failures per
+    # element instead of raising or substituting a value. With NumPy
+    # installed, datetime64 arrays and full-length SET strings are
+    # converted with array arithmetic.
+    
+    @classmethod
+    def earth_dates_to_stardates(cls, earth_dates) -> ConversionResult:
+        """Convert datetimes (or a datetime64 array) to SET strings"""
+        numbers = cls.earth_dates_to_numbers(earth_dates)
+        if _numpy() is not None and isinstance(numbers.values, np.ndarray):
+            values = cls._np_format_numbers(numbers.values)
+        else:
+            values = [cls._format_number(number) for number in numbers.values]
+        for i in numbers.errors:
+            values[i] = None
+        return ConversionResult(values, numbers.errors)
+    
+    @classmethod
+    def earth_dates_to_numbers(cls, earth_dates) -> ConversionResult:
+        """Convert datetimes (or a datetime64 array) to packed SET numbers"""
+        if _numpy() is not None and isinstance(earth_dates, np.ndarray):
+            return cls._np_earth_dates_to_numbers(earth_dates)
+        
+        values = []
+        errors = {}
+        for i, earth_date in enumerate(earth_dates):
+            if not isinstance(earth_date, datetime):
+                values.append(None)
+                errors[i] = f"Not a datetime: {earth_date!r}"
+                continue
+            values.append(((((earth_date.year + cls.SC_YEAR_OFFSET) * 100 + earth_date.month) * 100
+                            + earth_date.day) * 100 + earth_date.hour) * 100 + earth_date.minute)
+        return ConversionResult(values, errors)
+    
+    @classmethod
+    def stardates_to_numbers(cls, set_times: Sequence[str]) -> ConversionResult:
+        """
+        Pack SET strings into sortable numbers (see stardate_to_number).
+        Returns an int64 array when NumPy is available, a list otherwise.
+        """
+        if _numpy() is not None:
+            numbers, valid = cls._np_parse_full(set_times)
+            errors = {}
+            for i in np.flatnonzero(~valid):
+                # Partial or malformed SETs take the slow path
+                try:
+                    numbers[i] = cls.stardate_to_number(set_times[i])
+                except ValueError:
+                    numbers[i] = 0
+                    errors[int(i)] = f"Invalid SET: {set_times[i]!r}"
+            return ConversionResult(numbers, errors)
+        
+        values = []
+        errors = {}
+        for i, set_time in enumerate(set_times):
+            try:
+                values.append(cls.stardate_to_number(set_time))
+            except ValueError:
+                values.append(None)
+                errors[i] = f"Invalid SET: {set_time!r}"
+        return ConversionResult(values, errors)
+    
+    @classmethod
+    def numbers_to_stardates(cls, numbers) -> ConversionResult:
+        """Unpack packed SET numbers (a sequence or int64 array) into SET strings"""
+        if _numpy() is not None:
+            return ConversionResult(cls._np_format_numbers(np.asarray(numbers, dtype=np.int64)), {})
+        return ConversionResult([cls._format_number(number) for number in numbers], {})
+    
+    @classmethod
+    def stardates_to_earth_dates(cls, set_times: Sequence[str],
+                                 as_datetime64: bool = False) -> ConversionResult:
+        """
+        Convert SET strings to Earth datetimes.
+        With as_datetime64 (requires NumPy) the values are a
+        datetime64[m] array with NaT for failures.
+        """
+        if as_datetime64:
+            if _numpy() is None:
+                raise RuntimeError("as_datetime64 requires NumPy")
+            return cls._np_stardates_to_datetime64(set_times)
+        
+        values = []
+        errors = {}
+        for i, set_time in enumerate(set_times):
+            try:
+                values.append(cls.parse_stardate(set_time))
+            except ValueError as e:
+                values.append(None)
+                errors[i] = str(e)
+        return ConversionResult(values, errors)
+    
+    @classmethod
+    def stardates_to_earth_date_texts(cls, set_times: Sequence[str]) -> ConversionResult:
+        """
+        Convert SET strings to Earth dates as the earth_date column holds
+        them, 'YYYY-MM-DD HH:MM:SS'. Failed entries are None.
+        """
+        if _numpy() is None:
+            dates = cls.stardates_to_earth_dates(set_times)
+            values = [None if value is None else value.strftime("%Y-%m-%d %H:%M:%S")
+                      for value in dates.values]
+            return ConversionResult(values, dates.errors)
+        
+        dates = cls._np_stardates_to_datetime64(set_times)
+        text = np.datetime_as_string(dates.values, unit='s')
+        values = np.char.replace(text, 'T', ' ').tolist()
+        for i in dates.errors:
+            values[i] = None
+        return ConversionResult(values, dates.errors)
+    
+    @classmethod
+    def _format_number(cls, number: Optional[int]) -> Optional[str]:
+        """Format a packed SET number as number_to_stardate does"""
+        if number is None:
+            return None
+        return cls.number_to_stardate(int(number))
+    
+    @classmethod
+    def _np_format_numbers(cls, numbers) -> list:
+        """Format packed SET numbers as strings, building the characters as an array"""
+        in_range = (numbers >= 10 ** 11) & (numbers < 10 ** 12)
+        chars = np.full((len(numbers), 16), ord('.'), dtype=np.uint8)
+        # Digit positions, most significant first, skipping the dots
+        columns = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15]
+        remaining = np.where(in_range, numbers, 0)
+        for column in reversed(columns):
+            remaining, digit = np.divmod(remaining, 10)
+            chars[:, column] = digit + ord('0')
+        values = chars.view('S16').ravel().astype(str).tolist()
+        
+        # Years beyond four digits are rare enough to format one by one
+        for i in np.flatnonzero(~in_range):
+            values[i] = cls._format_number(int(numbers[i]))
+        return values
+    
+    @classmethod
+    def _np_earth_dates_to_numbers(cls, earth_dates) -> ConversionResult:
+        minutes = earth_dates.astype('datetime64[m]')
+        valid = ~np.isnat(minutes)
+        months = minutes.astype('datetime64[M]')
+        days = minutes.astype('datetime64[D]')
+        
+        year = months.astype('int64') // 12 + 1970 + cls.SC_YEAR_OFFSET
+        month = months.astype('int64') % 12 + 1
+        day = (days - months.astype('datetime64[D]')).astype('int64') + 1
+        minute_of_day = (minutes - days.astype('datetime64[m]')).astype('int64')
+        
+        numbers = ((year * 100 + month) * 100 + day) * 10000 + minute_of_day // 60 * 100 + minute_of_day % 60
+        numbers[~valid] = 0
+        errors = {int(i): "Not a time (NaT)" for i in np.flatnonzero(~valid)}
+        return ConversionResult(numbers, errors)
+    
+    @classmethod
+    def _np_parse_full(cls, set_times):
+        """
+        Parse full 'YYYY.MM.DD.HH.MM' strings with array arithmetic.
+        Returns (int64 packed numbers, valid mask); anything that isn't a
+        full-length SET with in-range fields is left for the caller.
+        """
+        try:
+            raw = np.array(set_times, dtype='S')
+        except UnicodeEncodeError:
+            # Non-ASCII text can't be a valid SET; '?' keeps it failing
+            raw = np.char.encode(np.asarray(set_times, dtype=str), 'ascii', 'replace')
+        lengths_ok = np.char.str_len(raw) == 16
+        raw = raw.astype('S16')
+        chars = np.frombuffer(raw.tobytes(), dtype=np.uint8).reshape(len(raw), 16)
+        digits = chars.astype(np.int64) - ord('0')
+        
+        digit_columns = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15]
+        dots_ok = (chars[:, [4, 7, 10, 13]] == ord('.')).all(axis=1)
+        digits_ok = ((digits[:, digit_columns] >= 0) & (digits[:, digit_columns] <= 9)).all(axis=1)
+        
+        def field(start, width):
+            value = np.zeros(len(raw), dtype=np.int64)
+            for column in range(start, start + width):
+                value = value * 10 + digits[:, column]
+            return value
+        
+        month, day, hour, minute = field(5, 2), field(8, 2), field(11, 2), field(14, 2)
+        ranges_ok = ((month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+                     & (hour <= 23) & (minute <= 59))
+        valid = dots_ok & digits_ok & lengths_ok & ranges_ok
+        
+        numbers = np.where(valid, ((((field(0, 4) * 100 + month) * 100 + day) * 100 + hour) * 100 + minute), 0)
+        return numbers, valid
+    
+    @classmethod
+    def _np_stardates_to_datetime64(cls, set_times) -> ConversionResult:
+        numbers = cls.stardates_to_numbers(set_times)
+        packed = np.asarray(numbers.values, dtype=np.int64)
+        
+        minute = packed % 100
+        hour = packed // 100 % 100
+        day = packed // 10000 % 100
+        month = packed // 1000000 % 100
+        year = packed // 100000000 - cls.SC_YEAR_OFFSET
+        
+        month_start = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+        dates = month_start.astype('datetime64[D]') + (day - 1)
+        values = dates.astype('datetime64[m]') + hour * 60 + minute
+        
+        errors = dict(numbers.errors)
+        # Same rules as parse_stardate: a full date with in-range fields.
+        # Out-of-range days would otherwise roll over into the next month.
+        invalid = ((day < 1) | (month < 1) | (month > 12) | (hour > 23) | (minute > 59)
+                   | (year < 1) | (year > 9999)
+                   | (dates.astype('datetime64[M]') != month_start))
+        for i in np.flatnonzero(invalid):
+            errors.setdefault(int(i), f"Invalid SET: {set_times[i]!r}")
+        
+        failed = np.zeros(len(packed), dtype=bool)
+        failed[list(errors)] = True
+        values[failed] = np.datetime64('NaT')
+        return ConversionResult(values, errors)
+    
     @classmethod
     def get_current_stardate(cls) -> str:
         """Get current Star Citizen SET"""
@@ -65,22 +384,63 @@ class StardateCalculator:
     def get_stardate_info(cls) -> dict:
         """Get comprehensive Star Citizen SET information"""
         now = datetime.now()
-        set_time = cls.earth_date_to_stardate(now)
+        info = StardateClock().tick(now)
+        info['utc_time'] = now.utctimetuple()
+        return info
+
+
+class StardateClock:
+    """
+    Incremental source of the get_stardate_info fields for a running
+    clock, except utc_time, which nothing on the status bar shows.
+    Each field is only rebuilt when its granularity (second, minute or
+    day) rolls over, and tick() returns just the fields whose values
+    changed since the previous tick - all of them on the first.
+    """
+    
+    def __init__(self):
+        self.info = {}
+        self._second = None
+        self._minute = None
+        self._day = None
+        self._date_text = ''
+        self._time_text = ''
+    
+    def tick(self, now: Optional[datetime] = None) -> dict:
+        """Advance to now and return the changed fields"""
+        if now is None:
+            now = datetime.now()
         
-        # Calculate Star Citizen year
-        sc_year = now.year + cls.SC_YEAR_OFFSET
+        second = now.replace(microsecond=0)
+        if second == self._second:
+            return {}
+        self._second = second
         
-        return {
-            'stardate': set_time,
-            'formatted_stardate': cls.format_stardate(set_time),
-            'earth_date': now.strftime("%Y-%m-%d %H:%M:%S"),
-            'earth_date_long': now.strftime("%A, %B %d, %Y at %I:%M %p"),
-            'sc_year': sc_year,
-            'utc_time': now.utctimetuple(),
-            'year': now.year,
-            'day_of_year': now.timetuple().tm_yday,
-            'set_display': f"Standard Earth Time {set_time}"
-        }
+        changed = {}
+        day = now.date()
+        if day != self._day:
+            self._day = day
+            self._date_text = f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
+            changed['sc_year'] = now.year + StardateCalculator.SC_YEAR_OFFSET
+            changed['year'] = now.year
+            changed['day_of_year'] = now.timetuple().tm_yday
+        
+        minute = second.replace(second=0)
+        if minute != self._minute:
+            self._minute = minute
+            self._time_text = f"{now.hour:02d}:{now.minute:02d}"
+            set_time = StardateCalculator.earth_date_to_stardate(now)
+            changed['stardate'] = set_time
+            changed['formatted_stardate'] = StardateCalculator.format_stardate(set_time)
+            changed['set_display'] = f"Standard Earth Time {set_time}"
+            changed['earth_date_long'] = now.strftime("%A, %B %d, %Y at %I:%M %p")
+        
+        changed['earth_date'] = f"{self._date_text} {self._time_text}:{now.second:02d}"
+        
+        # Fields recomputed at a rollover may still come out the same
+        changed = {key: value for key, value in changed.items() if self.info.get(key) != value}
+        self.info.update(changed)
+        return changed
 
 
 # Utility functions for time zones and special dates
@@ -0,0 +1,19 @@
+"""
+Starting bodies for new logs, by log type.
+
+Shared by the quick-action buttons and the compression dictionary (see
+core.compression): bodies written from a template compress against it.
+"""
+
+LOG_TEMPLATES = {
+    'MISSION_REPORT': "Mission Status Report:\n\nObjective: \nProgress: \nChallenges: \nNext Steps: \n\nRecommendations: ",
+    'PERSONAL_LOG': "Personal Log Entry:\n\nReflections on recent events...\n\n",
+    'SYSTEM_STATUS': "System Status Report:\n\nPrimary Systems: \nSecondary Systems: \nMaintenance Required: \n\nTechnical Notes: ",
+    'DIPLOMATIC_LOG': "Diplomatic Contact Report:\n\nSpecies/Entity: \nFirst Contact Protocol: \nCommunication Method: \nOutcome: \n\nCultural Notes: ",
+    'SCIENTIFIC_LOG': "Scientific Discovery Log:\n\nPhenomenon Observed: \nHypothesis: \nTesting Results: \nConclusions: \n\nFurther Research: ",
+    'SECURITY_ALERT': "Security Alert Report:\n\nThreat Level: \nNature of Threat: \nResponse Actions: \nResolution: \n\nRecommendations: ",
+    'MEDICAL_LOG': "Medical Log Entry:\n\nPatient/Crew Status: \nSymptoms/Condition: \nTreatment: \nPrognosis: \n\nMedical Notes: "
+}
+
+EMERGENCY_TEMPLATE = ("EMERGENCY SITUATION:\n\nNature of Emergency: \nImmediate Actions Taken: \n"
+                      "Current Status: \nAssistance Required: \n\nCommand Decision: ")
@@ -0,0 +1,157 @@
+"""
+Group-commit writer for new log entries.
+
+Every create_log_entry is a transaction of its own, so bursts of entries
+pay a commit (and with durable settings an fsync) each. WriteQueue hands
+entries to a background thread that collects whatever arrives within a
+short window and inserts it in one transaction. Callers get a Future
+that resolves to the new log's id once that transaction has committed:
+
+    queue = WriteQueue(db)
+    future = queue.submit(stardate=..., earth_date=..., log_type='SYSTEM_STATUS',
+                          title='Reactor nominal', content='...')
+    log_id = future.result()
+    queue.close()  # Commits anything still queued
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from core.database import LogDatabase
+
+
+# PRAGMA synchronous for the writer's connection, by durability level
+DURABILITY_LEVELS = {
+    # fsync on every commit: committed entries survive a power loss
+    'full': 'FULL',
+    # The application default: committed entries survive an application
+    # crash, the last few may be lost on power loss (WAL mode)
+    'normal': 'NORMAL',
+    # No syncing at all: fastest, but an OS crash can lose recent entries
+    'off': 'OFF'
+}
+
+DEFAULT_DURABILITY = 'normal'
+
+
+class WriteQueueClosed(Exception):
+    """Raised when submitting to a WriteQueue that has been closed"""
+
+
+class _Flush:
+    """Queue marker: commit what is pending, then set the event"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class WriteQueue:
+    """
+    Background writer that commits queued log inserts in groups.
+    A group is committed when max_delay seconds have passed since its
+    first entry, when it reaches max_batch entries, or on flush().
+    """
+
+    def __init__(self, db: LogDatabase, max_delay: float = 0.005, max_batch: int = 1000,
+                 durability: str = DEFAULT_DURABILITY):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+        self.db = db
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.durability = durability
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='log-write-queue', daemon=True)
+        self._thread.start()
+
+    def submit(self, **entry) -> Future:
+        """
+        Queue a log entry (create_log_entry arguments as keywords).
+        Returns a Future for its id, or for the error that stopped it.
+        """
+        with self._close_lock:
+            if self._closed:
+                raise WriteQueueClosed("The write queue has been closed")
+            future = Future()
+            self._queue.put((entry, future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is committed"""
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Commit what is still queued and stop the writer thread"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        conn = self.db.pool.get_connection()
+        conn.execute(f'PRAGMA synchronous = {DURABILITY_LEVELS[self.durability]}')
+        try:
+            while True:
+                item = self._queue.get()
+                pending: List[Tuple[Dict, Future]] = []
+                deadline = time.monotonic() + self.max_delay
+                # Collect until the window closes, the group is full or a
+                # marker asks for the group to go now
+                while True:
+                    if item is _STOP or isinstance(item, _Flush):
+                        break
+                    pending.append(item)
+                    if len(pending) >= self.max_batch:
+                        item = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        item = None
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        item = None
+                        break
+
+                self._commit(pending)
+                if isinstance(item, _Flush):
+                    item.done.set()
+                elif item is _STOP:
+                    return
+        finally:
+            self.db.pool.close_thread_connection()
+
+    def _commit(self, pending: List[Tuple[Dict, Future]]):
+        """Insert a group in one transaction and resolve its futures"""
+        pending = [(entry, future) for entry, future in pending
+                   if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        try:
+            ids = self.db.insert_log_batch([entry for entry, future in pending])
+        except Exception as e:
+            if len(pending) == 1:
+                pending[0][1].set_exception(e)
+                return
+            # One bad entry shouldn't fail the rest of its group
+            for entry, future in pending:
+                try:
+                    future.set_result(self.db.insert_log_batch([entry])[0])
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        for (entry, future), log_id in zip(pending, ids):
+            future.set_result(log_id)
@@ -7,13 +7,44 @@ Version: 1.0.0
 Build Date: SET 2955.06.29.14.30 (June 29, 2025)
 """
 
+import time
+STARTED = time.perf_counter()
+
 import sys
 import os
 from PyQt6.QtWidgets import QApplication, QMessageBox, QSplashScreen
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QPainter, QFont, QColor, QPalette
-from ui.main_window import MainWindow
-from core.database import LogDatabase
+
+# The database and main window modules are imported once the splash
+# screen is up, so it appears before the slow imports run
+
+
+class StartupTimings:
+    """
+    Wall-clock time of each startup phase, printed when the application is
+    started with --startup-timings (or CAPTAINS_LOG_STARTUP_TIMINGS=1).
+    For a per-module import breakdown use python -X importtime main.py.
+    """
+    
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.last = STARTED
+        self.phases = []
+    
+    def mark(self, phase):
+        """Record the end of a phase"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last, now - STARTED))
+        self.last = now
+    
+    def report(self):
+        """Print the phases in the style of -X importtime"""
+        if not self.enabled:
+            return
+        print("startup: self [ms] | cumulative [ms] | phase", file=sys.stderr)
+        for phase, own, cumulative in self.phases:
+            print(f"startup: {own * 1000:9.1f} | {cumulative * 1000:16.1f} | {phase}", file=sys.stderr)
 
 
 def create_splash_screen():
@@ -97,17 +128,32 @@ def check_system_requirements():
         return False, f"System check failed: {str(e)}"
 
 
-def initialize_database():
-    """Initialize the application database"""
+def initialize_database(splash=None, app=None):
+    """Initialize the application database, upgrading its schema if needed"""
+    def show_progress(description, done, total):
+        if splash is None:
+            return
+        message = f"Upgrading Database: {description}..."
+        if total:
+            message += f" {done * 100 // total}%"
+        splash.showMessage(message, Qt.AlignmentFlag.AlignBottom, QColor(0, 255, 0))
+        if app is not None:
+            app.processEvents()
+    
     try:
-        db = LogDatabase()
-        return True, "Database initialized successfully"
+        from core.database import LogDatabase
+        db = LogDatabase(migration_progress=show_progress)
+        return True, "Database initialized successfully", db
     except Exception as e:
-        return False, f"Database initialization failed: {str(e)}"
+        return False, f"Database initialization failed: {str(e)}", None
 
 
 def main():
     """Main application entry point"""
+    timings = StartupTimings('--startup-timings' in sys.argv
+                             or os.environ.get('CAPTAINS_LOG_STARTUP_TIMINGS') == '1')
+    timings.mark("Python and Qt imports")
+    
     print("="*60)
     print("CAPTAIN'S LOG - UEE NAVY INTERFACE")
     print("Version 1.0.0 | SET 2955.06.29.14.30")
@@ -121,46 +167,63 @@ def main():
         input("Press Enter to exit...")
         sys.exit(1)
     print(f"✅ {req_msg}")
+    timings.mark("system requirements")
     
     # Create QApplication
     app = QApplication(sys.argv)
     
     # Setup application styling
     setup_application_style(app)
+    timings.mark("QApplication")
     
     # Show splash screen
     print("Initializing user interface...")
     splash = create_splash_screen()
     app.processEvents()
+    timings.mark("splash screen")
     
     # Initialize database
     print("Initializing database systems...")
     splash.showMessage("Initializing Database...", Qt.AlignmentFlag.AlignBottom, QColor(0, 255, 0))
     app.processEvents()
     
-    db_ok, db_msg = initialize_database()
+    db_ok, db_msg, db = initialize_database(splash, app)
     if not db_ok:
         splash.close()
         QMessageBox.critical(None, "Database Error", db_msg)
         sys.exit(1)
     print(f"✅ {db_msg}")
+    timings.mark("database")
     
     # Create main window
     splash.showMessage("Loading Main Interface...", Qt.AlignmentFlag.AlignBottom, QColor(0, 255, 0))
     app.processEvents()
     
     try:
-        main_window = MainWindow()
+        from ui.main_window import MainWindow
+        timings.mark("interface imports")
         
-        # Close splash screen and show main window
-        def show_main_window():
-            splash.close()
-            main_window.show()
+        # Every part of the interface shares the database opened above
+        main_window = MainWindow(db)
+        timings.mark("main window")
+        
+        def on_first_shown():
+            timings.mark("first paint")
             print("🚀 Captain's Log system online!")
             print("Ready for log entries, Captain. Welcome to the 'verse.")
         
-        # Delay showing main window to let splash screen display
-        QTimer.singleShot(2000, show_main_window)
+        def on_first_page():
+            main_window.log_viewer.log_model.page_loaded.disconnect(on_first_page)
+            timings.mark("first log page")
+            timings.report()
+        
+        main_window.first_shown.connect(on_first_shown)
+        main_window.log_viewer.log_model.page_loaded.connect(on_first_page)
+        
+        # Show the window as soon as it is built; the logs load after
+        # it has been painted
+        main_window.show()
+        splash.finish(main_window)
         
         # Start the application event loop
         return app.exec()
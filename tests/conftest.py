@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.connection import ConnectionPool
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A scratch directory as the CWD, where encryption.key is created"""
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    ConnectionPool.close_all()
@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from cryptography.fernet import Fernet
+
+from core import backup
+from core.backup import (BackupCancelled, BackupVerificationError, backup_database, backup_due,
+                         key_fingerprint, list_backups, load_backup_settings, manifest_path,
+                         rotate_backups, save_backup_settings, verify_backup)
+from core.database import LogDatabase
+
+
+@pytest.fixture
+def db(workdir):
+    db = LogDatabase('logs.db')
+    db.create_log_entries({
+        'stardate': f'2955.06.{i % 28 + 1:02d}.12.00',
+        'earth_date': '2025-06-01 12:00:00',
+        'log_type': 'MISSION_REPORT',
+        'priority': 1,
+        'classification': 'CLASSIFIED' if i % 2 else 'UNCLASSIFIED',
+        'title': f'Log {i}',
+        'content': f'Entry {i} ' * 50
+    } for i in range(300))
+    return db
+
+
+def test_backup_and_manifest(db):
+    path = backup_database(db, 'backups')
+    assert list_backups('backups') == [path]
+    with open(manifest_path(path), encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert manifest['row_counts'] == {'logs': 300, 'log_types': len(db.get_log_types())}
+    assert manifest['key_fingerprint'] == key_fingerprint(db.encryption_key)
+    assert db.encryption_key.strip().decode() not in open(manifest_path(path)).read()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+    assert conn.execute("SELECT content FROM logs WHERE title = 'Log 0'").fetchone()
+    conn.close()
+    assert db.get_setting('backup_last_at') == manifest['created_at']
+
+
+def test_verify(db):
+    path = backup_database(db, 'backups')
+    findings = verify_backup(path, db.encryption_key)
+    assert findings['integrity'] == 'ok'
+    assert findings['row_counts']['logs'] == 300
+    assert findings['decrypted_samples'] == backup.VERIFY_DECRYPT_SAMPLES
+
+
+def test_verify_rejects_other_key(db):
+    path = backup_database(db, 'backups')
+    other_key = Fernet.generate_key()
+    with pytest.raises(BackupVerificationError, match='different encryption key'):
+        verify_backup(path, other_key)
+
+    # A manifest claiming the other key still can't get past the samples
+    with open(manifest_path(path), encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['key_fingerprint'] = key_fingerprint(other_key)
+    with open(manifest_path(path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    with pytest.raises(BackupVerificationError, match='cannot be decrypted'):
+        verify_backup(path, other_key)
+
+
+def test_verify_rejects_tampered_manifest(db):
+    path = backup_database(db, 'backups')
+    with open(manifest_path(path), encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['row_counts']['logs'] += 1
+    with open(manifest_path(path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    with pytest.raises(BackupVerificationError, match='Row counts'):
+        verify_backup(path, db.encryption_key)
+
+    os.remove(manifest_path(path))
+    with pytest.raises(BackupVerificationError, match='manifest'):
+        verify_backup(path, db.encryption_key)
+
+
+def test_verify_rejects_corrupt_file(db):
+    path = backup_database(db, 'backups')
+    with open(path, 'r+b') as f:
+        f.write(b'\0' * 4096)
+    with pytest.raises(BackupVerificationError):
+        verify_backup(path, db.encryption_key)
+
+
+def test_compressed_backup(db, monkeypatch):
+    os.mkdir('tmp')
+    monkeypatch.setattr(tempfile, 'tempdir', os.path.abspath('tmp'))
+    path = backup_database(db, 'backups', compress=True)
+    assert path.endswith('.db.gz')
+    assert sorted(os.listdir('backups')) == [os.path.basename(path), os.path.basename(manifest_path(path))]
+    assert verify_backup(path, db.encryption_key)['row_counts']['logs'] == 300
+    with open(path, 'r+b') as f:
+        f.seek(200)
+        f.write(b'\xff' * 64)
+    with pytest.raises(BackupVerificationError, match='decompressed'):
+        verify_backup(path, db.encryption_key)
+    assert os.listdir('tmp') == []
+
+
+def test_progress_and_cancel(db, monkeypatch):
+    monkeypatch.setattr(backup, 'BACKUP_PAGES', 1)
+    steps = []
+    backup_database(db, 'backups', progress=lambda done, total: steps.append((done, total)))
+    assert len(steps) > 1 and steps[-1][0] == steps[-1][1]
+
+    with pytest.raises(BackupCancelled):
+        backup_database(db, 'cancelled', cancelled=lambda: len(steps) > 3,
+                        progress=lambda done, total: steps.append((done, total)))
+    assert os.listdir('cancelled') == []
+    assert db.count_logs() == 300
+
+
+def test_same_second_backups_and_rotation(db):
+    paths = [backup_database(db, 'backups') for _ in range(4)]
+    assert len(set(paths)) == 4
+    assert list_backups('backups') == paths[::-1]
+
+    assert rotate_backups('backups', 2) == paths[1::-1]
+    assert list_backups('backups') == paths[:1:-1]
+    assert not os.path.exists(manifest_path(paths[0]))
+
+    newest = backup_database(db, 'backups', compress=True, keep=2)
+    assert list_backups('backups') == [newest, paths[3]]
+    assert sorted(os.listdir('backups')) == sorted(
+        os.path.basename(name) for path in (newest, paths[3]) for name in (path, manifest_path(path))
+    )
+
+
+def test_settings_and_schedule(db):
+    settings = load_backup_settings(db)
+    assert settings == {'dir': 'backups', 'compress': False, 'keep': 7, 'interval_hours': 0, 'last_at': ''}
+    assert not backup_due(settings)
+
+    settings.update(dir='elsewhere', compress=True, keep=3, interval_hours=24)
+    save_backup_settings(db, settings)
+    settings = load_backup_settings(db)
+    assert (settings['dir'], settings['compress'], settings['keep']) == ('elsewhere', True, 3)
+    assert backup_due(settings)
+
+    now = datetime(2025, 6, 1, 12, 0)
+    settings['last_at'] = (now - timedelta(hours=23)).isoformat()
+    assert not backup_due(settings, now)
+    settings['last_at'] = (now - timedelta(hours=24)).isoformat()
+    assert backup_due(settings, now)
@@ -0,0 +1,67 @@
+from core.cache import ContentCache
+from core.database import LogDatabase
+
+
+def test_lru_eviction():
+    cache = ContentCache(max_entries=2)
+    cache.put(1, 'a', 'one')
+    cache.put(2, 'a', 'two')
+    assert cache.get(1, 'a') == 'one'  # 2 is now least recently used
+    cache.put(3, 'a', 'three')
+    assert cache.get(2, 'a') is None
+    assert (cache.get(1, 'a'), cache.get(3, 'a')) == ('one', 'three')
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'evictions': 1, 'entries': 2, 'max_entries': 2}
+
+
+def test_keyed_by_modification_time():
+    cache = ContentCache()
+    cache.put(1, '2025-06-01 12:00:00', 'old')
+    assert cache.get(1, '2025-06-01 12:05:00') is None
+
+
+def test_invalidate_wipes_every_version():
+    cache = ContentCache()
+    cache.put(1, 'a', 'secret')
+    cache.put(1, 'b', 'secret 2')
+    cache.put(2, 'a', 'other')
+    buffers = [buffer for (log_id, _), (buffer, _) in cache._entries.items() if log_id == 1]
+    cache.invalidate(1)
+    assert cache.get(1, 'a') is None and cache.get(1, 'b') is None
+    assert cache.get(2, 'a') == 'other'
+    assert all(not any(buffer) for buffer in buffers)
+
+
+def test_expire_idle():
+    cache = ContentCache(idle_timeout=60)
+    cache.put(1, 'a', 'one')
+    cache.put(2, 'a', 'two')
+    last_access = cache._entries[(2, 'a')][1]
+    assert cache.expire_idle(now=last_access + 30) == 0
+    assert cache.expire_idle(now=last_access + 61) == 2
+    assert cache.stats()['entries'] == 0
+    assert ContentCache(idle_timeout=None).expire_idle() == 0
+
+
+def test_disabled_cache():
+    cache = ContentCache(max_entries=0)
+    cache.put(1, 'a', 'one')
+    assert cache.get(1, 'a') is None
+
+
+def test_database_edits_invalidate(workdir):
+    db = LogDatabase('logs.db')
+    log_id = db.create_log_entry('2955.06.01.12.00', '2025-06-01 12:00:00', 'MISSION_REPORT',
+                                 'Orders', 'Hold position', classification='CLASSIFIED')
+    cache = db.content_cache
+    assert db.get_log_content(log_id) == 'Hold position'
+    assert db.get_log_content(log_id) == 'Hold position'
+    assert cache.stats()['hits'] == 1
+
+    db.update_log(log_id, content='Advance to Yela')
+    assert db.get_log_content(log_id) == 'Advance to Yela'
+    # Another LogDatabase on the same file shares the cache
+    assert LogDatabase('logs.db').content_cache is cache
+
+    db.delete_log(log_id)
+    assert cache.stats()['entries'] == 0
+    assert db.get_log_content(log_id) is None
@@ -0,0 +1,60 @@
+import pytest
+
+from core.compression import (CODEC_NONE, CompressionError, available_codecs, compress_content,
+                              decompress_content, decompress_stream, template_dictionary)
+from core.database import LogDatabase
+from core.templates import LOG_TEMPLATES
+
+BODY = "Long-range scanners picked up an ion storm near the jump point. " * 30
+DICTIONARIES = {1: template_dictionary()}
+
+
+@pytest.mark.parametrize('codec', available_codecs())
+@pytest.mark.parametrize('dictionary', [None, (1, DICTIONARIES[1])])
+def test_round_trip(codec, dictionary):
+    data, marker = compress_content(BODY, codec, dictionary)
+    assert marker == (codec if dictionary is None else f'{codec}:1')
+    assert len(data) < len(BODY)
+    assert decompress_content(data, marker, DICTIONARIES) == BODY
+    chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+    assert b''.join(decompress_stream(chunks, marker, DICTIONARIES)).decode() == BODY
+
+
+def test_dictionary_shrinks_template_bodies():
+    body = LOG_TEMPLATES['MISSION_REPORT'] + "Escort completed without incident."
+    plain, _ = compress_content(body, 'zlib')
+    primed, _ = compress_content(body, 'zlib', (1, DICTIONARIES[1]))
+    assert len(primed) < len(plain)
+
+
+def test_short_bodies_and_codec_none_are_kept():
+    assert compress_content("Reactor nominal", 'zlib') == ("Reactor nominal", CODEC_NONE)
+    assert compress_content(BODY, CODEC_NONE) == (BODY, CODEC_NONE)
+
+
+@pytest.mark.parametrize('data, marker', [
+    (b'not zlib at all', 'zlib'),
+    (compress_content(BODY, 'zlib')[0][:-10], 'zlib'),
+    (compress_content(BODY, 'zlib')[0], 'zlib:99'),
+    (b'', 'lzma'),
+])
+def test_unreadable_data(data, marker):
+    with pytest.raises(CompressionError):
+        decompress_content(data, marker, DICTIONARIES)
+    with pytest.raises(CompressionError):
+        b''.join(decompress_stream([data], marker, DICTIONARIES))
+
+
+def test_database_codec_setting(workdir):
+    db = LogDatabase('logs.db')
+    compressed = db.create_log_entry('2955.06.01.12.00', '2025-06-01 12:00:00', 'MISSION_REPORT', 'A', BODY)
+    db.set_content_compression('none')
+    plain = db.create_log_entry('2955.06.01.12.00', '2025-06-01 12:00:00', 'MISSION_REPORT', 'B', BODY,
+                                classification='CLASSIFIED')
+    codecs = dict(db.pool.get_connection().execute('SELECT id, content_codec FROM logs'))
+    assert codecs[compressed] != CODEC_NONE and codecs[plain] == CODEC_NONE
+    assert LogDatabase('logs.db').compression == CODEC_NONE
+    assert [db.get_log_content(log_id, strict=True) for log_id in (compressed, plain)] == [BODY, BODY]
+    assert ''.join(db.iter_log_content(compressed)) == BODY
+    with pytest.raises(ValueError):
+        db.set_content_compression('brotli')
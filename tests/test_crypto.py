@@ -0,0 +1,80 @@
+import base64
+import os
+
+import pytest
+from cryptography.fernet import Fernet
+
+from core.crypto import (ENVELOPE_VERSION, SCHEME_FERNET, SEGMENT_SIZE, ContentCipher, DecryptionError,
+                         available_schemes, token_to_envelope)
+
+
+@pytest.fixture(scope='module')
+def cipher():
+    return ContentCipher(Fernet.generate_key())
+
+
+@pytest.mark.parametrize('scheme', available_schemes())
+@pytest.mark.parametrize('size', [0, 1, 400, SEGMENT_SIZE, SEGMENT_SIZE + 1, 3 * SEGMENT_SIZE])
+def test_round_trip(cipher, scheme, size):
+    data = os.urandom(size)
+    envelope = cipher.seal(data, scheme)
+    assert envelope[0] == ENVELOPE_VERSION
+    assert cipher.open(envelope) == data
+    assert b''.join(cipher.open_stream(memoryview(envelope))) == data
+
+
+@pytest.mark.parametrize('scheme', available_schemes())
+def test_seal_stream_matches_seal(cipher, scheme):
+    data = os.urandom(2 * SEGMENT_SIZE + 100)
+    chunks = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+    assert cipher.open(b''.join(cipher.seal_stream(chunks, scheme))) == data
+
+
+def test_legacy_token(cipher):
+    token = Fernet(cipher.key).encrypt(b'old body').decode()
+    assert cipher.open(token) == b'old body'
+    assert cipher.open(token_to_envelope(token)) == b'old body'
+
+
+@pytest.mark.parametrize('scheme', available_schemes())
+@pytest.mark.parametrize('size', [400, 2 * SEGMENT_SIZE + 100])
+def test_truncated_envelope(cipher, scheme, size):
+    envelope = cipher.seal(os.urandom(size), scheme)
+    for length in (0, 1, 2, 20, len(envelope) // 2, len(envelope) - 1):
+        with pytest.raises(DecryptionError):
+            cipher.open(envelope[:length])
+
+
+@pytest.mark.parametrize('scheme', available_schemes())
+def test_truncated_at_segment_boundary(cipher, scheme):
+    # Dropping whole trailing segments must not pass for a shorter body
+    envelope = cipher.seal(os.urandom(3 * SEGMENT_SIZE), scheme)
+    header_size = len(envelope) - 3 * SEGMENT_SIZE - 3 * 16
+    with pytest.raises(DecryptionError):
+        cipher.open(envelope[:header_size + SEGMENT_SIZE + 16])
+
+
+@pytest.mark.parametrize('scheme', available_schemes())
+def test_tampered_envelope(cipher, scheme):
+    envelope = cipher.seal(os.urandom(1000), scheme)
+    for position in (1, 5, 40, 70, len(envelope) - 1):
+        tampered = bytearray(envelope)
+        tampered[position] ^= 0x01
+        with pytest.raises(DecryptionError):
+            cipher.open(bytes(tampered))
+
+
+@pytest.mark.parametrize('scheme', available_schemes())
+def test_wrong_key(cipher, scheme):
+    envelope = cipher.seal(b'classified', scheme)
+    with pytest.raises(DecryptionError):
+        ContentCipher(Fernet.generate_key()).open(envelope)
+
+
+def test_fernet_envelopes_are_fernet_tokens(cipher):
+    fernet = Fernet(cipher.key)
+    envelope = cipher.seal(b'binary token', 'fernet')
+    assert fernet.decrypt(base64.urlsafe_b64encode(envelope[2:])) == b'binary token'
+    token = fernet.encrypt(b'from cryptography')
+    assert cipher.open(bytes((ENVELOPE_VERSION, SCHEME_FERNET)) + base64.urlsafe_b64decode(token)) \
+        == b'from cryptography'
@@ -0,0 +1,71 @@
+import csv
+import json
+
+import pytest
+
+from core.database import LogDatabase
+from core.exporter import REDACTED_CONTENT, ExportCancelled, ExportWriter, export_logs
+from core.importer import import_logs
+from core.query import LogQuery
+
+
+@pytest.fixture
+def db(workdir):
+    db = LogDatabase('logs.db')
+    for i in range(12):
+        db.create_log_entry(f'2955.06.{i + 1:02d}.12.00', '2025-06-01 12:00:00',
+                            'SECURITY_ALERT' if i % 3 == 0 else 'MISSION_REPORT',
+                            f'Log {i} <b>', f'Body {i}, "quoted" & <tagged>',
+                            classification='CLASSIFIED' if i % 4 == 0 else 'UNCLASSIFIED')
+    return db
+
+
+def test_jsonl_redacts_classified(db, workdir):
+    assert export_logs(db, 'out.jsonl', 'jsonl', chunk_size=5) == 12
+    logs = [json.loads(line) for line in open('out.jsonl', encoding='utf-8')]
+    assert [log['title'] for log in logs][:2] == ['Log 11 <b>', 'Log 10 <b>']
+    assert {log['content'] for log in logs if log['classification'] == 'CLASSIFIED'} == {REDACTED_CONTENT}
+    assert logs[1]['content'] == 'Body 10, "quoted" & <tagged>'
+
+
+def test_decrypt_and_filter(db, workdir):
+    query = LogQuery(log_type='SECURITY_ALERT')
+    assert export_logs(db, 'out.csv', 'csv', query, decrypt=True) == 4
+    with open('out.csv', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['content'] for row in rows] == [f'Body {i}, "quoted" & <tagged>' for i in (9, 6, 3, 0)]
+
+
+def test_exports_import_back(db, workdir):
+    export_logs(db, 'out.csv', 'csv', decrypt=True)
+    copy = LogDatabase('copy.db')
+    assert import_logs(copy, 'out.csv') == 12
+    assert copy.get_logs(limit=1)[0]['content'] == db.get_logs(limit=1)[0]['content']
+
+
+@pytest.mark.parametrize('file_format', ['markdown', 'html'])
+def test_reports(db, workdir, file_format):
+    export_logs(db, 'out', file_format)
+    text = open('out', encoding='utf-8').read()
+    assert text.count('SET 2955.06.') == 12
+    if file_format == 'html':
+        assert '&lt;tagged&gt;' in text and '<tagged>' not in text
+        assert text.rstrip().endswith('</html>')
+
+
+def test_progress_and_cancel(db, workdir):
+    progress = []
+    export_logs(db, 'out.jsonl', 'jsonl', chunk_size=5, progress=lambda done, total: progress.append((done, total)))
+    assert progress == [(5, 12), (10, 12), (12, 12)]
+
+    with pytest.raises(ExportCancelled):
+        export_logs(db, 'cancelled.jsonl', 'jsonl', chunk_size=5, cancelled=lambda: True)
+    assert not list(workdir.glob('cancelled.jsonl*'))
+
+
+def test_writer_must_implement_write():
+    class Incomplete(ExportWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(None)
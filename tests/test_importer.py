@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from core.database import LogDatabase
+from core.importer import import_logs, main
+
+
+def record(**fields):
+    entry = {
+        'stardate': '2955.06.01.12.00',
+        'log_type': 'MISSION_REPORT',
+        'title': 'Patrol',
+        'content': 'All quiet near Yela.'
+    }
+    entry.update(fields)
+    return entry
+
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(entry) + '\n' for entry in records), encoding='utf-8')
+    return str(path)
+
+
+def test_import_jsonl(workdir):
+    db = LogDatabase('logs.db')
+    path = write_jsonl(workdir / 'old.jsonl', [record(title=f'Patrol {i}') for i in range(10)])
+    assert import_logs(db, path, batch_size=3) == 10
+    log = db.get_logs(limit=1)[0]
+    assert log['earth_date'] == '2025-06-01 12:00:00'
+    assert (log['priority'], log['classification'], log['is_encrypted']) == (1, 'UNCLASSIFIED', 0)
+
+
+def test_import_csv(workdir):
+    db = LogDatabase('logs.db')
+    (workdir / 'old.csv').write_text(
+        'stardate,log_type,title,content,priority,classification\n'
+        '2955.06.01.12.00,SYSTEM_STATUS,Reactor,"Nominal, all green",3,\n',
+        encoding='utf-8')
+    assert import_logs(db, str(workdir / 'old.csv')) == 1
+    log = db.get_logs()[0]
+    assert (log['log_type'], log['priority'], log['content']) == ('SYSTEM_STATUS', 3, 'Nominal, all green')
+
+
+def test_classification_is_case_insensitive(workdir):
+    db = LogDatabase('logs.db')
+    path = write_jsonl(workdir / 'old.jsonl', [record(classification=' classified '),
+                                               record(classification='Top_Secret')])
+    import_logs(db, path)
+    logs = db.get_logs()
+    assert sorted(log['classification'] for log in logs) == ['CLASSIFIED', 'TOP_SECRET']
+    assert all(log['is_encrypted'] for log in logs)
+    assert db.get_log_content(logs[0]['id'], strict=True) == 'All quiet near Yela.'
+
+
+@pytest.mark.parametrize('fields, message', [
+    ({'classification': 'SECRET'}, "Line 2: unknown classification 'SECRET'"),
+    ({'priority': 9}, "Line 2: priority must be 1 to 5, not 9"),
+    ({'priority': 0}, "Line 2: priority must be 1 to 5, not 0"),
+    ({'priority': 'high'}, "Line 2: priority must be a number"),
+    ({'log_type': 'SHOPPING_LIST'}, "Line 2: unknown log type 'SHOPPING_LIST'"),
+    ({'title': ''}, "Line 2: missing title"),
+])
+def test_invalid_record(workdir, fields, message):
+    db = LogDatabase('logs.db')
+    path = write_jsonl(workdir / 'old.jsonl', [record(), record(**fields)])
+    with pytest.raises(ValueError, match=message):
+        import_logs(db, path)
+
+
+def test_main_reports_errors(workdir, capsys):
+    path = write_jsonl(workdir / 'old.jsonl', [record(priority=7)])
+    assert main([path, '--db', 'logs.db']) == 1
+    assert "Line 1: priority must be 1 to 5" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('stardate', ['garbage', '2955.99.99.99.99', '2955.02.30'])
+def test_invalid_stardate_reports_line(workdir, stardate):
+    db = LogDatabase('logs.db')
+    records = [record() for _ in range(6)] + [record(stardate=stardate)]
+    path = write_jsonl(workdir / 'old.jsonl', records)
+    with pytest.raises(ValueError, match="Line 7: Invalid SET"):
+        import_logs(db, path)
+
+
+def test_stardates_checked_per_batch(workdir):
+    db = LogDatabase('logs.db')
+    records = [record(stardate=f'2955.06.{day:02d}.12.00') for day in range(1, 10)]
+    records[2]['earth_date'] = '2025-01-01 00:00:00'
+    path = write_jsonl(workdir / 'old.jsonl', records)
+    assert import_logs(db, path, batch_size=3) == 9
+    logs = sorted(db.get_logs(), key=lambda log: log['id'])
+    assert [log['earth_date'][:10] for log in logs[1:4]] == ['2025-06-02', '2025-01-01', '2025-06-04']
+    assert logs[-1]['earth_date'] == '2025-06-09 12:00:00'
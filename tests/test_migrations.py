@@ -0,0 +1,145 @@
+import sqlite3
+
+import pytest
+from cryptography.fernet import Fernet
+
+import core.migrations
+from core.database import LogDatabase
+from core.migrations import LATEST_VERSION, MigrationError, apply_migrations, schema_version
+
+# The schema of the first release, before migrations existed
+BASELINE_SCHEMA = '''
+    CREATE TABLE logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        stardate TEXT NOT NULL,
+        earth_date TEXT NOT NULL,
+        log_type TEXT NOT NULL,
+        priority INTEGER DEFAULT 1,
+        classification TEXT DEFAULT 'UNCLASSIFIED',
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        is_encrypted INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE log_types (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        description TEXT,
+        color TEXT DEFAULT '#00FF00'
+    );
+    INSERT INTO log_types (name, description) VALUES ('MISSION_REPORT', 'Mission status and objectives');
+'''
+
+LONG_BODY = "Quantum drive calibration completed within tolerances. " * 20
+
+
+def make_baseline_db(path, key, rows=()):
+    """A database as the first release wrote it: a plain and a classified log, plus rows"""
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany('''
+        INSERT INTO logs (stardate, earth_date, log_type, classification, title, content, is_encrypted)
+        VALUES (?, '2025-06-01 12:00:00', 'MISSION_REPORT', ?, ?, ?, ?)
+    ''', [
+        ('2955.06.01.12.00', 'UNCLASSIFIED', 'Plain log', LONG_BODY, 0),
+        ('2955.06.02.12.00', 'CLASSIFIED', 'Secret log', Fernet(key).encrypt(b'Rendezvous at Yela').decode(), 1),
+        *rows
+    ])
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def baseline(workdir):
+    """Open a baseline database (see make_baseline_db) with LogDatabase"""
+    def open_baseline(*rows, progress=None):
+        key = Fernet.generate_key()
+        (workdir / 'encryption.key').write_bytes(key)
+        make_baseline_db('old.db', key, rows)
+        return LogDatabase('old.db', progress)
+    return open_baseline
+
+
+def test_migrate_baseline_database(baseline):
+    steps = []
+    db = baseline(progress=lambda description, done, total: steps.append(description))
+    conn = db.pool.get_connection()
+    assert schema_version(conn) == LATEST_VERSION
+    descriptions = [migration.description for migration in core.migrations.MIGRATIONS]
+    assert list(dict.fromkeys(steps))[:len(descriptions)] == descriptions
+
+    logs = {log['title']: log for log in db.get_logs()}
+    assert db.get_log_content(logs['Plain log']['id'], strict=True) == LONG_BODY
+    assert db.get_log_content(logs['Secret log']['id'], strict=True) == 'Rendezvous at Yela'
+    assert len(db.get_log_types()) == 7
+
+
+def test_migrated_database_opens_without_migrating(baseline):
+    baseline().close()
+    db = LogDatabase('old.db')
+    assert apply_migrations(db, db.pool.get_connection()) == 0
+    assert len(db.get_logs()) == 2
+
+
+def test_newer_schema_is_refused(workdir):
+    conn = sqlite3.connect('future.db')
+    conn.execute(f'PRAGMA user_version = {LATEST_VERSION + 1}')
+    conn.close()
+    with pytest.raises(MigrationError):
+        LogDatabase('future.db')
+
+
+def test_failed_migration_rolls_back(baseline, monkeypatch):
+    def fail(db, conn, progress):
+        conn.execute('CREATE TABLE half_done (id INTEGER)')
+        raise RuntimeError("disk full")
+
+    last = core.migrations.MIGRATIONS[-1]
+    apply = last.apply
+    monkeypatch.setattr(last, 'apply', fail)
+    with pytest.raises(RuntimeError):
+        baseline()
+    conn = sqlite3.connect('old.db')
+    assert schema_version(conn) == LATEST_VERSION - 1
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+    conn.close()
+
+    monkeypatch.setattr(last, 'apply', apply)
+    assert LogDatabase('old.db').get_log_content(1, strict=True) == LONG_BODY
+
+
+def test_stardate_numbers(baseline):
+    db = baseline(('2955.13.40.99.99', 'UNCLASSIFIED', 'Bad stardate', 'Short body', 0),
+                  ('955.01.01.00.00', 'UNCLASSIFIED', 'Short year', 'Short body', 0))
+    conn = db.pool.get_connection()
+    numbers = dict(conn.execute('SELECT title, stardate_num FROM logs'))
+    assert numbers['Plain log'] == 295506011200
+    assert numbers['Short year'] == 95501010000
+    # Malformed SETs are kept but sort last and belong to no timeline period
+    assert numbers['Bad stardate'] == 0
+    assert [log['title'] for log in db.get_logs()] == ['Secret log', 'Plain log', 'Short year', 'Bad stardate']
+    assert db.get_timeline('day') == [('955.01.01', 1), ('2955.06.01', 1), ('2955.06.02', 1)]
+    assert db.get_timeline('year') == [('955', 1), ('2955', 2)]
+
+
+def test_bodies_compressed(baseline):
+    db = baseline(('2955.06.03.12.00', 'UNCLASSIFIED', 'Short log', 'Short body', 0))
+    conn = db.pool.get_connection()
+    rows = {title: (content, codec) for title, content, codec
+            in conn.execute('SELECT title, content, content_codec FROM logs')}
+    content, codec = rows['Plain log']
+    assert codec == 'zlib:1' and len(content) < len(LONG_BODY) / 4
+    assert rows['Short log'] == ('Short body', '')
+    assert rows['Secret log'][1] == ''  # Too short to shrink, but still a readable envelope
+    assert conn.execute('SELECT COUNT(*) FROM content_dictionaries').fetchone()[0] == 1
+    # The search index holds the plaintext
+    assert [log['title'] for log in db.search_logs('quantum')] == ['Plain log']
+
+
+def test_tokens_stored_as_envelopes(baseline):
+    db = baseline()
+    conn = db.pool.get_connection()
+    secret = conn.execute("SELECT content FROM logs WHERE title = 'Secret log'").fetchone()[0]
+    assert isinstance(secret, bytes) and secret[0] == 1
+    assert db.get_log_content(2, strict=True) == 'Rendezvous at Yela'
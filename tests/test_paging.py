@@ -0,0 +1,80 @@
+import pytest
+
+from core.database import LogDatabase
+from core.query import LogQuery
+
+
+@pytest.fixture
+def db(workdir):
+    db = LogDatabase('logs.db')
+    # Several logs share each SET, so the id has to break ties
+    db.create_log_entries({
+        'stardate': f'2955.{i % 6 + 1:02d}.01.00.00',
+        'earth_date': '2025-06-01 12:00:00',
+        'log_type': 'SECURITY_ALERT' if i % 3 == 0 else 'MISSION_REPORT',
+        'priority': 1,
+        'classification': 'UNCLASSIFIED',
+        'title': f'Log {i}',
+        'content': f'Entry {i}'
+    } for i in range(47))
+    return db
+
+
+def read_pages(db, limit, **kwargs):
+    pages, cursor = [], None
+    while True:
+        logs, cursor = db.get_logs_page(limit, cursor, **kwargs)
+        pages.append(logs)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize('limit', [1, 5, 10, 47, 100])
+def test_pages_cover_every_log_once(db, limit):
+    pages = read_pages(db, limit)
+    ids = [log['id'] for page in pages for log in page]
+    assert len(ids) == len(set(ids)) == 47
+    assert all(len(page) <= limit for page in pages)
+    keys = [(log['stardate_num'], log['id']) for page in pages for log in page]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_pages_match_unpaged_order(db):
+    everything = db.query_logs(LogQuery(), limit=1000)[0]
+    assert [log['id'] for page in read_pages(db, 4) for log in page] == [log['id'] for log in everything]
+
+
+def test_ties_ordered_by_id(db):
+    logs = db.get_logs_page(7)[0]
+    assert len({log['stardate_num'] for log in logs}) == 1
+    assert [log['id'] for log in logs] == sorted((log['id'] for log in logs), reverse=True)
+
+
+def test_filtered_pages(db):
+    ids = [log['id'] for page in read_pages(db, 3, filter_type='SECURITY_ALERT') for log in page]
+    assert len(ids) == len(set(ids)) == 16
+    assert all(log['log_type'] == 'SECURITY_ALERT'
+               for log in db.query_logs(LogQuery(log_type='SECURITY_ALERT'), limit=100)[0])
+
+
+def test_last_page_has_no_cursor(db):
+    logs, cursor = db.get_logs_page(50)
+    assert len(logs) == 47 and cursor is None
+    assert 'content' not in logs[0]
+
+
+def test_ranked_search_pages_by_offset(db):
+    query = LogQuery(search='entry', order=LogQuery.ORDER_RELEVANCE)
+    ids, cursor = [], None
+    while True:
+        logs, cursor = db.query_logs(query, 10, cursor)
+        ids.extend(log['id'] for log in logs)
+        if cursor is None:
+            break
+    assert len(ids) == len(set(ids)) == 47
+
+
+def test_iter_logs_chunks(db):
+    chunks = list(db.iter_logs(chunk_size=20))
+    assert [len(chunk) for chunk in chunks] == [20, 20, 7]
+    assert all('content' in log for chunk in chunks for log in chunk)
@@ -0,0 +1,77 @@
+import pytest
+
+from core.database import LogDatabase
+from core.query import LogQuery
+
+LOG_TYPES = ['MISSION_REPORT', 'SECURITY_ALERT', 'SCIENTIFIC_LOG']
+
+
+@pytest.fixture
+def db(workdir):
+    db = LogDatabase('logs.db')
+    db.create_log_entries({
+        'stardate': f'2955.{i % 12 + 1:02d}.{i % 28 + 1:02d}.{i % 24:02d}.00',
+        'earth_date': '2025-06-01 12:00:00',
+        'log_type': LOG_TYPES[i % 3],
+        'priority': i % 5 + 1,
+        'classification': 'CLASSIFIED' if i % 7 == 0 else 'UNCLASSIFIED',
+        'title': f'Log {i}',
+        'content': 'Ion storm near the jump point' if i % 4 == 0 else 'Routine patrol'
+    } for i in range(120))
+    return db
+
+
+QUERIES = [
+    LogQuery(),
+    LogQuery(log_type='SECURITY_ALERT'),
+    LogQuery(priority=3),
+    LogQuery(min_priority=4, classification='UNCLASSIFIED'),
+    LogQuery(start_stardate='2955.03', end_stardate='2955.05'),
+    LogQuery(start_stardate='2955.06.10.12', log_type='MISSION_REPORT'),
+    LogQuery(end_stardate='2955.02.14'),
+]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_sql_agrees_with_matches(db, query):
+    everything = db.query_logs(LogQuery(), limit=1000)[0]
+    expected = [log['id'] for log in everything if query.matches(log)]
+    assert [log['id'] for log in db.query_logs(query, limit=1000)[0]] == expected
+    assert db.count_logs(query) == len(expected)
+
+
+def test_partial_end_stardate_covers_its_span(db):
+    logs = db.query_logs(LogQuery(start_stardate='2955.05', end_stardate='2955.05'), limit=1000)[0]
+    assert logs and {log['stardate'][:7] for log in logs} == {'2955.05'}
+
+
+def test_search_with_filters(db):
+    query = LogQuery(search='storm', log_type='MISSION_REPORT')
+    logs = db.query_logs(query, limit=1000)[0]
+    assert logs and all(log['log_type'] == 'MISSION_REPORT' for log in logs)
+    assert len(logs) == len([i for i in range(120) if i % 4 == 0 and i % 3 == 0 and i % 7 != 0])
+    assert db.query_logs(LogQuery(search='"jump point"'), limit=1000)[0]
+    assert db.query_logs(LogQuery(search='"point jump"'), limit=1000)[0] == []
+    assert db.query_logs(LogQuery(search='!!'), limit=1000)[0] == []
+
+
+def test_compile():
+    assert LogQuery().compile() == ('', [])
+    where, params = LogQuery(log_type='X', min_priority=2, start_stardate='2955.03').compile()
+    assert where == 'log_type = ? AND priority >= ? AND stardate_num >= ?'
+    assert params == ['X', 2, 295503000000]
+    where, params = LogQuery(search='storm').compile(fts_enabled=False)
+    assert where == '(title LIKE ? OR content LIKE ?)' and params == ['%storm%', '%storm%']
+    assert LogQuery(search='storm').compile(include_search=False) == ('', [])
+
+
+def test_filter_copies():
+    base = LogQuery(log_type='X', search='  ')
+    narrowed = base.filter(priority=2, search='storm')
+    assert (base.priority, base.search) == (None, None)
+    assert (narrowed.log_type, narrowed.priority, narrowed.search) == ('X', 2, 'storm')
+    assert base.same_filters(base.filter(search='ion'))
+    assert not base.same_filters(narrowed)
+    assert narrowed.filter(order=LogQuery.ORDER_RELEVANCE).ranked
+    with pytest.raises(TypeError):
+        base.filter(colour='red')
@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import pytest
+
+import core.stardate
+from core.stardate import StardateCalculator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def backend(request, monkeypatch):
+    """Run a test with and without NumPy"""
+    if request.param == 'numpy' and numpy is None:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(core.stardate, '_numpy_checked', True)
+    monkeypatch.setattr(core.stardate, 'np', numpy if request.param == 'numpy' else None)
+    return request.param
+
+
+SET_TIMES = ['2955.06.01.12.30', '2955.13.01.00.00', '2955.06.01', 'garbage',
+             '2955.02.30.00.00', '2955.06.01.24.00', '', '2956.12.31.23.59']
+
+
+def test_stardates_to_numbers(backend):
+    result = StardateCalculator.stardates_to_numbers(SET_TIMES)
+    assert sorted(result.errors) == [1, 3, 5, 6]
+    assert not result.ok and len(result) == len(SET_TIMES)
+    assert int(result.values[0]) == 295506011230
+    assert int(result.values[2]) == 295506010000
+    assert int(result.values[7]) == 295612312359
+    # 2955.02.30 packs (the day is in range); only dates check the calendar
+    assert int(result.values[4]) == 295502300000
+
+
+def test_stardates_to_earth_dates(backend):
+    result = StardateCalculator.stardates_to_earth_dates(SET_TIMES)
+    assert sorted(result.errors) == [1, 3, 4, 5, 6]
+    assert result.values[0] == datetime(2025, 6, 1, 12, 30)
+    assert result.values[2] == datetime(2025, 6, 1)
+    assert all(result.values[i] is None for i in result.errors)
+
+
+def test_stardates_to_earth_date_texts(backend):
+    result = StardateCalculator.stardates_to_earth_date_texts(SET_TIMES)
+    assert sorted(result.errors) == [1, 3, 4, 5, 6]
+    assert result.values[0] == '2025-06-01 12:30:00'
+    assert result.values[7] == '2026-12-31 23:59:00'
+    assert result.values[1] is None
+
+
+def test_datetime64_output(backend):
+    if backend != 'numpy':
+        with pytest.raises(RuntimeError):
+            StardateCalculator.stardates_to_earth_dates(SET_TIMES, as_datetime64=True)
+        return
+    result = StardateCalculator.stardates_to_earth_dates(SET_TIMES, as_datetime64=True)
+    assert result.values[0] == numpy.datetime64('2025-06-01T12:30')
+    assert all(numpy.isnat(result.values[i]) for i in result.errors)
+
+
+def test_earth_dates_round_trip(backend):
+    dates = [datetime(2025, 6, 1, 12, 30), datetime(2026, 1, 2, 3, 4)]
+    stardates = StardateCalculator.earth_dates_to_stardates(dates)
+    assert stardates.values == ['2955.06.01.12.30', '2956.01.02.03.04']
+    assert stardates.values == [StardateCalculator.earth_date_to_stardate(date) for date in dates]
+    numbers = StardateCalculator.stardates_to_numbers(stardates.values)
+    assert StardateCalculator.numbers_to_stardates(numbers.values).values == stardates.values
+
+
+def test_earth_dates_errors(backend):
+    result = StardateCalculator.earth_dates_to_numbers([datetime(2025, 6, 1), 'yesterday'])
+    assert list(result.errors) == [1]
+    assert int(result.values[0]) == 295506010000
+
+
+def test_numbers_to_stardates_unusual_years(backend):
+    result = StardateCalculator.numbers_to_stardates([99901010000, 1234501010000])
+    assert result.values == ['999.01.01.00.00', '12345.01.01.00.00']
+    assert result.values == [StardateCalculator.number_to_stardate(99901010000),
+                             StardateCalculator.number_to_stardate(1234501010000)]
+
+
+@pytest.mark.parametrize('set_time', ['2955.00.01', '2955.01.32', '2955.01.01.24', '2955.01.01.00.60', '2955.x'])
+def test_stardate_to_number_rejects(set_time):
+    with pytest.raises(ValueError):
+        StardateCalculator.stardate_to_number(set_time)
+
+
+def test_clock_ticks_only_changed_fields():
+    clock = core.stardate.StardateClock()
+    first = clock.tick(datetime(2025, 6, 1, 12, 30, 5))
+    assert first['stardate'] == '2955.06.01.12.30'
+    assert first['earth_date'] == '2025-06-01 12:30:05'
+    assert 'utc_time' not in first
+    assert clock.tick(datetime(2025, 6, 1, 12, 30, 5, 500)) == {}
+    assert clock.tick(datetime(2025, 6, 1, 12, 30, 6)) == {'earth_date': '2025-06-01 12:30:06'}
+    rollover = clock.tick(datetime(2025, 6, 2, 0, 0, 0))
+    assert rollover['stardate'] == '2955.06.02.00.00'
+    assert rollover['day_of_year'] == 153
+
+
+def test_get_stardate_info_keeps_every_field():
+    info = StardateCalculator.get_stardate_info()
+    assert {'stardate', 'earth_date', 'sc_year', 'utc_time', 'set_display'} <= set(info)
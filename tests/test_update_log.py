@@ -0,0 +1,95 @@
+import pytest
+from cryptography.fernet import Fernet
+
+from core.compression import CompressionError
+from core.crypto import DecryptionError
+from core.database import LogConflictError, LogDatabase
+
+LONG_BODY = "Shield emitter three reports intermittent power fluctuations. " * 10
+
+
+def new_log(db, classification='UNCLASSIFIED', content='Reactor nominal'):
+    return db.create_log_entry('2955.06.03.08.30', '2025-06-03 08:30:00', 'MISSION_REPORT',
+                               'Status', content, classification=classification)
+
+
+def stored_row(db, log_id):
+    return db.pool.get_connection().execute(
+        'SELECT content, content_codec, is_encrypted, version FROM logs WHERE id = ?', (log_id,)
+    ).fetchone()
+
+
+def test_update_in_place(workdir):
+    db = LogDatabase('logs.db')
+    log_id = new_log(db)
+    version = db.get_log(log_id)['version']
+    assert db.update_log(log_id, version, title='Revised', content='Second draft') == version + 1
+    log = db.get_log(log_id)
+    assert (log['title'], log['content']) == ('Revised', 'Second draft')
+    assert db.count_logs() == 1
+
+
+def test_unchanged_values_write_nothing(workdir):
+    db = LogDatabase('logs.db')
+    log_id = new_log(db, 'CLASSIFIED', LONG_BODY)
+    version = db.get_log(log_id)['version']
+    assert db.update_log(log_id, version, content=LONG_BODY, classification='CLASSIFIED') == version
+
+
+def test_classification_change_reencodes(workdir):
+    db = LogDatabase('logs.db')
+    log_id = new_log(db, content=LONG_BODY)
+    db.update_log(log_id, classification='TOP_SECRET')
+    assert stored_row(db, log_id)[2] == 1
+    assert db.get_log_content(log_id, strict=True) == LONG_BODY
+    db.update_log(log_id, classification='UNCLASSIFIED')
+    assert stored_row(db, log_id)[2] == 0
+    assert db.get_log_content(log_id, strict=True) == LONG_BODY
+
+
+def test_stale_version_conflicts(workdir):
+    db = LogDatabase('logs.db')
+    log_id = new_log(db)
+    version = db.get_log(log_id)['version']
+    db.update_log(log_id, version, title='First edit')
+    with pytest.raises(LogConflictError):
+        db.update_log(log_id, version, title='Second edit')
+    db.delete_log(log_id)
+    with pytest.raises(LogConflictError):
+        db.update_log(log_id, title='Gone')
+
+
+def test_update_with_unreadable_key(workdir):
+    db = LogDatabase('logs.db')
+    log_id = new_log(db, 'CLASSIFIED', 'Sealed with the first key')
+    stored = stored_row(db, log_id)
+    db.close()
+
+    (workdir / 'encryption.key').write_bytes(Fernet.generate_key())
+    db = LogDatabase('logs.db')
+    with pytest.raises(DecryptionError):
+        db.get_log_content(log_id, strict=True)
+    for changes in ({'content': 'Overwritten'}, {'classification': 'UNCLASSIFIED'}):
+        with pytest.raises(DecryptionError):
+            db.update_log(log_id, stored[3], **changes)
+    assert stored_row(db, log_id) == stored
+
+
+@pytest.mark.parametrize('changes', [
+    {'classification': 'CLASSIFIED'},
+    {'content': 'Overwritten'},
+    {'title': 'Renamed'},
+])
+def test_update_with_undecodable_body(workdir, changes):
+    # e.g. a zstd row opened without zstandard: the placeholder text
+    # must never be saved in place of the body
+    db = LogDatabase('logs.db')
+    log_id = new_log(db, content=LONG_BODY)
+    conn = db.pool.get_connection()
+    with conn:
+        conn.execute("UPDATE logs SET content_codec = 'zlib:99' WHERE id = ?", (log_id,))
+    stored = stored_row(db, log_id)
+
+    with pytest.raises(CompressionError):
+        db.update_log(log_id, stored[3], **changes)
+    assert stored_row(db, log_id) == stored
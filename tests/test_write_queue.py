@@ -0,0 +1,111 @@
+import pytest
+
+from core.database import LogDatabase
+from core.write_queue import DURABILITY_LEVELS, WriteQueue, WriteQueueClosed
+
+
+def entry(i, **fields):
+    values = {
+        'stardate': '2955.06.01.12.00',
+        'earth_date': '2025-06-01 12:00:00',
+        'log_type': 'MISSION_REPORT',
+        'title': f'Log {i}',
+        'content': f'Entry {i}'
+    }
+    values.update(fields)
+    return values
+
+
+@pytest.fixture
+def db(workdir):
+    return LogDatabase('logs.db')
+
+
+@pytest.fixture
+def groups(db, monkeypatch):
+    """Sizes of the groups the writer commits, and its synchronous setting"""
+    seen = []
+    insert = db.insert_log_batch
+
+    def recording_insert(batch, *args):
+        synchronous = db.pool.get_connection().execute('PRAGMA synchronous').fetchone()[0]
+        seen.append((len(batch), synchronous))
+        return insert(batch, *args)
+
+    monkeypatch.setattr(db, 'insert_log_batch', recording_insert)
+    return seen
+
+
+def test_futures_resolve_to_ids(db):
+    queue = WriteQueue(db)
+    futures = [queue.submit(**entry(i)) for i in range(20)]
+    ids = [future.result(timeout=5) for future in futures]
+    queue.close()
+    assert len(set(ids)) == 20
+    assert [db.get_log(log_id)['title'] for log_id in ids] == [f'Log {i}' for i in range(20)]
+
+
+def test_entries_within_window_share_a_commit(db, groups):
+    queue = WriteQueue(db, max_delay=10)
+    futures = [queue.submit(**entry(i)) for i in range(30)]
+    assert queue.flush(timeout=5)
+    assert all(future.done() for future in futures)
+    queue.close()
+    assert [size for size, _ in groups] == [30]
+
+
+def test_max_batch_splits_groups(db, groups):
+    queue = WriteQueue(db, max_delay=10, max_batch=8)
+    for i in range(20):
+        queue.submit(**entry(i))
+    queue.close(timeout=5)
+    assert [size for size, _ in groups] == [8, 8, 4]
+    assert db.count_logs() == 20
+
+
+def test_close_commits_pending_entries(db):
+    queue = WriteQueue(db, max_delay=10)
+    future = queue.submit(**entry(0))
+    queue.close(timeout=5)
+    assert future.result(timeout=0) == db.get_logs_page()[0][0]['id']
+    with pytest.raises(WriteQueueClosed):
+        queue.submit(**entry(1))
+    queue.close()  # Closing again is harmless
+
+
+def test_bad_entry_fails_only_its_future(db):
+    queue = WriteQueue(db, max_delay=10)
+    good = queue.submit(**entry(0))
+    bad = queue.submit(**{k: v for k, v in entry(1).items() if k != 'title'})
+    classified = queue.submit(**entry(2, classification='CLASSIFIED'))
+    queue.close(timeout=5)
+    with pytest.raises(KeyError):
+        bad.result(timeout=0)
+    assert db.get_log(good.result(timeout=0))['content'] == 'Entry 0'
+    assert db.get_log(classified.result(timeout=0))['content'] == 'Entry 2'
+    assert db.count_logs() == 2
+
+
+def test_cancelled_future_is_skipped(db):
+    queue = WriteQueue(db, max_delay=10)
+    queue.flush()  # Let the writer start waiting before anything is queued
+    kept = queue.submit(**entry(0))
+    dropped = queue.submit(**entry(1))
+    assert dropped.cancel()
+    queue.close(timeout=5)
+    assert kept.result(timeout=0)
+    assert db.count_logs() == 1
+
+
+@pytest.mark.parametrize('durability, synchronous', [('full', 2), ('normal', 1), ('off', 0)])
+def test_durability_sets_writer_synchronous(db, groups, durability, synchronous):
+    queue = WriteQueue(db, durability=durability)
+    assert queue.submit(**entry(0)).result(timeout=5)
+    queue.close()
+    assert groups == [(1, synchronous)]
+    assert set(DURABILITY_LEVELS) == {'full', 'normal', 'off'}
+
+
+def test_unknown_durability(db):
+    with pytest.raises(ValueError):
+        WriteQueue(db, durability='paranoid')
@@ -0,0 +1,95 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
+                             QLineEdit, QCheckBox, QComboBox, QSpinBox,
+                             QPushButton, QLabel, QFileDialog)
+from core.backup import load_backup_settings, save_backup_settings
+
+
+class BackupDialog(QDialog):
+    """Backup options, with a button to back up right away"""
+
+    INTERVALS = [
+        ("Off", 0),
+        ("Every 6 hours", 6),
+        ("Daily", 24),
+        ("Weekly", 24 * 7)
+    ]
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.backup_now = False
+        self.settings = load_backup_settings(db)
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("Backup Database")
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        dir_layout = QHBoxLayout()
+        self.dir_edit = QLineEdit(self.settings['dir'])
+        dir_layout.addWidget(self.dir_edit)
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self.browse_dir)
+        dir_layout.addWidget(browse_button)
+        form.addRow("Backup folder:", dir_layout)
+
+        self.compress_check = QCheckBox("Compress backups (gzip)")
+        self.compress_check.setChecked(self.settings['compress'])
+        form.addRow("", self.compress_check)
+
+        self.keep_spin = QSpinBox()
+        self.keep_spin.setRange(1, 100)
+        self.keep_spin.setValue(self.settings['keep'])
+        form.addRow("Backups to keep:", self.keep_spin)
+
+        self.interval_combo = QComboBox()
+        for label, hours in self.INTERVALS:
+            self.interval_combo.addItem(label, hours)
+        index = self.interval_combo.findData(self.settings['interval_hours'])
+        self.interval_combo.setCurrentIndex(max(index, 0))
+        form.addRow("Automatic backups:", self.interval_combo)
+
+        last = self.settings['last_at'] or "Never"
+        form.addRow("Last backup:", QLabel(last))
+        layout.addLayout(form)
+
+        note = QLabel("The encryption key is not included in backups. Keep a copy of "
+                      "encryption.key somewhere safe, classified logs cannot be read without it.")
+        note.setWordWrap(True)
+        layout.addWidget(note)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        backup_button = QPushButton("Back Up Now")
+        backup_button.clicked.connect(self.accept_and_backup)
+        buttons.addWidget(backup_button)
+        save_button = QPushButton("Save")
+        save_button.clicked.connect(self.accept)
+        buttons.addWidget(save_button)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        buttons.addWidget(cancel_button)
+        layout.addLayout(buttons)
+
+    def browse_dir(self):
+        path = QFileDialog.getExistingDirectory(self, "Backup Folder", self.dir_edit.text())
+        if path:
+            self.dir_edit.setText(path)
+
+    def accept_and_backup(self):
+        self.backup_now = True
+        self.accept()
+
+    def accept(self):
+        """Store the options before closing"""
+        self.settings.update({
+            'dir': self.dir_edit.text().strip() or 'backups',
+            'compress': self.compress_check.isChecked(),
+            'keep': self.keep_spin.value(),
+            'interval_hours': self.interval_combo.currentData()
+        })
+        save_backup_settings(self.db, self.settings)
+        super().accept()
@@ -0,0 +1,60 @@
+from typing import List
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal, pyqtSlot
+from core.database import LogDatabase
+
+
+class ChangeBus(QObject):
+    """
+    Qt signals for changes to the log database.
+    Writes made through any LogDatabase on the same file are reported by
+    the connection pool with the affected log ids; writes from other
+    processes (e.g. the bulk importer) are noticed by polling PRAGMA
+    data_version, which reads no tables. Signals are always delivered on
+    the GUI thread, whichever thread did the write.
+    """
+
+    logs_inserted = pyqtSignal(list)
+    logs_updated = pyqtSignal(list)
+    logs_deleted = pyqtSignal(list)
+    external_change = pyqtSignal()  # Another process wrote; ids unknown
+    changed = pyqtSignal(str, list)  # Every change, including settings
+
+    EXTERNAL_POLL_MS = 2000
+
+    _received = pyqtSignal(str, list)
+
+    def __init__(self, db: LogDatabase, parent=None):
+        super().__init__(parent)
+        self.pool = db.pool
+        # Listeners run on the writing thread; the queued hop moves the
+        # event to this object's thread before anything else sees it
+        self._received.connect(self.dispatch, Qt.ConnectionType.QueuedConnection)
+        self.pool.add_listener(self.on_database_changed)
+
+        self.pool.check_external_change()  # Record the starting point
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self.poll_timer.timeout.connect(self.pool.check_external_change)
+        self.poll_timer.start(self.EXTERNAL_POLL_MS)
+
+    def on_database_changed(self, action: str, log_ids: List[int]):
+        """Connection pool listener, called on the thread that wrote"""
+        self._received.emit(action, log_ids)
+
+    @pyqtSlot(str, list)
+    def dispatch(self, action, log_ids):
+        """Re-emit a change as the matching signal"""
+        if action == 'insert':
+            self.logs_inserted.emit(log_ids)
+        elif action == 'update':
+            self.logs_updated.emit(log_ids)
+        elif action == 'delete':
+            self.logs_deleted.emit(log_ids)
+        elif action == 'external':
+            self.external_change.emit()
+        self.changed.emit(action, log_ids)
+
+    def close(self):
+        """Stop watching the database"""
+        self.poll_timer.stop()
+        self.pool.remove_listener(self.on_database_changed)
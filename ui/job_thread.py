@@ -0,0 +1,38 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from core.connection import ConnectionPool
+
+
+class JobThread(QThread):
+    """
+    Runs a long job (export, backup, ...) off the GUI thread.
+    The job is called as job(progress, cancelled): progress(done, total)
+    reports back through the progress signal and cancelled() turns True
+    once cancel() has been called.
+    """
+
+    progress = pyqtSignal(int, int)
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.cancel_requested = False
+
+    def run(self):
+        try:
+            result = self.job(self.progress.emit, self.is_cancelled)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.succeeded.emit(result)
+        finally:
+            # The thread is gone after this, so are its pooled connections
+            ConnectionPool.close_thread_connection_all()
+
+    def cancel(self):
+        """Ask the job to stop at its next check"""
+        self.cancel_requested = True
+
+    def is_cancelled(self):
+        return self.cancel_requested
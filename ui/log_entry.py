@@ -5,24 +5,54 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 from datetime import datetime
 from core.stardate import StardateCalculator
-from core.database import LogDatabase
+from core.database import LogDatabase, LogConflictError
 
 
 class LogEntryDialog(QDialog):
     log_saved = pyqtSignal(dict)  # Signal emitted when a log is saved
+    # Emitted from the write queue's thread when a queued save finishes
+    write_finished = pyqtSignal(dict, object)
     
-    def __init__(self, parent=None, log_data=None):
+    def __init__(self, parent=None, log_data=None, db=None, write_queue=None):
         super().__init__(parent)
         self.log_data = log_data  # For editing existing logs
-        self.db = LogDatabase()
+        self.db = db if db is not None else LogDatabase()
+        self.write_queue = write_queue
+        self.load_error = None
+        self.saving = False  # A queued save hasn't committed yet
         self.init_ui()
         self.setup_connections()
         
         if log_data:
+            if 'id' in log_data:
+                # Saving would write back whatever the editor shows, so the
+                # body is re-read strictly: one that can't be decrypted or
+                # decompressed must never reach it as a placeholder
+                log_data = dict(log_data)
+                try:
+                    log_data['content'] = self.db.get_log_content(log_data['id'], strict=True) or ''
+                except Exception as e:
+                    self.load_error = str(e) or type(e).__name__
+                    log_data['content'] = ''
+                self.log_data = log_data
             self.populate_fields(log_data)
         else:
             self.update_stardate()
     
+    def exec(self):
+        """Show the dialog, unless the log being edited couldn't be read"""
+        if self.load_error is not None:
+            QMessageBox.warning(self, "Cannot Edit Log",
+                                f"This log's content cannot be read (e.g. it was encrypted with "
+                                f"another key), so it can't be edited.\n\n{self.load_error}")
+            return QDialog.DialogCode.Rejected
+        return super().exec()
+    
+    def reject(self):
+        """Stay open until a queued save has finished"""
+        if not self.saving:
+            super().reject()
+    
     def init_ui(self):
         self.setWindowTitle("UEE Navy Log Entry")
         self.setModal(True)
@@ -68,13 +98,18 @@ class LogEntryDialog(QDialog):
         self.content_edit = QTextEdit()
         form_layout.addRow("\uf27a  Log Entry:", self.content_edit)  # FontAwesome sticky-note icon
 
-        self.status_combo = QComboBox()
-        self.status_combo.addItems(["Routine", "Alert", "Critical"])
-        form_layout.addRow("\uf0e7  Status:", self.status_combo)  # FontAwesome bolt icon
+        self.log_type_combo = QComboBox()
+        self.populate_log_types()
+        form_layout.addRow("\uf02b  Log Type:", self.log_type_combo)  # FontAwesome tag icon
+
+        self.priority_combo = QComboBox()
+        self.priority_combo.addItems(["1 - Routine", "2 - Normal", "3 - Elevated", "4 - High", "5 - Critical"])
+        self.priority_combo.setCurrentIndex(1)
+        form_layout.addRow("\uf005  Priority:", self.priority_combo)  # FontAwesome star icon
 
-        self.priority_spin = QSpinBox()
-        self.priority_spin.setRange(1, 5)
-        form_layout.addRow("\uf005  Priority:", self.priority_spin)  # FontAwesome star icon
+        self.classification_combo = QComboBox()
+        self.classification_combo.addItems(['UNCLASSIFIED', 'CLASSIFIED', 'TOP_SECRET'])
+        form_layout.addRow("\uf023  Classification:", self.classification_combo)  # FontAwesome lock icon
 
         card_layout.addWidget(form_group)
 
@@ -86,7 +121,11 @@ class LogEntryDialog(QDialog):
         self.cancel_btn = QPushButton("\uf00d  Cancel")  # FontAwesome times icon
         self.cancel_btn.setProperty("class", "icon-btn")
         self.cancel_btn.setObjectName("fa")
+        self.clear_button = QPushButton("\uf12d  Clear")  # FontAwesome eraser icon
+        self.clear_button.setProperty("class", "icon-btn")
+        self.clear_button.setObjectName("fa")
         btn_layout.addWidget(self.save_btn)
+        btn_layout.addWidget(self.clear_button)
         btn_layout.addWidget(self.cancel_btn)
         card_layout.addLayout(btn_layout)
 
@@ -106,6 +145,7 @@ class LogEntryDialog(QDialog):
     def setup_connections(self):
         """Setup signal connections"""
         self.save_btn.clicked.connect(self.save_log)
+        self.write_finished.connect(self.on_write_finished)
         self.cancel_btn.clicked.connect(self.reject)
         self.clear_button.clicked.connect(self.clear_form)
         self.classification_combo.currentTextChanged.connect(self.on_classification_changed)
@@ -185,42 +225,73 @@ class LogEntryDialog(QDialog):
             return
         
         try:
-            # Get current stardate and earth date
-            stardate_info = StardateCalculator.get_stardate_info()
-            
-            # Prepare log data
-            log_data = {
-                'stardate': stardate_info['stardate'],
-                'earth_date': stardate_info['earth_date'],
-                'log_type': self.log_type_combo.currentText(),
-                'priority': self.priority_combo.currentIndex() + 1,
-                'classification': self.classification_combo.currentText(),
-                'title': self.title_edit.text().strip(),
-                'content': self.content_edit.toPlainText().strip()
-            }
-            
-            # Save to database
-            log_id = self.db.create_log_entry(**log_data)
-            log_data['id'] = log_id
-            
-            # Show success message
-            self.status_label.setText(f"✅ Log entry saved successfully (ID: {log_id})")
-            self.status_label.setStyleSheet("color: #00ff00; font-weight: bold;")
-            
-            # Emit signal
-            self.log_saved.emit(log_data)
+            if self.log_data:
+                # Edits keep the entry's original SET and change the row in place
+                log_data = dict(self.log_data)
+                changes = {
+                    'log_type': self.log_type_combo.currentText(),
+                    'priority': self.priority_combo.currentIndex() + 1,
+                    'classification': self.classification_combo.currentText(),
+                    'title': self.title_edit.text().strip(),
+                    'content': self.content_edit.toPlainText().strip()
+                }
+                try:
+                    log_data['version'] = self.db.update_log(log_data['id'], log_data.get('version'), **changes)
+                except LogConflictError as e:
+                    QMessageBox.warning(self, "Edit Conflict",
+                                        f"{e}.\n\nReopen the log to edit its current version.")
+                    return
+                log_data.update(changes)
+                log_id = log_data['id']
+            else:
+                log_data = self.get_log_data()
+                if self.write_queue is not None:
+                    # Finished in on_write_finished, so the window stays
+                    # responsive while the write queue commits
+                    future = self.write_queue.submit(**log_data)
+                    self.saving = True
+                    self.save_btn.setEnabled(False)
+                    self.status_label.setText("Saving log entry...")
+                    future.add_done_callback(lambda future: self.write_finished.emit(log_data, future))
+                    return
+                log_id = self.db.create_log_entry(**log_data)
+                log_data['id'] = log_id
             
-            # Close dialog after a brief pause
-            self.save_btn.setText("Saved!")
-            self.save_btn.setEnabled(False)
-
-            # Auto-close after 2 seconds or allow manual close
-            from PyQt6.QtCore import QTimer
-            QTimer.singleShot(2000, self.accept)
+            self.show_saved(log_data, log_id)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save log entry:\n{str(e)}")
     
+    def on_write_finished(self, log_data, future):
+        """Finish a save handed to the write queue"""
+        self.saving = False
+        try:
+            log_id = future.result()
+        except Exception as e:
+            self.save_btn.setEnabled(True)
+            self.on_classification_changed(self.classification_combo.currentText())
+            QMessageBox.critical(self, "Error", f"Failed to save log entry:\n{str(e)}")
+            return
+        log_data['id'] = log_id
+        self.show_saved(log_data, log_id)
+    
+    def show_saved(self, log_data, log_id):
+        """Report a saved log and close the dialog shortly after"""
+        # Show success message
+        self.status_label.setText(f"✅ Log entry saved successfully (ID: {log_id})")
+        self.status_label.setStyleSheet("color: #00ff00; font-weight: bold;")
+        
+        # Emit signal
+        self.log_saved.emit(log_data)
+        
+        # Close dialog after a brief pause
+        self.save_btn.setText("Saved!")
+        self.save_btn.setEnabled(False)
+
+        # Auto-close after 2 seconds or allow manual close
+        from PyQt6.QtCore import QTimer
+        QTimer.singleShot(2000, self.accept)
+    
     def get_log_data(self):
         """Return current form data as dictionary"""
         stardate_info = StardateCalculator.get_stardate_info()
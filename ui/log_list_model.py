@@ -0,0 +1,234 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QApplication
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QPalette
+
+
+def format_log_text(log):
+    """Multi-line list text for a log entry"""
+    priority_indicator = "🔴" if log['priority'] >= 4 else "🟡" if log['priority'] >= 3 else "🟢"
+    classification_indicator = "🔒" if log['classification'] != 'UNCLASSIFIED' else ""
+
+    display_text = f"{priority_indicator} {classification_indicator}\n"
+    display_text += f"SET {log['stardate']} | {log['log_type']}\n"
+    display_text += f"{log['title']}\n"
+    display_text += f"Earth Date: {log['earth_date']}"
+    return display_text
+
+
+def format_log_tooltip(log):
+    """Tooltip text with the full details of a log entry"""
+    tooltip = f"Priority: {log['priority']}\n"
+    tooltip += f"Classification: {log['classification']}\n"
+    tooltip += f"Created: {log.get('created_at', '')}\n"
+    tooltip += f"ID: {log['id']}"
+    return tooltip
+
+
+class LogListModel(QAbstractListModel):
+    """
+    List model over log dicts, newest first.
+    Rows are pulled from a page source in batches through canFetchMore/
+    fetchMore, and display text is only built when a row is painted.
+    With an executor, pages load in the background and are appended when
+    they arrive.
+    """
+
+    LogRole = Qt.ItemDataRole.UserRole + 1
+
+    page_loaded = pyqtSignal()
+    page_failed = pyqtSignal(str)
+
+    def __init__(self, parent=None, executor=None):
+        super().__init__(parent)
+        self.executor = executor
+        self.task_key = f"log_model.page.{id(self)}"
+        self.logs = []
+        self.fetch_page = None
+        self.page_cursor = None
+        self.has_more = False
+        self.loading = False
+        self.paused = False
+
+    def set_source(self, fetch_page):
+        """
+        Replace the rows with a new page source.
+        fetch_page(cursor) returns (logs, next_cursor), with next_cursor
+        None after the last page.
+        """
+        if self.executor is not None:
+            self.executor.cancel(self.task_key)
+
+        self.beginResetModel()
+        self.logs = []
+        self.fetch_page = fetch_page
+        self.page_cursor = None
+        self.has_more = fetch_page is not None
+        self.loading = False
+        self.paused = False
+        self.endResetModel()
+
+    def set_logs(self, logs):
+        """Replace the rows with a fixed list that has no further pages"""
+        self.set_source(None)
+        if logs:
+            self.beginInsertRows(QModelIndex(), 0, len(logs) - 1)
+            self.logs = list(logs)
+            self.endInsertRows()
+
+    def cancel_loading(self):
+        """Stop fetching pages from the current source until it is replaced"""
+        if self.executor is not None:
+            self.executor.cancel(self.task_key)
+        self.loading = False
+        self.paused = True
+
+    @property
+    def complete(self):
+        """Whether every row of the current source has been loaded"""
+        return not self.has_more and not self.loading
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.logs)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.logs):
+            return None
+
+        log = self.logs[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_log_text(log)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return format_log_tooltip(log)
+        if role == self.LogRole:
+            return log
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.has_more and not self.loading and not self.paused
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+
+        fetch_page = self.fetch_page
+        cursor = self.page_cursor
+        if self.executor is None:
+            try:
+                result = fetch_page(cursor)
+            except Exception as e:
+                self.on_page_failed(str(e))
+                return
+            self.on_page_loaded(result)
+            return
+
+        self.loading = True
+        self.executor.submit(self.task_key, lambda: fetch_page(cursor),
+                             self.on_page_loaded, self.on_page_failed)
+
+    def on_page_loaded(self, result):
+        """Append a page delivered by the page source"""
+        logs, self.page_cursor = result
+        self.loading = False
+        self.has_more = self.page_cursor is not None
+
+        if logs:
+            first = len(self.logs)
+            self.beginInsertRows(QModelIndex(), first, first + len(logs) - 1)
+            self.logs.extend(logs)
+            self.endInsertRows()
+        self.page_loaded.emit()
+
+    def on_page_failed(self, message):
+        """Stop paging after an error so it isn't retried on every repaint"""
+        self.loading = False
+        self.has_more = False
+        self.page_failed.emit(message)
+
+    def log_at(self, row):
+        """Get the log dict shown at a row"""
+        return self.logs[row]
+
+    def row_of(self, log_id):
+        """Get the row showing a log id, or -1 if it isn't loaded"""
+        for row, log in enumerate(self.logs):
+            if log['id'] == log_id:
+                return row
+        return -1
+
+    def insert_log(self, log):
+        """Insert a single log at its sorted position"""
+        if self.row_of(log['id']) >= 0:
+            return
+
+        key = (log['stardate_num'], log['id'])
+        row = len(self.logs)
+        for i, existing in enumerate(self.logs):
+            if (existing['stardate_num'], existing['id']) < key:
+                row = i
+                break
+
+        # Past the loaded rows it will arrive with a later page instead
+        if row == len(self.logs) and self.has_more:
+            return
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.logs.insert(row, log)
+        self.endInsertRows()
+
+    def remove_log(self, log_id):
+        """Remove a single log's row if it is loaded"""
+        row = self.row_of(log_id)
+        if row < 0:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.logs[row]
+        self.endRemoveRows()
+
+
+class LogItemDelegate(QStyledItemDelegate):
+    """Paints log rows with a priority stripe and fixed-height multi-line text"""
+
+    TEXT_LINES = 4
+    PADDING = 4
+    STRIPE_WIDTH = 4
+
+    PRIORITY_COLORS = {
+        5: QColor(255, 0, 0),
+        4: QColor(255, 128, 0),
+        3: QColor(255, 215, 0)
+    }
+    DEFAULT_PRIORITY_COLOR = QColor(0, 255, 0)
+
+    def paint(self, painter, option, index):
+        log = index.data(LogListModel.LogRole)
+        if log is None:
+            return
+
+        self.initStyleOption(option, index)
+        option.text = ""
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+
+        # Background, alternating rows and selection from the current style
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, widget)
+
+        painter.save()
+        stripe = QRect(option.rect.left(), option.rect.top(), self.STRIPE_WIDTH, option.rect.height())
+        painter.fillRect(stripe, self.PRIORITY_COLORS.get(log['priority'], self.DEFAULT_PRIORITY_COLOR))
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(option.palette.color(QPalette.ColorRole.HighlightedText))
+        else:
+            painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+
+        text_rect = option.rect.adjusted(self.STRIPE_WIDTH + 2 * self.PADDING, self.PADDING,
+                                         -self.PADDING, -self.PADDING)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                         format_log_text(log))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        # Every row has the same height, so the view can use uniform sizes
+        return QSize(option.rect.width(),
+                     option.fontMetrics.lineSpacing() * self.TEXT_LINES + 2 * self.PADDING)
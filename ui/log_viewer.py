@@ -1,42 +1,14 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget,
-                             QListWidgetItem, QTextEdit, QLineEdit, QPushButton,
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView,
+                             QTextEdit, QLineEdit, QPushButton,
                              QComboBox, QLabel, QGroupBox, QSplitter, QMessageBox)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QModelIndex, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QTextCharFormat, QColor
 from datetime import datetime
 from core.database import LogDatabase
+from core.query import LogQuery, is_search_refinement, matches_search
 from core.stardate import StardateCalculator
-
-
-class LogListItem(QListWidgetItem):
-    """Custom list item for displaying log entries"""
-    
-    def __init__(self, log_data):
-        super().__init__()
-        self.log_data = log_data
-        self.update_display()
-    
-    def update_display(self):
-        """Update the display text for this item"""
-        log = self.log_data
-        
-        # Format the display text
-        priority_indicator = "🔴" if log['priority'] >= 4 else "🟡" if log['priority'] >= 3 else "🟢"
-        classification_indicator = "🔒" if log['classification'] != 'UNCLASSIFIED' else ""
-        
-        display_text = f"{priority_indicator} {classification_indicator}\n"
-        display_text += f"SET {log['stardate']} | {log['log_type']}\n"
-        display_text += f"{log['title']}\n"
-        display_text += f"Earth Date: {log['earth_date']}"
-        
-        self.setText(display_text)
-        
-        # Set tooltip with full info
-        tooltip = f"Priority: {log['priority']}\n"
-        tooltip += f"Classification: {log['classification']}\n"
-        tooltip += f"Created: {log['created_at']}\n"
-        tooltip += f"ID: {log['id']}"
-        self.setToolTip(tooltip)
+from ui.log_list_model import LogListModel, LogItemDelegate
+from ui.query_executor import QueryExecutor
 
 
 class LogViewer(QWidget):
@@ -45,14 +17,22 @@ class LogViewer(QWidget):
     log_selected = pyqtSignal(dict)
     edit_requested = pyqtSignal(dict)
     
-    def __init__(self, parent=None):
+    PAGE_SIZE = 100
+    SEARCH_DEBOUNCE_MS = 250
+    ADD_LOGS_LIMIT = 20  # Bigger inserts (imports) reload the list instead
+    
+    def __init__(self, parent=None, db=None, executor=None, change_bus=None):
         super().__init__(parent)
-        self.db = LogDatabase()
-        self.current_logs = []
+        self.db = db if db is not None else LogDatabase()
+        self.executor = executor if executor is not None else QueryExecutor(self)
+        self.change_bus = change_bus
+        self.log_model = LogListModel(self, self.executor)
         self.selected_log = None
+        self.current_query = LogQuery()
+        self.status_format = "Loaded {count} log entries"
         self.init_ui()
         self.setup_connections()
-        self.load_logs()
+        # The owner calls load_logs(), so startup can paint the window first
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -76,6 +56,11 @@ class LogViewer(QWidget):
         self.search_edit.setPlaceholderText("Search logs by title or content...")
         search_layout.addWidget(self.search_edit)
         
+        # Live search runs once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        
         self.search_button = QPushButton("Search")
         search_layout.addWidget(self.search_button)
         
@@ -124,7 +109,10 @@ class LogViewer(QWidget):
         list_header.setProperty("class", "stardate")
         list_layout.addWidget(list_header)
         
-        self.log_list = QListWidget()
+        self.log_list = QListView()
+        self.log_list.setModel(self.log_model)
+        self.log_list.setItemDelegate(LogItemDelegate(self.log_list))
+        self.log_list.setUniformItemSizes(True)
         self.log_list.setAlternatingRowColors(True)
         list_layout.addWidget(self.log_list)
         
@@ -184,30 +172,61 @@ class LogViewer(QWidget):
         self.search_button.clicked.connect(self.search_logs)
         self.clear_search_button.clicked.connect(self.clear_search)
         self.search_edit.returnPressed.connect(self.search_logs)
+        self.search_edit.textChanged.connect(self.on_search_text_changed)
+        self.search_timer.timeout.connect(self.search_logs)
         self.type_filter_combo.currentTextChanged.connect(self.filter_logs)
         self.priority_filter_combo.currentTextChanged.connect(self.filter_logs)
         self.refresh_button.clicked.connect(self.load_logs)
-        self.log_list.itemClicked.connect(self.on_log_selected)
+        self.log_list.clicked.connect(self.on_log_selected)
+        self.log_model.page_loaded.connect(self.update_status)
+        self.log_model.page_failed.connect(self.on_page_failed)
+        self.log_model.rowsRemoved.connect(self.update_status)
         self.edit_button.clicked.connect(self.edit_selected_log)
         self.delete_button.clicked.connect(self.delete_selected_log)
+        
+        # Follow database changes instead of polling for them
+        if self.change_bus is not None:
+            self.change_bus.logs_inserted.connect(self.add_logs)
+            self.change_bus.logs_deleted.connect(self.remove_logs)
+            self.change_bus.logs_updated.connect(self.update_logs)
+            self.change_bus.external_change.connect(self.reload_current_query)
     
     def load_logs(self):
         """Load logs from database"""
-        try:
-            self.current_logs = self.db.get_logs(limit=100)
-            self.update_log_list()
-            self.status_label.setText(f"Loaded {len(self.current_logs)} log entries")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load logs:\n{str(e)}")
-            self.status_label.setText("Error loading logs")
+        self.run_query(LogQuery(), "Loaded {count} log entries")
     
-    def update_log_list(self):
-        """Update the log list display"""
-        self.log_list.clear()
+    def run_query(self, query, status_format):
+        """
+        Reset the list to show the logs matching a LogQuery.
+        Pages load in the background; the list view asks the model for
+        more as the user scrolls.
+        """
+        self.current_query = query
+        self.status_format = status_format
+        # Searches keep each row's indexed text so a longer term can be
+        # applied to these results without another query
+        include_search_text = query.search is not None
+        self.log_model.set_source(lambda cursor: self.db.query_logs(
+            query, self.PAGE_SIZE, cursor, include_search_text=include_search_text))
+        self.update_log_list()
         
-        for log in self.current_logs:
-            item = LogListItem(log)
-            self.log_list.addItem(item)
+        self.status_label.setText("Loading logs...")
+        self.log_model.fetchMore(QModelIndex())
+    
+    def on_page_failed(self, message):
+        """Report a page that failed to load"""
+        QMessageBox.critical(self, "Error", f"Failed to load logs:\n{message}")
+        self.status_label.setText("Error loading logs")
+    
+    def update_status(self):
+        """Show how many logs are loaded"""
+        count = f"{self.log_model.rowCount()}{'+' if self.log_model.has_more else ''}"
+        self.status_label.setText(self.status_format.format(count=count))
+    
+    def update_log_list(self):
+        """Reset selection state after the list contents were replaced"""
+        self.selected_log = None
+        self.executor.cancel('viewer.content')
         
         # Update button states
         self.edit_button.setEnabled(False)
@@ -217,60 +236,81 @@ class LogViewer(QWidget):
         self.content_display.clear()
         self.details_label.setText("Select a log entry to view details")
     
+    def build_query(self):
+        """Build a LogQuery from the search and filter widgets"""
+        priority_text = self.priority_filter_combo.currentText()
+        priority = None
+        min_priority = None
+        if priority_text == "Priority 5 Only":
+            priority = 5
+        elif priority_text != "All Priorities":
+            min_priority = int(priority_text.split()[1].replace('+', ''))
+        
+        return LogQuery(
+            log_type=self.type_filter_combo.currentData(),
+            priority=priority,
+            min_priority=min_priority,
+            search=self.search_edit.text(),
+            order=LogQuery.ORDER_RELEVANCE
+        )
+    
+    def on_search_text_changed(self):
+        """Restart the live search delay and drop the now outdated query"""
+        self.log_model.cancel_loading()
+        self.search_timer.start()
+    
     def search_logs(self):
         """Search logs based on search term"""
-        search_term = self.search_edit.text().strip()
+        self.search_timer.stop()
+        query = self.build_query()
+        
+        if not query.search:
+            self.filter_logs()
+            return
         
-        if not search_term:
-            self.load_logs()
+        if self.refine_search(query):
             return
         
-        try:
-            self.current_logs = self.db.search_logs(search_term)
-            self.update_log_list()
-            self.status_label.setText(f"Found {len(self.current_logs)} matching logs")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Search failed:\n{str(e)}")
+        self.run_query(query, "Found {count} matching logs")
+    
+    def refine_search(self, query):
+        """
+        Narrow the loaded results in memory when the search term only grew.
+        Only done when every result of the previous search is loaded, so
+        nothing outside the list could match the longer term.
+        """
+        previous = self.current_query
+        if not (previous.search and query.same_filters(previous)
+                and is_search_refinement(previous.search, query.search)
+                and self.log_model.complete
+                and all('search_text' in log for log in self.log_model.logs)):
+            return False
+        
+        logs = [log for log in self.log_model.logs
+                if matches_search(query.search, log['search_text'] or '')]
+        self.current_query = query
+        self.status_format = "Found {count} matching logs"
+        self.log_model.set_logs(logs)
+        self.update_log_list()
+        self.update_status()
+        return True
     
     def clear_search(self):
         """Clear search and reload all logs"""
         self.search_edit.clear()
+        self.search_timer.stop()
         self.type_filter_combo.setCurrentIndex(0)
         self.priority_filter_combo.setCurrentIndex(0)
         self.load_logs()
     
     def filter_logs(self):
         """Filter logs based on selected criteria"""
-        # Get filter criteria
-        type_filter = self.type_filter_combo.currentData()
-        priority_text = self.priority_filter_combo.currentText()
-        
-        # Start with all logs or search results
-        if self.search_edit.text().strip():
-            filtered_logs = self.db.search_logs(self.search_edit.text().strip())
-        else:
-            filtered_logs = self.db.get_logs(limit=100)
-        
-        # Apply type filter
-        if type_filter:
-            filtered_logs = [log for log in filtered_logs if log['log_type'] == type_filter]
-        
-        # Apply priority filter
-        if priority_text != "All Priorities":
-            if priority_text == "Priority 5 Only":
-                filtered_logs = [log for log in filtered_logs if log['priority'] == 5]
-            else:
-                min_priority = int(priority_text.split()[1].replace('+', ''))
-                filtered_logs = [log for log in filtered_logs if log['priority'] >= min_priority]
-        
-        self.current_logs = filtered_logs
-        self.update_log_list()
-        self.status_label.setText(f"Filtered to {len(self.current_logs)} logs")
+        self.run_query(self.build_query(), "Filtered to {count} logs")
     
-    def on_log_selected(self, item):
+    def on_log_selected(self, index):
         """Handle log selection"""
-        if isinstance(item, LogListItem):
-            self.selected_log = item.log_data
+        if index.isValid():
+            self.selected_log = self.log_model.log_at(index.row())
             self.display_log_content(self.selected_log)
             self.edit_button.setEnabled(True)
             self.delete_button.setEnabled(True)
@@ -283,31 +323,63 @@ class LogViewer(QWidget):
         details += f"Priority {log_data['priority']} | {log_data['classification']}"
         self.details_label.setText(details)
         
-        # Format and display content
+        # Apply formatting based on classification
+        if log_data['classification'] == 'TOP_SECRET':
+            self.content_display.setStyleSheet("background-color: #2a0000; color: #ff0000;")
+        elif log_data['classification'] == 'CLASSIFIED':
+            self.content_display.setStyleSheet("background-color: #2a2a00; color: #ffff00;")
+        else:
+            self.content_display.setStyleSheet("")
+        
+        if log_data.get('content') is not None:
+            self.show_log_text(log_data, log_data['content'])
+            return
+        
+        # List rows carry no body; fetch (and decrypt) only the one shown,
+        # dropping the result if another log was selected meanwhile
+        self.show_log_text(log_data, "Retrieving log content...")
+        log_id = log_data['id']
+        self.executor.submit(
+            'viewer.content',
+            lambda: self.db.get_log_content(log_id),
+            lambda body: self.show_log_text(log_data, body or ''),
+            lambda message: self.show_log_text(log_data, f"[ERROR RETRIEVING CONTENT: {message}]")
+        )
+    
+    def show_log_text(self, log_data, body):
+        """Format a log and its body into the content display"""
         content = f"TITLE: {log_data['title']}\n"
         content += f"SET: {log_data['stardate']}\n"
         content += f"EARTH DATE: {log_data['earth_date']}\n"
         content += f"LOG TYPE: {log_data['log_type']}\n"
         content += f"PRIORITY: {log_data['priority']}\n"
         content += f"CLASSIFICATION: {log_data['classification']}\n"
-        content += f"CREATED: {log_data['created_at']}\n"
+        content += f"CREATED: {log_data.get('created_at', '')}\n"
         content += "\n" + "="*50 + "\n\n"
-        content += log_data['content']
+        content += body
         
         self.content_display.setPlainText(content)
-        
-        # Apply formatting based on classification
-        if log_data['classification'] == 'TOP_SECRET':
-            self.content_display.setStyleSheet("background-color: #2a0000; color: #ff0000;")
-        elif log_data['classification'] == 'CLASSIFIED':
-            self.content_display.setStyleSheet("background-color: #2a2a00; color: #ffff00;")
-        else:
-            self.content_display.setStyleSheet("")
     
     def edit_selected_log(self):
         """Edit the selected log"""
-        if self.selected_log:
-            self.edit_requested.emit(self.selected_log)
+        if not self.selected_log:
+            return
+        
+        log_data = dict(self.selected_log)
+        if log_data.get('content') is not None:
+            self.edit_requested.emit(log_data)
+            return
+        
+        def on_content(body):
+            log_data['content'] = body or ''
+            self.edit_requested.emit(log_data)
+        
+        self.executor.submit(
+            'viewer.edit',
+            lambda: self.db.get_log_content(log_data['id']),
+            on_content,
+            lambda message: QMessageBox.critical(self, "Error", f"Failed to load log:\n{message}")
+        )
     
     def delete_selected_log(self):
         """Delete the selected log"""
@@ -326,16 +398,88 @@ class LogViewer(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                success = self.db.delete_log(self.selected_log['id'])
+            log_id = self.selected_log['id']
+            
+            def on_deleted(success):
                 if success:
+                    if self.change_bus is None:
+                        self.remove_logs([log_id])
                     self.status_label.setText("Log entry deleted successfully")
-                    self.load_logs()  # Refresh the list
                 else:
                     QMessageBox.warning(self, "Error", "Failed to delete log entry")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to delete log:\n{str(e)}")
+            
+            self.executor.submit(
+                f'viewer.delete.{log_id}',
+                lambda: self.db.delete_log(log_id),
+                on_deleted,
+                lambda message: QMessageBox.critical(self, "Error", f"Failed to delete log:\n{message}")
+            )
     
     def refresh_logs(self):
         """Refresh the log list"""
         self.load_logs()
+    
+    def reload_current_query(self):
+        """Re-run the current query, keeping the search and filters"""
+        self.run_query(self.current_query, self.status_format)
+    
+    def add_logs(self, log_ids):
+        """Show newly saved logs, reloading the list for large batches"""
+        if len(log_ids) > self.ADD_LOGS_LIMIT or self.current_query.search:
+            # Search matches and ranking need the index, so re-run the query
+            self.reload_current_query()
+            return
+        for log_id in log_ids:
+            self.add_log(log_id)
+    
+    def remove_logs(self, log_ids):
+        """Drop deleted logs from the list"""
+        for log_id in log_ids:
+            self.log_model.remove_log(log_id)
+            if self.selected_log and self.selected_log['id'] == log_id:
+                self.update_log_list()
+    
+    def update_logs(self, log_ids):
+        """Refresh edited logs in place, moving or dropping them as needed"""
+        if len(log_ids) > self.ADD_LOGS_LIMIT or self.current_query.search:
+            self.reload_current_query()
+            return
+        
+        query = self.current_query
+        for log_id in log_ids:
+            def on_log(log, log_id=log_id):
+                if query is not self.current_query:
+                    return
+                # Re-inserting puts the row back at its (possibly new) position
+                self.log_model.remove_log(log_id)
+                if log and query.matches(log):
+                    self.log_model.insert_log(log)
+                if self.selected_log and self.selected_log['id'] == log_id:
+                    if log and query.matches(log):
+                        self.selected_log = log
+                        self.log_list.setCurrentIndex(self.log_model.index(self.log_model.row_of(log_id)))
+                        self.display_log_content(log)
+                    else:
+                        self.update_log_list()
+            
+            self.executor.submit(f'viewer.update.{log_id}',
+                                 lambda log_id=log_id: self.db.get_log(log_id, include_content=False),
+                                 on_log)
+    
+    def add_log(self, log_id):
+        """Show a newly saved log without rebuilding the list"""
+        if self.current_query.search:
+            # Search matches and ranking need the index, so re-run the query
+            self.reload_current_query()
+            return
+        
+        query = self.current_query
+        
+        def on_log(log):
+            # Ignore it if the view moved on to a different query meanwhile
+            if log and query is self.current_query and query.matches(log):
+                self.log_model.insert_log(log)
+        
+        self.executor.submit(f'viewer.add.{log_id}',
+                             lambda: self.db.get_log(log_id, include_content=False),
+                             on_log)
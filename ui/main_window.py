@@ -1,47 +1,91 @@
 from PyQt6.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
                              QTabWidget, QPushButton, QLabel, QStatusBar,
                              QMenuBar, QMenu, QMessageBox, QGroupBox, QGridLayout,
-                             QProgressBar, QSystemTrayIcon)
+                             QProgressBar, QSystemTrayIcon, QFileDialog, QProgressDialog)
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, pyqtSlot
 from PyQt6.QtGui import QAction, QFont, QIcon, QPalette, QColor
 import sys
 import os
+import threading
+import time
 from datetime import datetime
 from core.database import LogDatabase
-from core.stardate import StardateCalculator, TimeUtils
-from ui.log_entry import LogEntryDialog
+from core.exporter import export_logs
+from core.stardate import StardateClock
+from core.templates import EMERGENCY_TEMPLATE, LOG_TEMPLATES
+from core.write_queue import WriteQueue, DEFAULT_DURABILITY, DURABILITY_LEVELS
 from ui.log_viewer import LogViewer
+from ui.query_executor import QueryExecutor
+from ui.job_thread import JobThread
+from ui.change_bus import ChangeBus
+
+# Dialogs and the backup module (which pulls in cryptography) are
+# imported where they are first used, to keep them off the startup path
 
 
 class StatusUpdateThread(QThread):
-    """Thread for updating status information without blocking UI"""
+    """
+    Thread for updating status information without blocking UI.
+    Wakes just after each interval boundary (every second by default, pass
+    60 when no seconds are shown) and emits only the stardate fields that
+    changed.
+    """
     status_updated = pyqtSignal(dict)
     
-    def __init__(self):
+    def __init__(self, interval=1):
         super().__init__()
-        self.running = True
+        self.interval = interval
+        self.clock = StardateClock()
+        self.stop_event = threading.Event()
     
     def run(self):
-        while self.running:
+        while not self.stop_event.is_set():
             try:
-                stardate_info = StardateCalculator.get_stardate_info()
-                self.status_updated.emit(stardate_info)
-                self.msleep(1000)  # Update every second
+                changed = self.clock.tick()
+                if changed:
+                    self.status_updated.emit(changed)
             except Exception as e:
                 print(f"Status update error: {e}")
-                self.msleep(5000)  # Wait longer on error
+                self.stop_event.wait(5)  # Wait longer on error
+                continue
+            
+            # Sleep to just past the next boundary instead of drifting
+            self.stop_event.wait(self.interval - time.time() % self.interval + 0.005)
     
     def stop(self):
-        self.running = False
+        self.stop_event.set()
         self.wait()
 
 
 class MainWindow(QMainWindow):
     """Main application window for Captain's Log"""
     
-    def __init__(self):
+    # Emitted once the window has been painted and the logs start loading
+    first_shown = pyqtSignal()
+    
+    EXPORT_FILTERS = {
+        "JSON Lines (*.jsonl)": 'jsonl',
+        "CSV (*.csv)": 'csv',
+        "Markdown Report (*.md)": 'markdown',
+        "HTML Report (*.html)": 'html'
+    }
+    
+    def __init__(self, db=None):
         super().__init__()
-        self.db = LogDatabase()
+        self.db = db if db is not None else LogDatabase()
+        self.initial_data_loaded = False
+        self.executor = QueryExecutor(self)
+        # New entries are committed in groups; see core.write_queue
+        durability = self.db.get_setting('write_durability', DEFAULT_DURABILITY)
+        if durability not in DURABILITY_LEVELS:
+            durability = DEFAULT_DURABILITY
+        self.write_queue = WriteQueue(self.db, durability=durability)
+        self.change_bus = ChangeBus(self.db, self)
+        self.displayed_stats = None
+        self.export_thread = None
+        self.backup_thread = None
+        self.backup_progress = None
+        self.reencrypt_thread = None
         self.status_thread = StatusUpdateThread()
         self.init_ui()
         self.setup_menu()
@@ -73,7 +117,7 @@ class MainWindow(QMainWindow):
         self.log_entry_dialog = None  # Will be created when needed
         
         # Log Viewer tab
-        self.log_viewer = LogViewer()
+        self.log_viewer = LogViewer(db=self.db, executor=self.executor, change_bus=self.change_bus)
         self.tab_widget.addTab(self.log_viewer, "📋 Log Archive")
         
         # Status Dashboard tab
@@ -166,6 +210,22 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(mission_group, 0, 1)
         
+        # Log Statistics
+        stats_group = QGroupBox("Log Statistics")
+        stats_layout = QVBoxLayout(stats_group)
+        
+        self.type_stats_label = QLabel("By Type: Calculating...")
+        self.type_stats_label.setWordWrap(True)
+        stats_layout.addWidget(self.type_stats_label)
+        
+        self.priority_stats_label = QLabel("By Priority: Calculating...")
+        stats_layout.addWidget(self.priority_stats_label)
+        
+        self.classification_stats_label = QLabel("By Classification: Calculating...")
+        stats_layout.addWidget(self.classification_stats_label)
+        
+        layout.addWidget(stats_group, 1, 0, 1, 2)
+        
         # Recent Activity
         activity_group = QGroupBox("Recent Activity")
         activity_layout = QVBoxLayout(activity_group)
@@ -174,7 +234,7 @@ class MainWindow(QMainWindow):
         self.activity_log.setWordWrap(True)
         activity_layout.addWidget(self.activity_log)
         
-        layout.addWidget(activity_group, 1, 0, 1, 2)
+        layout.addWidget(activity_group, 2, 0, 1, 2)
         
         return dashboard
     
@@ -250,6 +310,10 @@ class MainWindow(QMainWindow):
         backup_action.triggered.connect(self.backup_database)
         file_menu.addAction(backup_action)
         
+        reencrypt_action = QAction('Re-&encrypt Classified Logs...', self)
+        reencrypt_action.triggered.connect(self.reencrypt_logs)
+        file_menu.addAction(reencrypt_action)
+        
         file_menu.addSeparator()
         
         exit_action = QAction('E&xit', self)
@@ -288,6 +352,7 @@ class MainWindow(QMainWindow):
         self.new_log_button.clicked.connect(self.show_new_log_dialog)
         self.emergency_log_button.clicked.connect(self.create_emergency_log)
         self.status_thread.status_updated.connect(self.update_status_displays)
+        self.change_bus.changed.connect(self.on_database_changed)
         
         # Connect log viewer signals
         self.log_viewer.log_selected.connect(self.on_log_selected)
@@ -295,30 +360,86 @@ class MainWindow(QMainWindow):
     
     def start_status_updates(self):
         """Start the status update thread"""
+        # Session uptime is refreshed on the status thread's ticks
+        self.session_start_time = datetime.now()
         self.status_thread.start()
         
-        # Also set up a timer for session uptime
-        self.session_start_time = datetime.now()
-        self.uptime_timer = QTimer()
-        self.uptime_timer.timeout.connect(self.update_uptime)
-        self.uptime_timer.start(1000)  # Update every second
+        # Housekeeping timers don't need to be precise, so let Qt batch
+        # their wakeups with others
+        
+        # Drop decrypted log bodies nobody has looked at for a while
+        self.cache_expiry_timer = QTimer()
+        self.cache_expiry_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self.cache_expiry_timer.timeout.connect(self.db.content_cache.expire_idle)
+        self.cache_expiry_timer.start(30000)
+        
+        # Scheduled backups, when enabled in the backup options
+        self.backup_timer = QTimer()
+        self.backup_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self.backup_timer.timeout.connect(self.check_scheduled_backup)
+        self.backup_timer.start(60000)
+    
+    def showEvent(self, a0):
+        """Load the logs and statistics once the window is on screen"""
+        super().showEvent(a0)
+        if not self.initial_data_loaded:
+            self.initial_data_loaded = True
+            # Queued so the first paint isn't held up by the queries
+            QTimer.singleShot(0, self.load_initial_data)
+    
+    def load_initial_data(self):
+        """Start the first log page and statistics queries"""
+        self.log_viewer.load_logs()
+        # After this, statistics are recounted when the change bus reports a write
+        self.refresh_statistics()
+        self.first_shown.emit()
     
     @pyqtSlot(dict)
-    def update_status_displays(self, stardate_info):
-        """Update status displays with current information"""
-        self.stardate_display.setText(stardate_info['formatted_stardate'])
-        self.earth_time_display.setText(f"Earth Time: {stardate_info['earth_date']}")
-        
-        # Update log count
-        try:
-            logs = self.db.get_logs(limit=1)  # Just to check connection
-            total_logs = len(self.db.get_logs(limit=1000))  # Get a reasonable count
-            self.log_count_label.setText(f"Total Logs: {total_logs}")
-            self.database_status_label.setText("Database: Connected ✅")
-            self.connection_status.setText("🟢 Connected")
-        except Exception as e:
-            self.database_status_label.setText("Database: Error ❌")
-            self.connection_status.setText("🔴 Error")
+    def update_status_displays(self, changed):
+        """Update status displays with the stardate fields that changed"""
+        if 'formatted_stardate' in changed:
+            self.stardate_display.setText(changed['formatted_stardate'])
+        if 'earth_date' in changed:
+            self.earth_time_display.setText(f"Earth Time: {changed['earth_date']}")
+        
+        self.update_uptime()
+    
+    def on_database_changed(self, action, log_ids):
+        """Recount the dashboard statistics after logs changed"""
+        if action != 'settings':
+            self.refresh_statistics()
+    
+    def refresh_statistics(self):
+        """Update the log statistics displays if the database changed"""
+        if self.db.statistics_cached():
+            self.apply_statistics(self.db.get_log_statistics())
+        elif not self.executor.is_pending('dashboard.stats'):
+            # Recount in the background after a write
+            self.executor.submit('dashboard.stats', self.db.get_log_statistics,
+                                 self.apply_statistics, self.on_statistics_failed)
+    
+    def on_statistics_failed(self, message):
+        """Show that the statistics query failed"""
+        self.database_status_label.setText("Database: Error ❌")
+        self.connection_status.setText("🔴 Error")
+        self.displayed_stats = None
+    
+    def apply_statistics(self, stats):
+        """Show log statistics unless they are already displayed"""
+        if stats is self.displayed_stats:
+            return
+        self.displayed_stats = stats
+        
+        self.log_count_label.setText(f"Total Logs: {stats['total']}")
+        self.database_status_label.setText("Database: Connected ✅")
+        self.connection_status.setText("🟢 Connected")
+        
+        by_type = ", ".join(f"{name}: {count}" for name, count in sorted(stats['by_type'].items()))
+        self.type_stats_label.setText(f"By Type: {by_type or 'None'}")
+        by_priority = ", ".join(f"P{priority}: {count}" for priority, count in sorted(stats['by_priority'].items()))
+        self.priority_stats_label.setText(f"By Priority: {by_priority or 'None'}")
+        by_classification = ", ".join(f"{name}: {count}" for name, count in sorted(stats['by_classification'].items()))
+        self.classification_stats_label.setText(f"By Classification: {by_classification or 'None'}")
     
     def update_uptime(self):
         """Update session uptime display"""
@@ -328,15 +449,20 @@ class MainWindow(QMainWindow):
         uptime_str = f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
         self.uptime_label.setText(f"Session Uptime: {uptime_str}")
     
+    def create_log_dialog(self, log_data=None):
+        """Create a log entry dialog sharing this window's database"""
+        from ui.log_entry import LogEntryDialog
+        return LogEntryDialog(self, log_data, db=self.db, write_queue=self.write_queue)
+    
     def show_new_log_dialog(self):
         """Show the new log entry dialog"""
-        dialog = LogEntryDialog(self)
+        dialog = self.create_log_dialog()
         dialog.log_saved.connect(self.on_log_saved)
         dialog.exec()
     
     def create_template_log(self, log_type):
         """Create a new log with a template"""
-        dialog = LogEntryDialog(self)
+        dialog = self.create_log_dialog()
         # Set the log type
         for i in range(dialog.log_type_combo.count()):
             if dialog.log_type_combo.itemText(i) == log_type:
@@ -344,30 +470,20 @@ class MainWindow(QMainWindow):
                 break
         
         # Set template content based on type
-        templates = {
-            'MISSION_REPORT': "Mission Status Report:\n\nObjective: \nProgress: \nChallenges: \nNext Steps: \n\nRecommendations: ",
-            'PERSONAL_LOG': "Personal Log Entry:\n\nReflections on recent events...\n\n",
-            'SYSTEM_STATUS': "System Status Report:\n\nPrimary Systems: \nSecondary Systems: \nMaintenance Required: \n\nTechnical Notes: ",
-            'DIPLOMATIC_LOG': "Diplomatic Contact Report:\n\nSpecies/Entity: \nFirst Contact Protocol: \nCommunication Method: \nOutcome: \n\nCultural Notes: ",
-            'SCIENTIFIC_LOG': "Scientific Discovery Log:\n\nPhenomenon Observed: \nHypothesis: \nTesting Results: \nConclusions: \n\nFurther Research: ",
-            'SECURITY_ALERT': "Security Alert Report:\n\nThreat Level: \nNature of Threat: \nResponse Actions: \nResolution: \n\nRecommendations: ",
-            'MEDICAL_LOG': "Medical Log Entry:\n\nPatient/Crew Status: \nSymptoms/Condition: \nTreatment: \nPrognosis: \n\nMedical Notes: "
-        }
-        
-        if log_type in templates:
-            dialog.content_edit.setPlainText(templates[log_type])
+        if log_type in LOG_TEMPLATES:
+            dialog.content_edit.setPlainText(LOG_TEMPLATES[log_type])
         
         dialog.log_saved.connect(self.on_log_saved)
         dialog.exec()
     
     def create_emergency_log(self):
         """Create an emergency log entry"""
-        dialog = LogEntryDialog(self)
+        dialog = self.create_log_dialog()
         
         # Set emergency defaults
         dialog.priority_combo.setCurrentIndex(4)  # Critical priority
         dialog.title_edit.setText("EMERGENCY LOG")
-        dialog.content_edit.setPlainText("EMERGENCY SITUATION:\n\nNature of Emergency: \nImmediate Actions Taken: \nCurrent Status: \nAssistance Required: \n\nCommand Decision: ")
+        dialog.content_edit.setPlainText(EMERGENCY_TEMPLATE)
         
         # Set to mission report type
         for i in range(dialog.log_type_combo.count()):
@@ -381,29 +497,209 @@ class MainWindow(QMainWindow):
     def on_log_saved(self, log_data):
         """Handle when a log is saved"""
         self.status_bar.showMessage(f"Log entry saved: {log_data['title']}", 3000)
-        self.log_viewer.refresh_logs()
         
         # Update activity log
-        activity_text = f"New log created: {log_data['title']} (Stardate {log_data['stardate']:.2f})"
+        activity_text = f"New log created: {log_data['title']} (SET {log_data['stardate']})"
         self.activity_log.setText(activity_text)
     
+    def on_log_updated(self, log_data):
+        """Handle when an existing log is edited"""
+        self.status_bar.showMessage(f"Log entry updated: {log_data['title']}", 3000)
+        self.activity_log.setText(f"Log updated: {log_data['title']} (SET {log_data['stardate']})")
+    
     def on_log_selected(self, log_data):
         """Handle log selection"""
         self.status_bar.showMessage(f"Selected: {log_data['title']}")
     
     def edit_log(self, log_data):
         """Edit an existing log"""
-        dialog = LogEntryDialog(self, log_data)
-        dialog.log_saved.connect(self.on_log_saved)
+        dialog = self.create_log_dialog(log_data)
+        dialog.log_saved.connect(self.on_log_updated)
         dialog.exec()
     
     def export_logs(self):
-        """Export logs to file"""
-        QMessageBox.information(self, "Export", "Export functionality will be implemented in a future update.")
+        """Export the logs matching the viewer's filters to a file"""
+        if self.export_thread is not None:
+            return
+        
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Logs", "captains_log_export.jsonl", ";;".join(self.EXPORT_FILTERS)
+        )
+        if not path:
+            return
+        file_format = self.EXPORT_FILTERS.get(selected_filter, 'jsonl')
+        
+        reply = QMessageBox.question(
+            self, "Export Classified Content",
+            "Include decrypted content of CLASSIFIED and TOP SECRET logs?\n"
+            "If not, their content is left out of the export.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        decrypt = reply == QMessageBox.StandardButton.Yes
+        query = self.log_viewer.current_query
+        
+        self.export_progress = QProgressDialog("Exporting logs...", "Cancel", 0, 0, self)
+        self.export_progress.setWindowTitle("Export Logs")
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.setMinimumDuration(500)
+        
+        self.export_thread = JobThread(
+            lambda progress, cancelled: export_logs(self.db, path, file_format, query, decrypt,
+                                                    progress=progress, cancelled=cancelled),
+            self
+        )
+        self.export_thread.progress.connect(self.on_export_progress)
+        self.export_thread.succeeded.connect(lambda count: self.on_export_finished(count, path))
+        self.export_thread.failed.connect(self.on_export_failed)
+        self.export_progress.canceled.connect(self.export_thread.cancel)
+        self.export_thread.start()
+    
+    def on_export_progress(self, done, total):
+        """Show export progress"""
+        self.export_progress.setMaximum(total)
+        self.export_progress.setValue(done)
+        self.export_progress.setLabelText(f"Exporting logs... {done} of {total}")
+    
+    def on_export_finished(self, count, path):
+        """Report a completed export"""
+        self.finish_export()
+        self.status_bar.showMessage(f"Exported {count} logs to {path}", 5000)
+    
+    def on_export_failed(self, message):
+        """Report a cancelled or failed export"""
+        cancelled = self.export_thread.is_cancelled()
+        self.finish_export()
+        if cancelled:
+            self.status_bar.showMessage("Export cancelled", 5000)
+        else:
+            QMessageBox.warning(self, "Export Failed", f"Failed to export logs: {message}")
+    
+    def finish_export(self):
+        """Close the progress dialog and release the export thread"""
+        self.export_progress.close()
+        self.export_thread.wait()
+        self.export_thread = None
     
     def backup_database(self):
-        """Backup the database"""
-        QMessageBox.information(self, "Backup", "Database backup functionality will be implemented in a future update.")
+        """Show the backup options and optionally back up right away"""
+        from ui.backup_dialog import BackupDialog
+        dialog = BackupDialog(self.db, self)
+        if dialog.exec() and dialog.backup_now:
+            self.start_backup(show_progress=True)
+    
+    def check_scheduled_backup(self):
+        """Run a scheduled backup once its interval has passed"""
+        from core.backup import backup_due, load_backup_settings
+        if self.backup_thread is None and backup_due(load_backup_settings(self.db)):
+            self.start_backup(show_progress=False)
+    
+    def start_backup(self, show_progress):
+        """Back up the database on a background thread"""
+        if self.backup_thread is not None:
+            return
+        
+        from core.backup import backup_database, load_backup_settings
+        settings = load_backup_settings(self.db)
+        if show_progress:
+            self.backup_progress = QProgressDialog("Backing up database...", "Cancel", 0, 0, self)
+            self.backup_progress.setWindowTitle("Backup Database")
+            self.backup_progress.setWindowModality(Qt.WindowModality.WindowModal)
+            self.backup_progress.setMinimumDuration(500)
+        else:
+            self.status_bar.showMessage("Scheduled backup running...")
+        
+        self.backup_thread = JobThread(
+            lambda progress, cancelled: backup_database(self.db, settings['dir'], settings['compress'],
+                                                        settings['keep'], progress, cancelled),
+            self
+        )
+        self.backup_thread.progress.connect(self.on_backup_progress)
+        self.backup_thread.succeeded.connect(self.on_backup_finished)
+        self.backup_thread.failed.connect(self.on_backup_failed)
+        if self.backup_progress is not None:
+            self.backup_progress.canceled.connect(self.backup_thread.cancel)
+        self.backup_thread.start()
+    
+    def on_backup_progress(self, done, total):
+        """Show backup progress in pages copied"""
+        if self.backup_progress is not None:
+            self.backup_progress.setMaximum(total)
+            self.backup_progress.setValue(done)
+    
+    def on_backup_finished(self, path):
+        """Report a completed, verified backup"""
+        self.finish_backup()
+        self.status_bar.showMessage(f"Backup verified and saved to {path}", 5000)
+    
+    def on_backup_failed(self, message):
+        """Report a cancelled or failed backup"""
+        cancelled = self.backup_thread.is_cancelled()
+        interactive = self.backup_progress is not None
+        self.finish_backup()
+        if cancelled:
+            self.status_bar.showMessage("Backup cancelled", 5000)
+        elif interactive:
+            QMessageBox.warning(self, "Backup Failed", f"Failed to back up the database: {message}")
+        else:
+            self.status_bar.showMessage(f"Scheduled backup failed: {message}", 10000)
+    
+    def finish_backup(self):
+        """Close the progress dialog and release the backup thread"""
+        if self.backup_progress is not None:
+            self.backup_progress.close()
+            self.backup_progress = None
+        self.backup_thread.wait()
+        self.backup_thread = None
+    
+    def reencrypt_logs(self):
+        """Re-encrypt classified logs stored with an older scheme in the background"""
+        if self.reencrypt_thread is not None:
+            return
+        
+        pending = self.db.reencryption_pending()
+        scheme = self.db.encryption_scheme.upper()
+        if not pending:
+            QMessageBox.information(self, "Re-encrypt Classified Logs",
+                                    f"All classified logs are already encrypted with {scheme}.")
+            return
+        reply = QMessageBox.question(
+            self, "Re-encrypt Classified Logs",
+            f"{pending} classified logs use an older encryption scheme.\n"
+            f"Re-encrypt them with {scheme}? This runs in the background.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        self.reencrypt_thread = JobThread(
+            lambda progress, cancelled: self.db.reencrypt_logs(progress=progress, cancelled=cancelled),
+            self
+        )
+        self.reencrypt_thread.progress.connect(self.on_reencrypt_progress)
+        self.reencrypt_thread.succeeded.connect(self.on_reencrypt_finished)
+        self.reencrypt_thread.failed.connect(self.on_reencrypt_failed)
+        self.reencrypt_thread.start()
+    
+    def on_reencrypt_progress(self, done, total):
+        """Show re-encryption progress in the status bar"""
+        self.status_bar.showMessage(f"Re-encrypting classified logs... {done} of {total}")
+    
+    def on_reencrypt_finished(self, count):
+        """Report a completed re-encryption"""
+        self.finish_reencrypt()
+        self.status_bar.showMessage(f"Re-encrypted {count} classified logs", 5000)
+    
+    def on_reencrypt_failed(self, message):
+        """Report a failed re-encryption; batches already done are kept"""
+        self.finish_reencrypt()
+        QMessageBox.warning(self, "Re-encryption Failed", f"Failed to re-encrypt logs: {message}")
+    
+    def finish_reencrypt(self):
+        """Release the re-encryption thread"""
+        self.reencrypt_thread.wait()
+        self.reencrypt_thread = None
     
     def show_settings(self):
         """Show settings dialog"""
@@ -441,5 +737,20 @@ class MainWindow(QMainWindow):
     def closeEvent(self, a0):
         """Handle application close"""
         self.status_thread.stop()
+        if self.export_thread is not None:
+            self.export_thread.cancel()
+            self.export_thread.wait()
+        if self.backup_thread is not None:
+            self.backup_thread.cancel()
+            self.backup_thread.wait()
+        if self.reencrypt_thread is not None:
+            self.reencrypt_thread.cancel()
+            self.reencrypt_thread.wait()
+        # Commit queued entries before anything else lets go of the database
+        self.write_queue.close()
+        self.change_bus.close()
+        self.executor.shutdown()
+        self.db.content_cache.clear()
+        self.db.close()
         if a0:
             a0.accept()
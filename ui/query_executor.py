@@ -0,0 +1,123 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from core.connection import ConnectionPool
+
+
+class QueryTask:
+    """A database call submitted to the QueryExecutor"""
+
+    def __init__(self, executor, key, func, on_result, on_error):
+        self.executor = executor
+        self.key = key
+        self.func = func
+        self.on_result = on_result
+        self.on_error = on_error
+        self.cancelled = False
+        self.running = False
+        self.thread_id = None
+        self.lock = threading.Lock()
+
+    def run(self):
+        """Run on a pool thread and report back through executor signals"""
+        with self.lock:
+            if self.cancelled:
+                return
+            self.running = True
+            self.thread_id = threading.get_ident()
+
+        try:
+            result = self.func()
+        except Exception as e:
+            with self.lock:
+                self.running = False
+            self.executor.task_failed.emit(self, str(e))
+            return
+
+        with self.lock:
+            self.running = False
+        self.executor.task_finished.emit(self, result)
+
+    def cancel(self):
+        """Drop the result, aborting the SQL statement if it is mid-flight"""
+        with self.lock:
+            self.cancelled = True
+            # Holding the lock means the worker can't move on to another
+            # task's statements before the interrupt lands
+            if self.running and self.thread_id is not None:
+                ConnectionPool.interrupt_thread_all(self.thread_id)
+
+
+class TaskRunner(QRunnable):
+    """QRunnable handed to the thread pool, which owns and deletes it"""
+
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+
+    def run(self):
+        self.task.run()
+
+
+class QueryExecutor(QObject):
+    """
+    Runs database calls on a background QThreadPool.
+    Each submission has a key; submitting again under the same key cancels
+    the earlier task, so only the latest request's result reaches the
+    widgets. Callbacks run on the thread that owns the executor (the GUI
+    thread).
+    """
+
+    task_finished = pyqtSignal(object, object)
+    task_failed = pyqtSignal(object, str)
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        # Keep workers (and their pooled connections) alive between tasks
+        self.thread_pool.setExpiryTimeout(-1)
+        self.tasks = {}
+        self.task_finished.connect(self.on_task_finished)
+        self.task_failed.connect(self.on_task_failed)
+
+    def submit(self, key, func, on_result=None, on_error=None):
+        """Run func() in the background, superseding any task with this key"""
+        self.cancel(key)
+        task = QueryTask(self, key, func, on_result, on_error)
+        self.tasks[key] = task
+        self.thread_pool.start(TaskRunner(task))
+        return task
+
+    def cancel(self, key):
+        """Cancel the pending or running task with this key"""
+        task = self.tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def is_pending(self, key):
+        """Whether a task with this key is still waiting for its result"""
+        return key in self.tasks
+
+    def shutdown(self):
+        """Cancel everything and wait for the workers to stop"""
+        for key in list(self.tasks):
+            self.cancel(key)
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone()
+
+    def take_current(self, task):
+        """Forget a finished task; False if it was superseded or cancelled"""
+        if task.cancelled or self.tasks.get(task.key) is not task:
+            return False
+        del self.tasks[task.key]
+        return True
+
+    @pyqtSlot(object, object)
+    def on_task_finished(self, task, result):
+        if self.take_current(task) and task.on_result is not None:
+            task.on_result(result)
+
+    @pyqtSlot(object, str)
+    def on_task_failed(self, task, message):
+        if self.take_current(task) and task.on_error is not None:
+            task.on_error(message)